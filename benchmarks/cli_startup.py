@@ -0,0 +1,66 @@
+"""Benchmark of CLI startup latency (wall time and import time) per subcommand.
+
+Usage: python benchmarks/cli_startup.py [--repeat 5] [subcommand ...]
+ex. python benchmarks/cli_startup.py "general version" "tech-analysis --help"
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+DEFAULT_SUBCOMMANDS = [
+    "--help",
+    "general version",
+    "stock-data --help",
+    "tech-analysis --help",
+    "tech-analysis version",
+    "tech-analysis analyze --help",
+]
+HEAVY_MODULES = ["pandas", "yfinance", "joblib", "ta", "lightweight_charts", "rich"]
+RUN_CLI = "from stock_market_analysis.main import main; main()"
+
+
+def measure(subcommand: str) -> tuple[float, float, list[str]]:
+    """Return wall time (ms), import time (ms) and heavy modules of a single run."""
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", RUN_CLI, *subcommand.split()],  # noqa: S603
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    # lines: 'import time: self [us] | cumulative | imported package'
+    import_us = 0
+    imported = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        import_us += int(self_us)
+        imported.add(name.strip())
+    return wall_ms, import_us / 1000, [m for m in HEAVY_MODULES if m in imported]
+
+
+def main() -> None:
+    """Print median startup latency of every subcommand."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("subcommands", nargs="*", default=DEFAULT_SUBCOMMANDS)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'subcommand':<32} {'wall [ms]':>10} {'imports [ms]':>13}  heavy modules")
+    for subcommand in args.subcommands:
+        runs = [measure(subcommand) for _ in range(args.repeat)]
+        wall_ms = statistics.median(run[0] for run in runs)
+        import_ms = statistics.median(run[1] for run in runs)
+        heavy_modules = ",".join(runs[-1][2]) or "-"
+        print(f"{subcommand:<32} {wall_ms:>10.0f} {import_ms:>13.0f}  {heavy_modules}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,18 @@
 
 import click
 
-from stock_market_analysis.cli.new_cli import tech_analysis
-from stock_market_analysis.cli.old_cli import general, stock_data
+from stock_market_analysis.cli.lazy_group import LazyGroup
 
 
-@click.group()
+# command groups are imported only when they are used, so ex. 'general version'
+# doesn't import pandas, yfinance or services
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "general": "stock_market_analysis.cli.general_cli:general",
+        "stock-data": "stock_market_analysis.cli.old_cli:stock_data",
+        "tech-analysis": "stock_market_analysis.cli.new_cli:tech_analysis",
+    },
+)
 def cli():
     """CLI main command group."""
-
-
-cli.add_command(general)
-cli.add_command(stock_data)
-cli.add_command(tech_analysis)
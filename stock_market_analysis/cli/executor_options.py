@@ -0,0 +1,51 @@
+"""Options of parallel workers shared by commands (see ExecutorConfig)."""
+
+import functools
+from typing import Any, Callable, Optional
+
+import click
+
+
+def executor_options(command: Callable) -> Callable:
+    """Add --workers, --backend and --inner-threads options to the command.
+
+    The command runs with ExecutorConfig of the options activated, so all its
+    parallel stages use the same workers.
+    """
+
+    @click.option(
+        "--workers",
+        default=-1,
+        help="Number of parallel workers (-1 = all CPUs).",
+    )
+    @click.option(
+        "--backend",
+        default="loky",
+        help="Backend of the workers: loky, multiprocessing, threading or sequential.",
+    )
+    @click.option(
+        "--inner-threads",
+        default=None,
+        type=click.IntRange(min=1),
+        help="Number of BLAS/OpenMP threads per loky worker. Defaults to CPUs / workers.",
+    )
+    @functools.wraps(command)
+    def wrapper(
+        *args: Any,  # noqa: ANN401
+        workers: int,
+        backend: str,
+        inner_threads: Optional[int],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        from stock_market_analysis.src.executor.config import ExecutorConfig
+
+        try:
+            config = ExecutorConfig(
+                n_workers=workers, backend=backend, inner_threads=inner_threads
+            )
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint="--backend") from ex
+        with config.activate():
+            return command(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,16 @@
+"""Interface for command line tool (general commands)."""
+
+import importlib.metadata
+
+import click
+
+
+@click.group()
+def general():
+    """CLI command group."""
+
+
+@general.command()
+def version():
+    """Return version of this tool."""
+    click.echo(importlib.metadata.version("stock_market_analysis"))
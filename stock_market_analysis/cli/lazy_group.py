@@ -0,0 +1,65 @@
+"""Click group importing its subcommands only when they are used."""
+
+import importlib
+from typing import Any, Optional, TypeVar
+
+import click
+
+
+Self = TypeVar("Self", bound="LazyGroup")
+
+
+class LazyGroup(click.Group):
+    """Group of subcommands given as 'module:attribute' import paths."""
+
+    def __init__(
+        self: Self,
+        *args: Any,  # noqa: ANN401
+        lazy_subcommands: Optional[dict[str, str]] = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Config of LazyGroup.
+
+        Args:
+        ----
+            lazy_subcommands (dict): Import paths of subcommands by their names ex.
+                {"general": "stock_market_analysis.cli.general_cli:general"}
+        """
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self: Self, ctx: click.Context) -> list[str]:
+        """Return names of eager and lazy subcommands."""
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self: Self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return subcommand, import it if it's lazy."""
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(
+        self: Self, ctx: click.Context, formatter: click.HelpFormatter
+    ) -> None:
+        """Write names of subcommands to help, lazy ones are listed without importing."""
+        rows = [
+            (
+                cmd_name,
+                ""
+                if cmd_name in self.lazy_subcommands
+                else self.get_command(ctx, cmd_name).get_short_help_str(),  # type: ignore
+            )
+            for cmd_name in self.list_commands(ctx)
+        ]
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
+
+    def _lazy_load(self: Self, cmd_name: str) -> click.Command:
+        """Import lazy subcommand."""
+        module_name, attribute_name = self.lazy_subcommands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), attribute_name)
+        if not isinstance(command, click.Command):
+            msg = f"Lazy subcommand '{cmd_name}' is not a click command: {command}"
+            raise TypeError(msg)
+        return command
@@ -1,34 +1,82 @@
 """Interface for command line tool."""
 
-import importlib
-from typing import Optional
+import importlib.metadata
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
 
 import click
-import pandas as pd
-from joblib import Parallel, delayed
+from click.core import ParameterSource
 
-from stock_market_analysis.src.analysis.filtering import FilterBy
-from stock_market_analysis.src.analysis.sorting import SortBy
-from stock_market_analysis.src.backtest.backtest_service import BacktestService
+from stock_market_analysis.cli.executor_options import executor_options
+from stock_market_analysis.src.data_providers.dead_tickers import (
+    DEAD_TICKERS_TTL_ENV_VARIABLE,
+)
 from stock_market_analysis.src.logger import logger
-from stock_market_analysis.src.services.bb_rsi_service import BBAndRSIAndMAService
-from stock_market_analysis.src.services.bb_service import BBBaseService
-from stock_market_analysis.src.services.four_ps_service import FourPSService
-from stock_market_analysis.src.services.macd_rsi_service import MACD3DaysRSIService
-from stock_market_analysis.src.services.macd_service import MACDBaseService
-from stock_market_analysis.src.services.rsi_service import RSIBaseService
-from stock_market_analysis.src.services.sup_res_service import SupportResistanceService
-from stock_market_analysis.src.services.ten_days_service import TenDaysLowsHighsService
-from stock_market_analysis.src.services.trend_based_service import TrendBasedService
-from stock_market_analysis.src.utils.utils import parse_filters_input, parse_sort_input
+from stock_market_analysis.src.server.client import (
+    DEFAULT_HOST,
+    DEFAULT_MAX_RESULTS,
+    DEFAULT_PORT,
+    DEFAULT_SERVER_URL,
+    is_server_running,
+    post_analyze,
+)
+
+
+# heavy dependencies (pandas, yfinance, services, backtesting...) are imported
+# by commands using them, so the CLI starts fast
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from stock_market_analysis.src.executor.scheduler import TickerScheduler
+    from stock_market_analysis.src.services.multi_pipeline import MultiServicePipeline
+    from stock_market_analysis.src.services.pipeline import AnalysisPipeline
 
 
 PATH_TO_FTSE_CSV = "stock_market_analysis/data/all_uk_indexed.csv"
 
+# options of 'analyze' the analysis server doesn't support, runs setting any of
+# them are analyzed locally
+LOCAL_ANALYZE_OPTIONS = (
+    "save",
+    "services",
+    "backtest",
+    "scenarios",
+    "fetchers",
+    "task_timeout",
+    "failure_report",
+    "checkpoint_dir",
+    "resume",
+    "result_cache",
+    "result_cache_dir",
+    "shard",
+    "workers",
+    "backend",
+    "inner_threads",
+)
+
 
 @click.group()
-def tech_analysis():
+@click.option(
+    "--dead-tickers-ttl",
+    default=None,
+    type=click.FloatRange(min=0),
+    help="Seconds tickers without data are skipped for (0 = no cache). Defaults to a week.",
+)
+@click.option(
+    "--no-dead-tickers-cache",
+    is_flag=True,
+    default=False,
+    help="Request data of all tickers, even those known to have no data.",
+)
+def tech_analysis(dead_tickers_ttl: Optional[float], no_dead_tickers_cache: bool):
     """CLI command group."""
+    if no_dead_tickers_cache:
+        dead_tickers_ttl = 0
+    if dead_tickers_ttl is not None:
+        # environment is inherited by worker processes of data providers
+        os.environ[DEAD_TICKERS_TTL_ENV_VARIABLE] = str(dead_tickers_ttl)
 
 
 @tech_analysis.command()
@@ -37,7 +85,377 @@ def version():
     click.echo(importlib.metadata.version("stock_market_analysis"))
 
 
+def _is_set_by_user(ctx: click.Context, params: tuple[str, ...]) -> bool:
+    """Return True if any of params of the command wasn't left at its default."""
+    return any(
+        ctx.get_parameter_source(param) not in (None, ParameterSource.DEFAULT)
+        for param in params
+    )
+
+
+def _save_failure_report(
+    pipeline: "AnalysisPipeline | MultiServicePipeline", failure_report: str
+) -> None:
+    """Save tickers failed by the pipeline's run into CSV file."""
+    logger.info(
+        "Saving report of %d failed tickers: %s", len(pipeline.failures), failure_report
+    )
+    pipeline.get_failure_report().to_csv(failure_report, index=False)
+
+
+def _forward_analysis(server: str, request: dict[str, Any]) -> None:
+    """Output results of analysis of the request made by the analysis server."""
+    import pandas as pd
+
+    from stock_market_analysis.src.output.csv_output import CSVOutput
+
+    logger.info("Forwarding analysis to server: %s", server)
+    results = post_analyze(server, request)
+    result_df = pd.DataFrame(
+        results["data"], columns=results["columns"], index=results["index"]
+    )
+    result_df["Date"] = pd.to_datetime(result_df["Date"]).dt.tz_localize(None)
+    CSVOutput().render(result_df)
+
+
+def _run_backtest(  # noqa: PLR0913
+    result_df: "pd.DataFrame",
+    period: str,
+    output: str,
+    output_file: Optional[str],
+    backtest_amounts: str,
+    backtest_engine: str,
+    backtest_log_file: Optional[str] = None,
+    equity_curve_file: Optional[str] = None,
+    backtest_state: Optional[str] = None,
+    monte_carlo: Optional[str] = None,
+    simulations: int = 1000,
+) -> None:
+    """Backtest results of analysis and output its log, portfolio and metrics."""
+    from stock_market_analysis.src.backtest.array_backtest_service import (
+        ArrayBacktestService,
+    )
+    from stock_market_analysis.src.backtest.backtest_service import BacktestService
+    from stock_market_analysis.src.backtest.monte_carlo import MonteCarloService
+
+    logger.info("=========================================================")
+    logger.info(
+        "Triggering backtesting with initial amounts: %s and period: %s",
+        str(backtest_amounts),
+        period,
+    )
+    int_amounts = [int(a) for a in backtest_amounts.split(",")]
+    max_stock_amount = 5000
+    min_stock_amount = 2000
+    backtest_cls = ArrayBacktestService if backtest_engine == "array" else BacktestService
+    backtest_service: BacktestService
+    if backtest_state and Path(backtest_state).exists():
+        logger.info("Resuming backtest from state: %s", backtest_state)
+        backtest_service = ArrayBacktestService.from_state(
+            result_df, period, backtest_state
+        )
+    else:
+        backtest_service = backtest_cls(
+            result_df,
+            int_amounts,
+            max_stock_amount,
+            min_stock_amount,
+            period,
+            log_file=backtest_log_file,
+        )
+    backtest_service.run()
+    if backtest_state and isinstance(backtest_service, ArrayBacktestService):
+        backtest_service.save_state(backtest_state)
+
+    # Output the results
+    logger.info("=================================")
+    logger.info("BACKTEST LOG:")
+    backtest_df = backtest_service.get_backtest_log()
+    backtest_service.output_data(backtest_df, output, output_file)  # type: ignore
+
+    logger.info("=================================")
+    logger.info("PORTFOLIO VALUE:")
+    portfolio_df = backtest_service.get_portfolio()
+    backtest_service.output_data(portfolio_df, output, output_file)  # type: ignore
+
+    logger.info("=================================")
+    logger.info("PERFORMANCE METRICS:")
+    metrics_df = backtest_service.get_metrics()
+    backtest_service.output_data(metrics_df, output, output_file)  # type: ignore
+    if equity_curve_file:
+        logger.info("Saving equity curve into CSV file: %s", equity_curve_file)
+        backtest_service.get_equity_curve().to_csv(equity_curve_file)
+    if monte_carlo:
+        logger.info("=================================")
+        logger.info("MONTE CARLO (%s, %d simulations):", monte_carlo, simulations)
+        monte_carlo_df = MonteCarloService(
+            backtest_service, n_simulations=simulations  # type: ignore
+        ).get_summary(monte_carlo)
+        backtest_service.output_data(
+            monte_carlo_df.reset_index(), output, output_file  # type: ignore
+        )
+    print("=================================")
+
+
+def _get_service_file(file: Optional[str], service_name: str) -> Optional[str]:
+    """Return the file suffixed by name of the service ex. 'log.csv' -> 'log_RSIBase.csv'."""
+    if not file:
+        return file
+    path = Path(file)
+    return str(path.with_name(f"{path.stem}_{service_name}{path.suffix}"))
+
+
+def _validate_analyze_options(  # noqa: PLR0913
+    period: str,
+    latest: Optional[int],
+    monte_carlo: Optional[str],
+    shard: Optional[str],
+    service_names: list[str],
+    needs_single_service: bool,
+    backtest_engine: str,
+    backtest_state: Optional[str],
+) -> tuple[int, int]:
+    """Validate options of 'analyze' command, return index and count of its shard.
+
+    Args:
+    ----
+        period (str): Data period, it's validated only when latest isn't set
+        latest (int): Number of latest bars of screening mode
+        monte_carlo (str): Monte Carlo mode of the backtest
+        shard (str): Shard of tickers ex. '1/4' (None = all tickers)
+        service_names (list): Names of analyzed services
+        needs_single_service (bool): Options supported only by single-service
+            runs are set
+        backtest_engine (str): Backtest engine ('array' or 'legacy')
+        backtest_state (str): File with state of the array backtest
+
+    Returns:
+    -------
+        tuple: Index and count of the shard ((1, 1) without sharding)
+    """
+    from stock_market_analysis.src.backtest.monte_carlo import MONTE_CARLO_MODES
+    from stock_market_analysis.src.executor.sharding import parse_shard
+    from stock_market_analysis.src.utils.utils import get_date_range
+
+    if not latest:
+        try:
+            get_date_range(period)
+        except ValueError as ex:
+            msg = f"Unsupported period: {period}"
+            raise click.BadParameter(msg, param_hint="--period") from ex
+    if monte_carlo and monte_carlo not in MONTE_CARLO_MODES:
+        msg = f"Unsupported Monte Carlo mode: {monte_carlo}. Use one of {MONTE_CARLO_MODES}"
+        raise click.BadParameter(msg, param_hint="--monte-carlo")
+    if backtest_state and backtest_engine != "array":
+        msg = "--backtest-state is supported only by the array backtest engine"
+        raise click.BadParameter(msg, param_hint="--backtest-engine")
+    if needs_single_service and len(service_names) > 1:
+        msg = "--shard, --checkpoint-dir, --resume and --backtest-state need a single service"
+        raise click.BadParameter(msg, param_hint="--services")
+    try:
+        return parse_shard(shard) if shard else (1, 1)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint="--shard") from ex
+
+
+def _build_pipelines(  # noqa: PLR0913
+    service_names: list[str],
+    period: str,
+    latest: Optional[int],
+    filters_dict: dict,
+    order_by: str,
+    columns: str,
+    checkpoint_dir: Optional[str],
+    resume: bool,
+    result_cache_dir: Optional[str],
+) -> list["AnalysisPipeline"]:
+    """Return new pipelines of the services, their definitions stay unchanged.
+
+    Results of tickers are checkpointed into checkpoint_dir and cached into
+    result_cache_dir when they're set.
+    """
+    from stock_market_analysis.src.executor.checkpoint import (
+        DEFAULT_CHECKPOINT_DIR,
+        CheckpointStore,
+    )
+    from stock_market_analysis.src.executor.result_cache import ResultCache
+    from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+    from stock_market_analysis.src.services.registry import service_registry
+    from stock_market_analysis.src.utils.utils import parse_columns_input, parse_sort_input
+
+    sort_columns, sort_orders = parse_sort_input(order_by)
+    if resume and not checkpoint_dir:
+        checkpoint_dir = DEFAULT_CHECKPOINT_DIR
+    results_cache = ResultCache(Path(result_cache_dir)) if result_cache_dir else None
+    pipelines = []
+    for service_name in service_names:
+        definition = service_registry.get_definition(service_name)
+        pipelines.append(
+            AnalysisPipeline(
+                definition,
+                filters_dict,
+                sort_columns,
+                sort_orders,
+                latest,
+                (
+                    CheckpointStore.for_run(checkpoint_dir, definition, period, latest)
+                    if checkpoint_dir
+                    else None
+                ),
+                resume,
+                parse_columns_input(columns),
+                results_cache,
+            )
+        )
+    return pipelines
+
+
+def _run_shard(  # noqa: PLR0913
+    pipeline: "AnalysisPipeline",
+    tickers: list[str],
+    period: str,
+    stock_indexes: "pd.Series",
+    scheduler: "TickerScheduler",
+    shard: tuple[int, int],
+    partial_file: Optional[str],
+    failure_report: Optional[str],
+) -> None:
+    """Analyze i-th of N shards of tickers and save its partial results."""
+    import pandas as pd
+
+    from stock_market_analysis.src.executor.sharding import (
+        PartialResult,
+        get_partial_file,
+        save_partial,
+        select_shard,
+    )
+
+    shard_index, shard_count = shard
+    service_name = pipeline.definition.name
+    # the same tickers file gives the same shards on every machine
+    ticker_positions = {t: position for position, t in enumerate(tickers)}
+    tickers = select_shard(tickers, shard_index, shard_count)
+    logger.info("Analyzing %d tickers of shard %d/%d", len(tickers), shard_index, shard_count)
+    try:
+        data_df = (
+            pipeline.run_tickers(tickers, period, stock_indexes, scheduler)
+            if tickers
+            else pd.DataFrame(columns=["Ticker"])
+        )
+    finally:
+        if failure_report:
+            _save_failure_report(pipeline, failure_report)
+    partial = PartialResult(
+        service=service_name,
+        period=period,
+        latest=pipeline.latest,
+        shard=shard_index,
+        shard_count=shard_count,
+        ticker_positions={t: ticker_positions[t] for t in tickers},
+        data_df=data_df,
+    )
+    save_partial(
+        partial, partial_file or get_partial_file(service_name, shard_index, shard_count)
+    )
+
+
+def _run_pipelines(  # noqa: PLR0913
+    pipelines: list["AnalysisPipeline"],
+    tickers: list[str],
+    period: str,
+    stock_indexes: "pd.Series",
+    scheduler: "TickerScheduler",
+    failure_report: Optional[str],
+) -> dict[str, "pd.DataFrame"]:
+    """Run pipelines of the services, return their results by names of the services.
+
+    Services of multi-service run share fetched data and indicators of tickers.
+    """
+    from stock_market_analysis.src.services.multi_pipeline import MultiServicePipeline
+
+    run_pipeline: "AnalysisPipeline | MultiServicePipeline" = (
+        MultiServicePipeline(pipelines) if len(pipelines) > 1 else pipelines[0]
+    )
+    try:
+        results = run_pipeline.run(tickers, period, stock_indexes, scheduler)
+    finally:
+        if failure_report:
+            _save_failure_report(run_pipeline, failure_report)
+    if isinstance(results, dict):
+        return results
+    return {pipelines[0].definition.name: results}
+
+
+def _output_results(  # noqa: PLR0913
+    pipelines: list["AnalysisPipeline"],
+    result_dfs: dict[str, "pd.DataFrame"],
+    period: str,
+    ticker: Optional[str],
+    output: str,
+    save: bool,
+    limit: int,
+    scenarios: Optional[str],
+    backtest_options: Optional[dict[str, Any]],
+) -> None:
+    """Output results of every service, compare backtest scenarios and backtest them.
+
+    Args:
+    ----
+        pipelines (list): Pipelines of the services (in order of result_dfs)
+        result_dfs (dict): Results by names of the services
+        period (str): Analyzed data period
+        ticker (str): Analyzed ticker (None = tickers of the file)
+        output (str): Output format ('csv', 'json', 'plot')
+        save (bool): Save output to file?
+        limit (int): Maximum number of output rows
+        scenarios (str): JSON file with list of backtest scenarios to compare
+        backtest_options (dict): Arguments of _run_backtest() (None = no backtest),
+            its log and equity curve files are suffixed by names of the services
+            of multi-service runs
+    """
+    from stock_market_analysis.src.backtest.backtest_entities import BacktestScenario
+    from stock_market_analysis.src.backtest.scenarios import run_scenarios
+
+    is_multi_service = len(pipelines) > 1
+    for service_pipeline, (service_name, result_df) in zip(pipelines, result_dfs.items()):
+        service_obj = service_pipeline.service
+        output_file = None
+        if save:
+            extension = "png" if output == "plot" else output
+            output_file = (
+                f"{ticker}_{service_name}_analysis.{extension}"
+                if is_multi_service
+                else f"{ticker}_rsi_analysis.{extension}"
+            )
+        logger.info("Outting data of the service (max_rows=%d): %s", limit, service_name)
+
+        # filter only selected 'limit' N number of rows
+        limited_df = result_df.tail(limit)
+        service_obj.output_data(limited_df, output, output_file)
+
+        if scenarios:
+            with Path(scenarios).open(encoding="utf-8") as scenarios_file:
+                scenarios_list = [
+                    BacktestScenario(**scenario) for scenario in json.load(scenarios_file)
+                ]
+            logger.info("=================================")
+            logger.info("BACKTEST SCENARIOS COMPARISON:")
+            scenarios_df = run_scenarios(result_df, scenarios_list, period)
+            service_obj.output_data(scenarios_df, output, output_file)
+
+        if backtest_options is not None:
+            service_options = dict(backtest_options)
+            if is_multi_service:
+                # every service writes its own backtest log and equity curve
+                for file_option in ("backtest_log_file", "equity_curve_file"):
+                    service_options[file_option] = _get_service_file(
+                        backtest_options[file_option], service_name
+                    )
+            _run_backtest(result_df, period, output, output_file, **service_options)
+
+
 @tech_analysis.command()
+@executor_options
 @click.option("--ticker", help="Stock ticker symbol to analyze.", default=None)
 @click.option(
     "--file",
@@ -49,6 +467,13 @@ def version():
     default="1y",
     help="Data period (e.g., '1y', '6mo', or '2023-01-01:2024-01-01')",
 )
+@click.option(
+    "--latest",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Screening mode: load only bars needed by the service's indicators plus "
+    "N latest bars and output only the latest N rows per ticker (--period is ignored).",
+)
 @click.option("--output", default="csv", help="Output format: csv, json, plot")
 @click.option("--save", default=False, help="Save output to file?")
 @click.option(
@@ -56,6 +481,13 @@ def version():
     default="RSIBase",
     help="Selected technical analysis ex. RSIAnalysis",
 )
+@click.option(
+    "--services",
+    default=None,
+    help="Services analyzed in a single pass sharing data and indicators of tickers "
+    "ex. 'RSIBase,MACD3DaysRSI,BBBase' (overrides --service). Every service gets "
+    "its own output and backtest.",
+)
 @click.option(
     "--limit",
     default=100,
@@ -71,6 +503,12 @@ def version():
     default="",
     help="Filter by criteria. ex 'rsi_meaning=oversold,macd_raw_signal=buy'",
 )
+@click.option(
+    "--columns",
+    default="",
+    help="Intermediate columns of strategies kept in output besides the service's "
+    "output columns ex. 'volume_ma,ma_50_slope'. 'all' keeps every column.",
+)
 @click.option(
     "--backtest",
     default=False,
@@ -81,31 +519,191 @@ def version():
     default="4000,4000,3000,3000,3000,3000",
     help="Amounts to initially by shares for backtesting.",
 )
-def analyze(  # noqa: PLR0913, PLR0915
+@click.option(
+    "--backtest-engine",
+    default="array",
+    type=click.Choice(["array", "legacy"]),
+    help="Backtest engine: NumPy arrays-based 'array' or row by row 'legacy'.",
+)
+@click.option(
+    "--backtest-log-file",
+    default=None,
+    help="CSV file the backtest transaction log is streamed to (for long backtests).",
+)
+@click.option(
+    "--equity-curve-file",
+    default=None,
+    help="CSV file the daily mark-to-market equity curve of backtest is saved to.",
+)
+@click.option(
+    "--scenarios",
+    default=None,
+    help="JSON file with list of backtest scenarios to compare ex. "
+    '[{"name": "low_fee", "backtest_amounts": [4000, 3000], "transaction_fee": 5}]',
+)
+@click.option(
+    "--backtest-state",
+    default=None,
+    help="File with state of the array backtest. When it exists, the backtest is "
+    "resumed and only new days are processed. Updated state is saved into it.",
+)
+@click.option(
+    "--monte-carlo",
+    default=None,
+    help="Monte Carlo robustness analysis of the backtest: resample 'trades', "
+    "block 'bootstrap' daily returns or 'perturb' entry timing and slippage.",
+)
+@click.option(
+    "--simulations",
+    default=1000,
+    help="Number of Monte Carlo simulations.",
+)
+@click.option(
+    "--server",
+    default=DEFAULT_SERVER_URL,
+    help="URL of analysis server ('serve' command). When it's running, analysis "
+    "without backtesting is forwarded to it. Empty string disables forwarding.",
+)
+@click.option(
+    "--fetchers",
+    default=0,
+    type=click.IntRange(min=0),
+    help="Number of threads fetching data while workers compute already fetched "
+    "tickers. 0 = every worker fetches data of its tickers itself.",
+)
+@click.option(
+    "--task-timeout",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds analysis of a single ticker can run, slower tickers are reported "
+    "as failed.",
+)
+@click.option(
+    "--failure-report",
+    default=None,
+    help="CSV file tickers which failed or exceeded --task-timeout are saved to.",
+)
+@click.option(
+    "--checkpoint-dir",
+    default=None,
+    help="Directory results of every analyzed ticker are saved to, keyed by the "
+    "service's config and analyzed period.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resume interrupted run: analyze only tickers without results in "
+    "--checkpoint-dir (defaults to 'checkpoints').",
+)
+@click.option(
+    "--result-cache",
+    is_flag=True,
+    default=False,
+    help="Reuse results of tickers analyzed by previous runs with the same service "
+    "and data, so reruns differing only in --filters, --order-by or --limit skip "
+    "computing indicators and strategies.",
+)
+@click.option(
+    "--result-cache-dir",
+    default=None,
+    help="Directory of --result-cache (defaults to '/tmp/cache/results').",
+)
+@click.option(
+    "--shard",
+    default=None,
+    help="Analyze only i-th of N shards of tickers ex. '1/4' and save partial "
+    "results into --partial-file. Partial results are combined by 'merge' command.",
+)
+@click.option(
+    "--partial-file",
+    default=None,
+    help="File partial results of the shard are saved to. Defaults to: "
+    "<service>_shard_<i>_of_<N>.pkl",
+)
+def analyze(  # noqa: PLR0913
     ticker: Optional[str],
-    file: Optional[click.Path],
-    period: Optional[str],
-    output: Optional[str],
-    save: Optional[bool],
-    service: Optional[str],
-    limit: Optional[int],
-    order_by: Optional[str],
-    filters: Optional[str],
-    backtest: Optional[bool],
-    backtest_amounts: Optional[str],
+    file: str,
+    period: str,
+    latest: Optional[int],
+    output: str,
+    save: bool,
+    service: str,
+    services: Optional[str],
+    limit: int,
+    order_by: str,
+    filters: str,
+    columns: str,
+    backtest: bool,
+    backtest_amounts: str,
+    backtest_engine: str,
+    backtest_log_file: Optional[str],
+    equity_curve_file: Optional[str],
+    scenarios: Optional[str],
+    backtest_state: Optional[str],
+    monte_carlo: Optional[str],
+    simulations: int,
+    server: str,
+    fetchers: int,
+    task_timeout: Optional[float],
+    failure_report: Optional[str],
+    checkpoint_dir: Optional[str],
+    resume: bool,
+    result_cache: bool,
+    result_cache_dir: Optional[str],
+    shard: Optional[str],
+    partial_file: Optional[str],
 ):
     """CLI command to analyze stock based on ticker, output format, and period."""
-    filters_dict = parse_filters_input(filters)
+    is_forwardable = output == "csv" and not _is_set_by_user(
+        click.get_current_context(), LOCAL_ANALYZE_OPTIONS
+    )
+    if server and is_forwardable and is_server_running(server):
+        _forward_analysis(
+            server,
+            {
+                "service": service,
+                "file": str(Path(file).resolve()),
+                "ticker": ticker,
+                "period": period,
+                "latest": latest,
+                "filters": filters,
+                "order_by": order_by,
+                "columns": columns,
+                "limit": limit,
+            },
+        )
+        return
 
-    tickers_df = pd.read_csv(file)
+    import pandas as pd
+
+    from stock_market_analysis.src.analysis.filtering import filter_tickers_df
+    from stock_market_analysis.src.executor.pipelined import PipelinedScheduler
+    from stock_market_analysis.src.executor.result_cache import DEFAULT_RESULT_CACHE_DIR
+    from stock_market_analysis.src.executor.scheduler import TickerScheduler
+    from stock_market_analysis.src.utils.utils import parse_filters_input
+
+    service_names = (
+        [name.strip() for name in services.split(",") if name.strip()]
+        if services
+        else [service]
+    )
+    shard_index, shard_count = _validate_analyze_options(
+        period,
+        latest,
+        monte_carlo,
+        shard,
+        service_names,
+        bool(shard or checkpoint_dir or resume or backtest_state),
+        backtest_engine,
+        backtest_state,
+    )
+
+    filters_dict = parse_filters_input(filters)
 
     # if filters can be apply before analysis (ex. filters based on CSV columns),
     # apply them to save analysis time
-    before_analysis_filters = {
-        key: filters_dict[key] for key in tickers_df.columns if key in filters_dict
-    }
-    print(f"{before_analysis_filters=}")
-    tickers_df = FilterBy(filters=before_analysis_filters).apply(tickers_df)
+    tickers_df = filter_tickers_df(pd.read_csv(file), filters_dict)
 
     tickers = [ticker] if ticker is not None else tickers_df["Ticker"].tolist()
 
@@ -113,94 +711,356 @@ def analyze(  # noqa: PLR0913, PLR0915
         msg = "Input filtering criteria selected 0 tickers to analyse."
         raise ValueError(msg)
 
-    if service == "RSIBase":
-        service_obj = RSIBaseService()  # type: ignore
-    elif service == "MACDBase":
-        service_obj = MACDBaseService()  # type: ignore
-    elif service == "MACD3DaysRSI":
-        service_obj = MACD3DaysRSIService()  # type: ignore
-    elif service == "BBBase":
-        service_obj = BBBaseService()  # type: ignore
-    elif service == "BBAndRSI":
-        service_obj = BBAndRSIAndMAService()  # type: ignore
-    elif service == "TrendBased":
-        service_obj = TrendBasedService()  # type: ignore
-    elif service == "FourPS":
-        service_obj = FourPSService()  # type: ignore
-    elif service == "SupportResistance":
-        service_obj = SupportResistanceService()  # type: ignore
-    elif service == "TenDays":
-        service_obj = TenDaysLowsHighsService()  # type: ignore
-    else:
-        msg = f"Unsupported service: {service}"
-        raise ValueError(msg)
+    pipelines = _build_pipelines(
+        service_names,
+        period,
+        latest,
+        filters_dict,
+        order_by,
+        columns,
+        checkpoint_dir,
+        resume,
+        (
+            str(result_cache_dir or DEFAULT_RESULT_CACHE_DIR)
+            if result_cache or result_cache_dir
+            else None
+        ),
+    )
 
-    # prepare filtering and sorting of output data
-    service_obj.post_run_analysis_list.append(FilterBy(filters=filters_dict))
+    if latest:
+        logger.info(
+            "Screening latest %d rows per ticker with %d warmup bars",
+            latest,
+            max(p.service.get_warmup_bars() for p in pipelines),
+        )
 
-    sort_columns, sort_orders = parse_sort_input(order_by)
-    service_obj.post_run_analysis_list.append(
-        SortBy(columns=sort_columns, orders_asc=sort_orders)
+    stock_indexes = (
+        tickers_df.drop_duplicates("Ticker").set_index("Ticker")["Stock_Index"]
     )
-
-    results = Parallel(n_jobs=-1)(
-        delayed(service_obj.run)(ticker, period) for ticker in tickers
+    # tickers are scheduled by estimated cost (bars x service's complexity),
+    # schedulers use workers of the command's --workers and --backend
+    scheduler = (
+        PipelinedScheduler(n_fetchers=fetchers, task_timeout=task_timeout)
+        if fetchers
+        else TickerScheduler(task_timeout=task_timeout)
     )
-    logger.info("Contactenating results of the service: %s", service)
-    result_df = pd.concat(results)
 
-    # add StockIndex to result_df
-    result_df = (
-        result_df.reset_index()
-        .merge(
-            tickers_df[["Ticker", "Stock_Index"]],
-            on="Ticker",
-            how="left",
+    if shard:
+        _run_shard(
+            pipelines[0],
+            tickers,
+            period,
+            stock_indexes,
+            scheduler,
+            (shard_index, shard_count),
+            partial_file,
+            failure_report,
         )
-        .set_index("Date")
+        return
+
+    result_dfs = _run_pipelines(
+        pipelines, tickers, period, stock_indexes, scheduler, failure_report
+    )
+    backtest_options = (
+        {
+            "backtest_amounts": backtest_amounts,
+            "backtest_engine": backtest_engine,
+            "backtest_log_file": backtest_log_file,
+            "equity_curve_file": equity_curve_file,
+            "backtest_state": backtest_state,
+            "monte_carlo": monte_carlo,
+            "simulations": simulations,
+        }
+        if backtest and backtest_amounts
+        else None
+    )
+    _output_results(
+        pipelines,
+        result_dfs,
+        period,
+        ticker,
+        output,
+        save,
+        limit,
+        scenarios,
+        backtest_options,
     )
 
-    logger.info("Triggering post-run service: %s", service)
-    result_df = service_obj.post_run_analysis(result_df)
 
-    # convert datetime-based index into 'Date' column
-    result_df = result_df.reset_index().rename(columns={"index": "Date"})
-    result_df = result_df.reset_index(drop=True)
+@tech_analysis.command()
+@click.argument("partial_files", nargs=-1, required=True)
+@click.option("--output", default="csv", help="Output format: csv, json, plot")
+@click.option("--save", default=False, help="Save output to file?")
+@click.option(
+    "--limit",
+    default=100,
+    help="Limit maximum number of output rows.",
+)
+@click.option(
+    "--order-by",
+    default="",
+    help="Output data sorting order ex. 'Date[desc],macd,rsi'",
+)
+@click.option(
+    "--filters",
+    default="",
+    help="Filter by criteria. ex 'rsi_meaning=oversold,macd_raw_signal=buy'",
+)
+@click.option(
+    "--backtest",
+    default=False,
+    help="Should backtesting be triggered?",
+)
+@click.option(
+    "--backtest-amounts",
+    default="4000,4000,3000,3000,3000,3000",
+    help="Amounts to initially by shares for backtesting.",
+)
+@click.option(
+    "--backtest-engine",
+    default="array",
+    type=click.Choice(["array", "legacy"]),
+    help="Backtest engine: NumPy arrays-based 'array' or row by row 'legacy'.",
+)
+@click.option(
+    "--equity-curve-file",
+    default=None,
+    help="CSV file the daily mark-to-market equity curve of backtest is saved to.",
+)
+def merge(  # noqa: PLR0913
+    partial_files: tuple[str, ...],
+    output: str,
+    save: bool,
+    limit: int,
+    order_by: str,
+    filters: str,
+    backtest: bool,
+    backtest_amounts: str,
+    backtest_engine: str,
+    equity_curve_file: Optional[str],
+):
+    """Merge partial results of all shards ('analyze --shard') and output them."""
+    from stock_market_analysis.src.executor.sharding import load_partials
+    from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+    from stock_market_analysis.src.services.registry import service_registry
+    from stock_market_analysis.src.utils.utils import (
+        parse_filters_input,
+        parse_sort_input,
+    )
+
+    partial = load_partials(list(partial_files))
+    logger.info(
+        "Merging %d rows of %d shards of the service: %s",
+        len(partial.data_df),
+        len(partial_files),
+        partial.service,
+    )
+    sort_columns, sort_orders = parse_sort_input(order_by)
+    pipeline = AnalysisPipeline(
+        service_registry.get_definition(partial.service),
+        parse_filters_input(filters),
+        sort_columns,
+        sort_orders,
+        partial.latest,
+        # shards kept only output columns (and their --columns) already
+        extra_columns=None,
+    )
+    result_df = pipeline.merge(partial.data_df)
 
     output_file = None
     if save:
         extension = "png" if output == "plot" else output
-        output_file = f"{ticker}_rsi_analysis.{extension}"
-    logger.info("Outting data of the service (max_rows=%d): %s", limit, service)
-
-    # filter only selected 'limit' N number of rows
-    limited_df = result_df.tail(limit)
-    service_obj.output_data(limited_df, output, output_file)  # type: ignore
+        output_file = f"{partial.service}_merged.{extension}"
+    pipeline.service.output_data(result_df.tail(limit), output, output_file)
 
     if backtest and backtest_amounts:
-        logger.info("=========================================================")
-        logger.info(
-            "Triggering backtesting with initial amounts: %s and period: %s",
-            str(backtest_amounts),
-            period,
+        _run_backtest(
+            result_df,
+            partial.period,
+            output,
+            output_file,
+            backtest_amounts,
+            backtest_engine,
+            equity_curve_file=equity_curve_file,
         )
-        int_amounts = [int(a) for a in backtest_amounts.split(",")]
-        max_stock_amount = 5000
-        min_stock_amount = 2000
-        backtest_service = BacktestService(
-            result_df, int_amounts, max_stock_amount, min_stock_amount, period
+
+
+@tech_analysis.command()
+@executor_options
+@click.option("--host", default=DEFAULT_HOST, help="Host the server listens on.")
+@click.option("--port", default=DEFAULT_PORT, help="Port the server listens on.")
+@click.option(
+    "--max-results",
+    default=DEFAULT_MAX_RESULTS,
+    type=click.IntRange(min=1),
+    help="Number of analyzed tickers kept in memory, the least recently used "
+    "are dropped.",
+)
+def serve(host: str, port: int, max_results: int):
+    """Run analysis server keeping services and analyzed data in memory."""
+    from stock_market_analysis.src.executor.scheduler import TickerScheduler
+    from stock_market_analysis.src.server.analysis_server import serve as run_server
+
+    run_server(host, port, TickerScheduler(), max_results)
+
+
+@tech_analysis.command()
+@executor_options
+@click.option("--ticker", help="Stock ticker symbol to analyze.", default=None)
+@click.option(
+    "--file",
+    help=f"File containing list of tickers to analyze. Defaults to: {PATH_TO_FTSE_CSV}",
+    default=PATH_TO_FTSE_CSV,
+)
+@click.option(
+    "--period",
+    default="3y",
+    help="Data period (e.g., '3y', or '2021-01-01:2024-01-01')",
+)
+@click.option("--output", default="csv", help="Output format: csv, json, plot")
+@click.option(
+    "--service",
+    default="TrendBased",
+    help="Selected technical analysis ex. TrendBased",
+)
+@click.option(
+    "--param",
+    multiple=True,
+    help="Tuned strategy param ex. 'MainAdviceScoreStrategy.buy_score_threshold=0.3|0.4|0.5'",
+)
+@click.option(
+    "--in-sample-days", default=365, help="Length of in-sample (tuning) window in days."
+)
+@click.option(
+    "--out-of-sample-days",
+    default=90,
+    help="Length of out-of-sample (evaluation) window in days.",
+)
+@click.option(
+    "--backtest-amounts",
+    default="4000,4000,3000,3000,3000,3000",
+    help="Amounts to initially by shares for backtesting.",
+)
+def walk_forward(  # noqa: PLR0913
+    ticker: Optional[str],
+    file: Optional[click.Path],
+    period: str,
+    output: Optional[str],
+    service: Optional[str],
+    param: tuple[str, ...],
+    in_sample_days: int,
+    out_of_sample_days: int,
+    backtest_amounts: str,
+):
+    """CLI command to tune strategy params using walk-forward optimization."""
+    import pandas as pd
+
+    from stock_market_analysis.src.backtest.walk_forward import WalkForwardService
+    from stock_market_analysis.src.services.registry import get_service
+    from stock_market_analysis.src.utils.utils import parse_param_grid_input
+
+    tickers_df = pd.read_csv(file)
+    if ticker is not None:
+        tickers_df = pd.DataFrame({"Ticker": [ticker]}).merge(
+            tickers_df, on="Ticker", how="left"
         )
-        backtest_service.run()
 
-        # Output the results
-        logger.info("=================================")
-        logger.info("BACKTEST LOG:")
-        backtest_df = backtest_service.get_backtest_log()
-        backtest_service.output_data(backtest_df, output, output_file)  # type: ignore
+    walk_forward_service = WalkForwardService(
+        get_service(service),
+        tickers_df,
+        parse_param_grid_input(param),
+        [int(a) for a in backtest_amounts.split(",")],
+        max_stock_amount=5000,
+        min_stock_amount=2000,
+        period=period,
+        in_sample_days=in_sample_days,
+        out_of_sample_days=out_of_sample_days,
+    )
+    walk_forward_service.run()
 
-        logger.info("=================================")
-        logger.info("PORTFOLIO VALUE:")
-        portfolio_df = backtest_service.get_portfolio()
-        backtest_service.output_data(portfolio_df, output, output_file)  # type: ignore
-        print("=================================")
-        return
+    logger.info("=================================")
+    logger.info("WALK-FORWARD RESULTS:")
+    walk_forward_service.service_obj.output_data(
+        walk_forward_service.get_results(), output  # type: ignore
+    )
+
+
+@tech_analysis.command()
+@executor_options
+@click.option("--ticker", help="Stock ticker symbol to analyze.", default=None)
+@click.option(
+    "--file",
+    help=f"File containing list of tickers to analyze. Defaults to: {PATH_TO_FTSE_CSV}",
+    default=PATH_TO_FTSE_CSV,
+)
+@click.option(
+    "--period",
+    default="3y",
+    help="Data period (e.g., '3y', or '2021-01-01:2024-01-01')",
+)
+@click.option("--output", default="csv", help="Output format: csv, json, plot")
+@click.option(
+    "--service",
+    default="RSIBase",
+    help="Selected technical analysis ex. RSIBase",
+)
+@click.option(
+    "--signal-column",
+    default="main_advice",
+    help="Studied signal column of the service's output.",
+)
+@click.option(
+    "--signal-values",
+    default="buy",
+    help="Values of the signal column which are studied ex. 'buy|strong_buy'",
+)
+@click.option(
+    "--horizons",
+    default="5,10,20",
+    help="Horizons (in days) of forward returns ex. '5,10,20'",
+)
+@click.option(
+    "--thresholds",
+    default="2,5",
+    help="Yield thresholds (in percents) of hit rates ex. '2,5'",
+)
+def signal_study(  # noqa: PLR0913
+    ticker: Optional[str],
+    file: Optional[click.Path],
+    period: str,
+    output: Optional[str],
+    service: Optional[str],
+    signal_column: str,
+    signal_values: str,
+    horizons: str,
+    thresholds: str,
+):
+    """CLI command to study forward returns following signals of selected service."""
+    import pandas as pd
+    from joblib import delayed
+
+    from stock_market_analysis.src.analysis.signal_study import SignalStudy
+    from stock_market_analysis.src.executor.config import get_executor_config
+    from stock_market_analysis.src.services.registry import get_service
+
+    tickers_df = pd.read_csv(file)
+    tickers = [ticker] if ticker is not None else tickers_df["Ticker"].tolist()
+
+    service_obj = get_service(service)
+    results = get_executor_config().get_parallel()(
+        delayed(service_obj.run)(ticker, period) for ticker in tickers
+    )
+    # signals are studied on full (not filtered by post-run analysis) data, as
+    # forward returns need all following days
+    result_df = service_obj.set_main_advice(pd.concat(results))
+
+    study_df = SignalStudy(
+        signal_column=signal_column,
+        signal_values=signal_values.split("|"),
+        horizons=[int(h) for h in horizons.split(",")],
+        thresholds=[float(t) for t in thresholds.split(",")],
+    ).apply(result_df)
+
+    logger.info("=================================")
+    logger.info("SIGNAL STUDY:")
+    service_obj.output_data(study_df, output)  # type: ignore
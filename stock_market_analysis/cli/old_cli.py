@@ -1,6 +1,5 @@
 """Interface for command line tool."""
 
-import importlib.metadata
 from datetime import datetime
 from typing import List
 
@@ -8,6 +7,9 @@ import click
 import pandas as pd
 from pydantic import BaseModel
 
+from stock_market_analysis.cli.executor_options import executor_options
+from stock_market_analysis.cli.general_cli import general, version  # noqa: F401
+from stock_market_analysis.src.executor.config import get_executor_config
 from stock_market_analysis.src.stock_data_fetcher import (
     fetch_chart_trend,
     fetch_chart_trends,
@@ -36,22 +38,11 @@ class HistoricalDataResponse(BaseModel):
     prices: List[float]
 
 
-@click.group()
-def general():
-    """CLI command group."""
-
-
 @click.group()
 def stock_data():
     """CLI command group."""
 
 
-@general.command()
-def version():
-    """Return version of this tool."""
-    click.echo(importlib.metadata.version("stock_market_analysis"))
-
-
 @stock_data.command()
 @click.option("--ticker", help="Stock ticker symbol, e.g., AAPL")
 @click.option(
@@ -175,6 +166,7 @@ def chart_trend(ticker: str, days: int = 90):
 
 
 @stock_data.command()
+@executor_options
 @click.option(
     "--file",
     type=click.Path(exists=True),
@@ -226,6 +218,7 @@ def volume_analysis_single(ticker: str, days: int = 90):
 
 
 @stock_data.command()
+@executor_options
 @click.option(
     "--file",
     type=click.Path(exists=True),
@@ -254,9 +247,12 @@ def volume_analysis(
     tickers_df = pd.read_csv(file)
     tickers = tickers_df["Code"].tolist()
 
-    # Call the function to get trends
-    volumes = fetch_volume_analysis_data_multiple_tickers(tickers, days)
-    trends = fetch_chart_trends(tickers, days, window)
+    # Call the function to get trends, both stages reuse the same workers
+    with get_executor_config().get_parallel() as parallel:
+        volumes = fetch_volume_analysis_data_multiple_tickers(
+            tickers, days, parallel=parallel
+        )
+        trends = fetch_chart_trends(tickers, days, window, parallel=parallel)
 
     result_df = trends.merge(volumes, on="Company code")
     result_df = result_df.sort_values(
@@ -299,6 +295,7 @@ def momentum_analysis_single(
 
 
 @stock_data.command()
+@executor_options
 @click.option(
     "--file",
     type=click.Path(exists=True),
@@ -352,6 +349,7 @@ def macd_3_day_rule_backtesting_single(
 
 
 @stock_data.command()
+@executor_options
 @click.option(
     "--file",
     type=click.Path(exists=True),
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from typing import ClassVar, Optional, TypeVar
 
 import pandas as pd
 
@@ -10,6 +10,34 @@ Self = TypeVar("Self", bound="BaseAnalysis")
 class BaseAnalysis(ABC):
     """Base class for post run analysis."""
 
+    # result of a row depends only on the row itself (ex. filtering), so analysis
+    # could be applied to rows of every ticker separately (in parallel workers)
+    is_row_local: ClassVar[bool] = False
+    # analysis could add / remove rows (not only reorder them)
+    changes_rows: ClassVar[bool] = True
+
     @abstractmethod
     def apply(self: Self, data: pd.DataFrame):
         """Apply analysis to the stock data."""
+
+    def get_columns(self: Self) -> Optional[list[str]]:
+        """Return columns the analysis reads (None = any column could be read)."""
+        return None
+
+
+def split_row_local_analyses(
+    analyses: list[BaseAnalysis],
+) -> tuple[list[BaseAnalysis], list[BaseAnalysis]]:
+    """Split analyses into row-local ones (applicable per ticker) and the rest.
+
+    Row-local analysis is pushed down only if all previous not pushed analyses
+    just reorder rows (ex. sorting), so the final result doesn't change.
+    """
+    row_local: list[BaseAnalysis] = []
+    remaining: list[BaseAnalysis] = []
+    for analysis in analyses:
+        if analysis.is_row_local and not any(a.changes_rows for a in remaining):
+            row_local.append(analysis)
+        else:
+            remaining.append(analysis)
+    return row_local, remaining
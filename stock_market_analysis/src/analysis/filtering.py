@@ -1,4 +1,4 @@
-from typing import Optional, TypeVar
+from typing import ClassVar, Optional, TypeVar
 
 import pandas as pd
 
@@ -12,6 +12,8 @@ Self = TypeVar("Self", bound="FilterBy")
 class FilterBy(BaseAnalysis):
     """Sorting input data by date (which is index)."""
 
+    is_row_local: ClassVar[bool] = True
+
     def __init__(self: Self, filters: Optional[dict] = None) -> None:
         """Sort provided columns by provided orders."""
         if filters is None:
@@ -22,6 +24,10 @@ class FilterBy(BaseAnalysis):
             str(self.filters),
         )
 
+    def get_columns(self: Self) -> list[str]:
+        """Return filtered columns."""
+        return list(self.filters)
+
     def apply(self: Self, df: pd.DataFrame):
         """Apply analysis to the data from data_df."""
         mask = pd.Series(True, index=df.index)
@@ -48,3 +54,16 @@ class FilterBy(BaseAnalysis):
                 mask &= column_mask
 
         return df[mask]
+
+
+def filter_tickers_df(tickers_df: pd.DataFrame, filters: dict) -> pd.DataFrame:
+    """Apply filters based on columns of tickers CSV file before analysis.
+
+    Such filters (ex. 'Stock_Index') don't depend on analysis, so they are applied
+    to save analysis time of filtered out tickers.
+    """
+    before_analysis_filters = {
+        key: filters[key] for key in tickers_df.columns if key in filters
+    }
+    logger.info("Filters applied before analysis: %s", str(before_analysis_filters))
+    return FilterBy(filters=before_analysis_filters).apply(tickers_df)
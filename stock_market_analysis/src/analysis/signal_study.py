@@ -0,0 +1,136 @@
+from typing import Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.analysis.base_analysis import BaseAnalysis
+from stock_market_analysis.src.logger import logger
+
+
+Self = TypeVar("Self", bound="SignalStudy")
+
+UNIVERSE_TICKER = "ALL"
+
+
+class SignalStudy(BaseAnalysis):
+    """Study of forward returns following signal of any column of multi-ticker data.
+
+    For every horizon (in bars) it reports number of signals, average forward
+    return, hit rates (percent of signals followed by return >= threshold) and
+    average maximum favorable / adverse excursion (MFE / MAE), per ticker and
+    across all tickers ('ALL').
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        signal_column: str,
+        signal_values: Optional[list] = None,
+        horizons: Optional[list[int]] = None,
+        thresholds: Optional[list[float]] = None,
+        price_column: str = "Close",
+    ) -> None:
+        """Study rows where signal_column is one of signal_values (default: 'buy')."""
+        self.signal_column = signal_column
+        self.signal_values = signal_values if signal_values is not None else ["buy"]
+        self.horizons = sorted(horizons) if horizons else [5, 10, 20]
+        self.thresholds = thresholds if thresholds is not None else [2.0, 5.0]
+        self.price_column = price_column
+        logger.info(
+            "Preparing signal study of '%s' in %s: horizons: %s, thresholds: %s",
+            self.signal_column,
+            str(self.signal_values),
+            str(self.horizons),
+            str(self.thresholds),
+        )
+
+    def _future_prices(
+        self: Self, prices: np.ndarray, tickers: np.ndarray, rows: np.ndarray
+    ) -> np.ndarray:
+        """Return rows x max_horizon prices 1..max_horizon bars ahead of the same ticker."""
+        n_rows = len(prices)
+        ahead_idx = rows[:, None] + np.arange(1, self.horizons[-1] + 1)
+        is_valid = ahead_idx < n_rows
+        ahead_idx = np.minimum(ahead_idx, n_rows - 1)
+        is_valid &= tickers[ahead_idx] == tickers[rows, None]
+        return np.where(is_valid, prices[ahead_idx], np.nan)
+
+    def apply(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """Return signal study of data_df (rows of every ticker ordered by date)."""
+        data_df = (
+            data_df.sort_values("Date", kind="stable")
+            if "Date" in data_df.columns
+            else data_df.sort_index(kind="stable")
+        ).sort_values("Ticker", kind="stable")
+        tickers = data_df["Ticker"].to_numpy()
+        prices = data_df[self.price_column].to_numpy(dtype=float)
+        signal_rows = np.flatnonzero(
+            data_df[self.signal_column].isin(self.signal_values).to_numpy()
+        )
+
+        future_prices = self._future_prices(prices, tickers, signal_rows)
+        signal_prices = prices[signal_rows][:, None]
+        signal_tickers = tickers[signal_rows]
+
+        # excursions up to every bar ahead, computed for all horizons at once
+        max_favorable = np.maximum.accumulate(future_prices, axis=1)
+        max_adverse = np.minimum.accumulate(future_prices, axis=1)
+
+        stats = {}
+        for horizon in self.horizons:
+            forward_return = (
+                (future_prices[:, horizon - 1] - signal_prices[:, 0])
+                / signal_prices[:, 0]
+                * 100
+            )
+            is_complete = ~np.isnan(forward_return)
+            stats[(horizon, "signals")] = is_complete
+            stats[(horizon, "return_sum")] = np.where(is_complete, forward_return, 0)
+            for threshold in self.thresholds:
+                stats[(horizon, f"hits_{threshold:g}")] = is_complete & (
+                    forward_return >= threshold
+                )
+            stats[(horizon, "mfe_sum")] = np.where(
+                is_complete,
+                np.nan_to_num(max_favorable[:, horizon - 1] / signal_prices[:, 0] - 1),
+                0,
+            ) * 100
+            stats[(horizon, "mae_sum")] = np.where(
+                is_complete,
+                np.nan_to_num(max_adverse[:, horizon - 1] / signal_prices[:, 0] - 1),
+                0,
+            ) * 100
+
+        # sums per ticker, universe sums are sums of per ticker sums
+        sums_df = pd.DataFrame(stats, index=signal_tickers).groupby(level=0).sum()
+        sums_df.loc[UNIVERSE_TICKER] = sums_df.sum()
+        return self._get_study_table(sums_df)
+
+    def _get_study_table(self: Self, sums_df: pd.DataFrame) -> pd.DataFrame:
+        """Convert sums per ticker and horizon into averages and hit rates."""
+        sums_df = (
+            pd.concat(
+                {horizon: sums_df[horizon] for horizon in self.horizons},
+                names=["horizon", "Ticker"],
+            )
+            .swaplevel()
+            .reindex(pd.MultiIndex.from_product([sums_df.index, self.horizons]))
+        )
+        sums_df.index.names = ["Ticker", "horizon"]
+        signals = sums_df["signals"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # integer hit counts are kept besides hit rates (ex. win counts)
+            hit_columns = {}
+            for threshold in self.thresholds:
+                hits = sums_df[f"hits_{threshold:g}"]
+                hit_columns[f"hits_{threshold:g}"] = hits.astype(int)
+                hit_columns[f"hit_rate_{threshold:g}"] = hits / signals * 100
+            study_df = pd.DataFrame(
+                {
+                    "signals": signals.astype(int),
+                    "avg_return": sums_df["return_sum"] / signals,
+                    **hit_columns,
+                    "avg_mfe": sums_df["mfe_sum"] / signals,
+                    "avg_mae": sums_df["mae_sum"] / signals,
+                }
+            )
+        return study_df.reset_index()
@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
@@ -12,6 +12,8 @@ Self = TypeVar("Self", bound="SortBy")
 class SortBy(BaseAnalysis):
     """Sorting input data by date (which is index)."""
 
+    changes_rows: ClassVar[bool] = False
+
     def __init__(self: Self, columns: list[str], orders_asc: list[bool]) -> None:
         """Sort provided columns by provided orders."""
         self.columns = columns
@@ -22,6 +24,10 @@ class SortBy(BaseAnalysis):
             str(self.order_asc_bools),
         )
 
+    def get_columns(self: Self) -> list[str]:
+        """Return sorting columns."""
+        return list(self.columns)
+
     def apply(self: Self, data_df: pd.DataFrame):
         """Apply analysis to the data from data_df."""
         if not self.columns:
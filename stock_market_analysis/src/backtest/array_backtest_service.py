@@ -0,0 +1,584 @@
+"""Event-driven backtest engine working on preallocated NumPy arrays."""
+
+import pickle
+from pathlib import Path
+from typing import List, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.backtest.backtest_service import BacktestService
+from stock_market_analysis.src.backtest.price_matrix import get_recent_prices
+from stock_market_analysis.src.backtest.transaction_log import TransactionLogBuffer
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.utils.utils import get_date_range, inject_missing_dates
+
+
+Self = TypeVar("Self", bound="ArrayBacktestService")
+PositionsSelf = TypeVar("PositionsSelf", bound="PositionArrays")
+
+ADVICE_BUY = 1
+ADVICE_SELL = -1
+ADVICE_NONE = 0
+
+STATE_VERSION = 1
+
+# per signal row arrays of prepared backtests (see prepare_arrays())
+ROW_ARRAYS = (
+    "row_date_idx",
+    "row_ticker_idx",
+    "row_advice",
+    "row_close",
+    "row_stock_index",
+)
+
+# vectors of PositionArrays (besides 'stock_index' list)
+POSITION_COLUMNS = (
+    "ticker_idx",
+    "shares",
+    "buy_price",
+    "buy_date_idx",
+    "sell_price_stop_loss",
+    "total_investment",
+    "is_open",
+    "sell_date_idx",
+    "sell_price",
+)
+
+
+def hash_signals_per_date(df: pd.DataFrame) -> pd.Series:
+    """Return hash of all signal rows (in their order) of every date of df."""
+    rows = df[df["Ticker"].notna()]
+    rows = rows.assign(row_of_date=rows.groupby("Date").cumcount())
+    row_hashes = pd.util.hash_pandas_object(
+        rows[["Date", "row_of_date", "Ticker", "Stock_Index", "main_advice", "Close"]],
+        index=False,
+    )
+    return row_hashes.groupby(rows["Date"].to_numpy()).sum()
+
+
+class PositionArrays:
+    """Per-position vectors of the simulation, stored in buy order like holdings.
+
+    Columns match positions saved by ArrayBacktestService.save_state() (with
+    indexes of tickers and dates instead of their names).
+    """
+
+    def __init__(
+        self: PositionsSelf,
+        capacity: int,
+        n_tickers: int,
+        restored: Optional[pd.DataFrame] = None,
+    ) -> None:
+        """Preallocate vectors of capacity positions, starting with restored ones."""
+        self.ticker_idx = np.zeros(capacity, dtype=np.int64)
+        self.shares = np.zeros(capacity, dtype=np.int64)
+        self.buy_price = np.zeros(capacity)
+        self.buy_date_idx = np.zeros(capacity, dtype=np.int64)
+        self.sell_price_stop_loss = np.zeros(capacity)
+        self.total_investment = np.zeros(capacity)
+        self.is_open = np.zeros(capacity, dtype=bool)
+        self.sell_date_idx = np.full(capacity, -1, dtype=np.int64)
+        self.sell_price = np.full(capacity, np.nan)
+        self.stock_index: List[str] = []
+        self.n_pos = 0
+        if restored is not None:
+            self.n_pos = len(restored)
+            self.stock_index = restored["stock_index"].tolist()
+            for name in POSITION_COLUMNS:
+                getattr(self, name)[: self.n_pos] = restored[name]
+        self.open_per_ticker = np.bincount(
+            self.ticker_idx[: self.n_pos][self.is_open[: self.n_pos]], minlength=n_tickers
+        )
+        self.n_open = int(self.is_open.sum())
+
+    def get_holdings_value(self: PositionsSelf) -> float:
+        """Return value of open positions by their buy prices."""
+        is_open = self.is_open[: self.n_pos]
+        return float((self.shares * self.buy_price)[: self.n_pos][is_open].sum())
+
+    def open_position(  # noqa: PLR0913
+        self: PositionsSelf,
+        ticker_idx: int,
+        stock_index: str,
+        shares: int,
+        buy_price: float,
+        buy_date_idx: int,
+        sell_price_stop_loss: float,
+        total_investment: float,
+    ) -> None:
+        """Append a new open position."""
+        slot = self.n_pos
+        self.ticker_idx[slot] = ticker_idx
+        self.shares[slot] = shares
+        self.buy_price[slot] = buy_price
+        self.buy_date_idx[slot] = buy_date_idx
+        self.sell_price_stop_loss[slot] = sell_price_stop_loss
+        self.total_investment[slot] = total_investment
+        self.is_open[slot] = True
+        self.stock_index.append(stock_index)
+        self.n_pos += 1
+        self.n_open += 1
+        self.open_per_ticker[ticker_idx] += 1
+
+    def close_position(
+        self: PositionsSelf, slot: int, sell_date_idx: int, sell_price: float
+    ) -> None:
+        """Mark position of the slot as sold."""
+        self.is_open[slot] = False
+        self.sell_date_idx[slot] = sell_date_idx
+        self.sell_price[slot] = sell_price
+        self.n_open -= 1
+        self.open_per_ticker[self.ticker_idx[slot]] -= 1
+
+    def to_frame(self: PositionsSelf) -> pd.DataFrame:
+        """Return all (open and sold) positions."""
+        return pd.DataFrame(
+            {
+                "stock_index": self.stock_index,
+                **{name: getattr(self, name)[: self.n_pos] for name in POSITION_COLUMNS},
+            }
+        )[["ticker_idx", "stock_index", *POSITION_COLUMNS[1:]]]
+
+
+class ArrayBacktestService(BacktestService):
+    """Performs stock strategy backtesting over NumPy arrays.
+
+    Produces the same transaction log and portfolio as BacktestService, but instead
+    of iterating DataFrame rows it keeps:
+    - a dates x tickers close price matrix (shared with BacktestService),
+    - per-row date/ticker indexes, advice codes and close prices,
+    - per-position vectors of tickers, shares, prices and stop/loss levels.
+    Stop/loss is checked once per date as a vectorized comparison of all open
+    positions.
+
+    State of a finished run could be saved by save_state() and resumed by
+    from_state() - the resumed run simulates only rows after the last processed
+    date.
+    """
+
+    def __init__(self: Self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
+        """Config of ArrayBacktestService (see BacktestService)."""
+        super().__init__(*args, **kwargs)
+        self.last_date: Optional[pd.Timestamp] = None
+        self.date_hashes = pd.Series(dtype=np.uint64)
+        # positions of resumed run (with ticker names and dates instead of indexes)
+        self.restored_positions: Optional[pd.DataFrame] = None
+        # tickers of resumed run, so its transactions are valued by the price matrix
+        self.restored_tickers = pd.Index([])
+        # first date of signals of resumed run (prices are loaded since its first date)
+        self.signals_start_date: Optional[pd.Timestamp] = None
+        # value of open positions by buy prices, kept by the simulation
+        self.holdings_value = 0.0
+
+    def prepare_arrays(self: Self) -> None:
+        """Convert signals DataFrame into arrays used by the simulation.
+
+        Arrays are kept in 'dates', 'tickers', 'close_matrix' and ROW_ARRAYS
+        attributes, ex. to be shared by backtests of many scenarios.
+        """
+        self.df = inject_missing_dates(self.df, self.backtesting_period)
+        self.dates = self._load_price_matrix().index
+        df = self.df
+
+        self.row_date_idx = self.dates.get_indexer(df["Date"])
+        self.row_ticker_idx = self.tickers.get_indexer(df["Ticker"])
+        self.row_advice = np.select(
+            [df["main_advice"] == "buy", df["main_advice"] == "sell"],
+            [ADVICE_BUY, ADVICE_SELL],
+            ADVICE_NONE,
+        )
+        self.row_close = df["Close"].to_numpy(dtype=float)
+        self.row_stock_index = df["Stock_Index"].to_numpy(dtype=object)
+
+    def _get_backtested_tickers(self: Self) -> pd.Index:
+        """Return tickers of the signals followed by other tickers of resumed run."""
+        tickers = super()._get_backtested_tickers()
+        return tickers.append(self.restored_tickers.difference(tickers))
+
+    def _get_buy_amount(self: Self) -> float:
+        """Return amount of a single buy.
+
+        BacktestService resets its backtest_amounts index on every row, so every buy
+        uses the first of backtest_amounts (or max_stock_amount if there are none).
+        """
+        if self.backtest_amounts:
+            return self.backtest_amounts[0]
+        return self.max_stock_amount
+
+    def run(self: Self) -> None:
+        """Run the backtest over array representation of the signals.
+
+        Resumed backtest checks that signals up to the last processed date haven't
+        changed and simulates only the following rows.
+        """
+        self.prepare_arrays()
+        date_hashes = hash_signals_per_date(self.df)
+        start_row = 0
+        if self.last_date is not None:
+            self._check_signals_history(date_hashes)
+            first_new_date_idx = self.dates.searchsorted(self.last_date, side="right")
+            start_row = int(np.searchsorted(self.row_date_idx, first_new_date_idx))
+
+        self._simulate(start_row)
+
+        priced_dates = self.dates[~np.isnan(self.close_matrix).all(axis=1)]
+        if len(priced_dates):
+            self.last_date = priced_dates[-1]
+        if self.last_date is not None:
+            self.date_hashes = date_hashes[date_hashes.index <= self.last_date]
+
+    def run_prepared(
+        self: Self, price_matrix: pd.DataFrame, rows: dict[str, np.ndarray]
+    ) -> None:
+        """Run the backtest over arrays already prepared by prepare_arrays().
+
+        Args:
+        ----
+            price_matrix (pd.DataFrame): dates x tickers 'Close' prices rows refer to
+            rows (dict[str, np.ndarray]): Arrays of ROW_ARRAYS attributes of
+                the signal rows
+        """
+        self.price_matrix = price_matrix
+        self.dates = price_matrix.index
+        self.tickers = price_matrix.columns
+        self.close_matrix = price_matrix.to_numpy(dtype=float)
+        for name in ROW_ARRAYS:
+            setattr(self, name, rows[name])
+        self._simulate()
+
+    def _check_signals_history(self: Self, date_hashes: pd.Series) -> None:
+        """Raise ValueError when signals of already processed dates have changed."""
+        signals_start_date = self.signals_start_date or self.dates[0]
+        previous = self.date_hashes[self.date_hashes.index >= signals_start_date]
+        current = date_hashes[date_hashes.index <= self.last_date]
+        all_dates = previous.index.union(current.index)
+        changed = all_dates[
+            previous.reindex(all_dates, fill_value=0).to_numpy()
+            != current.reindex(all_dates, fill_value=0).to_numpy()
+        ]
+        if len(changed):
+            msg = (
+                f"Signals of already backtested dates have changed (first: "
+                f"{changed[0]:%Y-%m-%d}), the backtest must be rerun from scratch."
+            )
+            raise ValueError(msg)
+
+    def _simulate(self: Self, start_row: int = 0) -> None:
+        """Simulate trades over arrays prepared by prepare_arrays().
+
+        Simulation starts at start_row with cash and positions of resumed run.
+        """
+        restored = self._get_restored_positions()
+        # every buy signal could open a position
+        capacity = (
+            (len(restored) if restored is not None else 0)
+            + int(np.count_nonzero(self.row_advice[start_row:] == ADVICE_BUY))
+            + 1
+        )
+        positions = PositionArrays(capacity, len(self.tickers), restored)
+        self.remaining_cash = float(self.remaining_cash)
+        self.holdings_value = positions.get_holdings_value()
+        buy_amount = self._get_buy_amount()
+
+        rows = zip(
+            self.row_date_idx[start_row:].tolist(),
+            self.row_ticker_idx[start_row:].tolist(),
+            self.row_advice[start_row:].tolist(),
+            self.row_close[start_row:].tolist(),
+            self.row_stock_index[start_row:].tolist(),
+            strict=True,
+        )
+        prev_date_idx = -1
+        for date_idx, ticker_idx, advice, close, stock_index in rows:
+            is_new_date = date_idx != prev_date_idx
+            prev_date_idx = date_idx
+
+            # Check for sell signals first
+            if positions.n_open and (
+                is_new_date
+                or (advice == ADVICE_SELL and positions.open_per_ticker[ticker_idx])
+            ):
+                sell_ticker_idx = ticker_idx if advice == ADVICE_SELL else -1
+                self._sell_positions(
+                    positions, date_idx, sell_ticker_idx, close, is_new_date
+                )
+
+            if advice == ADVICE_BUY and self.remaining_cash >= self.min_stock_amount:
+                self._buy_position(
+                    positions, date_idx, ticker_idx, stock_index, close, buy_amount
+                )
+
+        self.positions = positions.to_frame()
+        logger.info(
+            "Array backtest processed %d rows, %d transactions",
+            len(self.row_date_idx) - start_row,
+            len(self.transaction_log),
+        )
+
+    def _sell_positions(  # noqa: PLR0913
+        self: Self,
+        positions: "PositionArrays",
+        date_idx: int,
+        sell_ticker_idx: int,
+        close: float,
+        is_new_date: bool,
+    ) -> None:
+        """Sell open positions of the sell signal's ticker and ones hitting stop/loss.
+
+        Stop/loss is evaluated at the first row of the date only, as later rows of
+        the same date see the same prices. sell_ticker_idx is -1 without a signal.
+        """
+        slots = np.flatnonzero(positions.is_open[: positions.n_pos])
+        signal_mask = positions.ticker_idx[slots] == sell_ticker_idx
+        stop_mask = np.zeros(len(slots), dtype=bool)
+        stop_prices = np.full(len(slots), np.nan)
+        if is_new_date:
+            stop_prices = self.close_matrix[date_idx, positions.ticker_idx[slots]]
+            with np.errstate(invalid="ignore"):
+                stop_mask = (positions.buy_date_idx[slots] < date_idx) & (
+                    stop_prices <= positions.sell_price_stop_loss[slots] * 100
+                )
+
+        for i in np.flatnonzero(signal_mask | stop_mask).tolist():
+            slot = int(slots[i])
+            if signal_mask[i]:
+                price = close / 100
+                suffix = "_signal"
+            else:
+                price = float(stop_prices[i]) / 100
+                suffix = "_stop_loss"
+            shares = int(positions.shares[slot])
+            total_sale = shares * price - self.transaction_fee
+            yield_amount = total_sale - positions.total_investment[slot]
+            yield_percent = (yield_amount / positions.total_investment[slot]) * 100
+
+            positions.close_position(slot, date_idx, price)
+            self.holdings_value -= shares * positions.buy_price[slot]
+            self.remaining_cash += total_sale
+            self._log_transaction(
+                date_idx,
+                int(positions.ticker_idx[slot]),
+                positions.stock_index[slot],
+                f"sell{suffix}",
+                shares,
+                total_sale,
+                price,
+                float(yield_amount),
+                float(yield_percent),
+            )
+
+    def _buy_position(  # noqa: PLR0913
+        self: Self,
+        positions: "PositionArrays",
+        date_idx: int,
+        ticker_idx: int,
+        stock_index: str,
+        close: float,
+        buy_amount: float,
+    ) -> None:
+        """Open a position of the buy signal if there's enough cash available."""
+        price = close / 100
+        max_available_amount = min(buy_amount, self.remaining_cash) - self.transaction_fee
+        shares = int(max_available_amount // price)
+        total_investment = shares * price + self.transaction_fee
+        if shares <= 0 or self.remaining_cash < total_investment:
+            return
+
+        positions.open_position(
+            ticker_idx,
+            stock_index,
+            shares,
+            price,
+            date_idx,
+            price * self.stop_loss_ratio,
+            total_investment,
+        )
+        self.holdings_value += shares * price
+        self.remaining_cash -= total_investment
+        self._log_transaction(
+            date_idx, ticker_idx, stock_index, "buy", shares, -total_investment, price
+        )
+
+    def _log_transaction(  # noqa: PLR0913
+        self: Self,
+        date_idx: int,
+        ticker_idx: int,
+        stock_index: str,
+        transaction: str,
+        shares: int,
+        amount: float,
+        price: float,
+        yield_amount: float = 0.0,
+        yield_percent: float = 0.0,
+    ) -> None:
+        """Append transaction (with totals valuing positions by buy price) to the log."""
+        total_value = self.holdings_value + self.remaining_cash
+        total_yield = total_value - self.initial_cash
+        self.transaction_log.append(
+            date=self.dates[date_idx],
+            ticker=self.tickers[ticker_idx],
+            stock_index=stock_index,
+            transaction=transaction,
+            close_price=price,
+            hold_shares_number=shares,
+            transaction_amount=amount,
+            yield_amount=yield_amount,
+            yield_percent=yield_percent,
+            available_cash=self.remaining_cash,
+            total_value=total_value,
+            total_yield=total_yield,
+            total_yield_percent=(total_yield / self.initial_cash) * 100,
+        )
+
+    def _get_restored_positions(self: Self) -> Optional[pd.DataFrame]:
+        """Return positions of resumed run indexed by current tickers and dates."""
+        if self.restored_positions is None:
+            return None
+
+        positions = self.restored_positions
+        ticker_idx = self.tickers.get_indexer(positions["ticker"])
+        missing = positions.loc[positions["is_open"] & (ticker_idx < 0), "ticker"]
+        if len(missing):
+            msg = f"Signals don't contain held tickers: {', '.join(missing.unique())}"
+            raise ValueError(msg)
+
+        # positions bought / sold before the first date are mapped to the first date
+        return positions.assign(
+            ticker_idx=np.maximum(ticker_idx, 0),
+            buy_date_idx=self.dates.searchsorted(positions["buy_date"]),
+            sell_date_idx=np.where(
+                positions["sell_date"].notna(),
+                self.dates.searchsorted(positions["sell_date"]),
+                -1,
+            ),
+        )
+
+    def save_state(self: Self, state_file: str) -> None:
+        """Save cash, positions, transaction log (or its cursor) and signals hashes."""
+        if self.last_date is None:
+            msg = "Backtest must be run before saving its state."
+            raise ValueError(msg)
+
+        positions = self.positions
+        self.transaction_log.flush()
+        state = {
+            "version": STATE_VERSION,
+            "backtest_amounts": self.backtest_amounts,
+            "max_stock_amount": self.max_stock_amount,
+            "min_stock_amount": self.min_stock_amount,
+            "transaction_fee": self.transaction_fee,
+            "stop_loss_ratio": self.stop_loss_ratio,
+            "remaining_cash": self.remaining_cash,
+            "positions": pd.DataFrame(
+                {
+                    "ticker": self.tickers[positions["ticker_idx"]],
+                    "stock_index": positions["stock_index"],
+                    "shares": positions["shares"],
+                    "buy_price": positions["buy_price"],
+                    "buy_date": self.dates[positions["buy_date_idx"]],
+                    "sell_price_stop_loss": positions["sell_price_stop_loss"],
+                    "total_investment": positions["total_investment"],
+                    "is_open": positions["is_open"],
+                    "sell_date": pd.DatetimeIndex(
+                        np.where(
+                            positions["sell_date_idx"] >= 0,
+                            self.dates[positions["sell_date_idx"]],
+                            pd.NaT,
+                        )
+                    ),
+                    "sell_price": positions["sell_price"],
+                }
+            ),
+            "first_date": self.dates[0],
+            "tickers": self.tickers,
+            "last_date": self.last_date,
+            "date_hashes": self.date_hashes,
+            "log_file": self.transaction_log.log_file,
+            "log_rows": len(self.transaction_log),
+            # log streamed into log_file is resumed from its cursor (log_rows)
+            "log_df": None if self.transaction_log.log_file else self.get_backtest_log(),
+        }
+        with Path(state_file).open("wb") as f:
+            pickle.dump(state, f)
+        logger.info("Backtest state saved (last date: %s): %s", self.last_date, state_file)
+
+    @classmethod
+    def from_state(
+        cls: type[Self],
+        df: pd.DataFrame,
+        backtesting_period: str,
+        state_file: str,
+        price_matrix: Optional[pd.DataFrame] = None,
+    ) -> Self:
+        """Return backtest resumed from state saved by save_state().
+
+        df must contain signals of the already processed dates (unchanged) followed
+        by new ones, only the new ones are simulated by run(). The backtesting period
+        can start later than the saved run (ex. '1y' of the next day), prices are
+        still loaded since the first date of the saved run, so the equity curve and
+        metrics cover all its transactions.
+        """
+        with Path(state_file).open("rb") as f:
+            state = pickle.load(f)  # noqa: S301
+        if state.get("version") != STATE_VERSION:
+            msg = f"Unsupported backtest state version: {state.get('version')}"
+            raise ValueError(msg)
+
+        log_file = state["log_file"]
+        start_date, end_date = get_date_range(backtesting_period)
+        first_date = state.get("first_date")
+        signals_start_date = pd.Timestamp(start_date)
+        if first_date is not None and first_date < signals_start_date:
+            backtesting_period = f"{first_date:%Y-%m-%d}:{end_date}"
+        backtest_service = cls(
+            df,
+            state["backtest_amounts"],
+            state["max_stock_amount"],
+            state["min_stock_amount"],
+            backtesting_period,
+            price_matrix=price_matrix,
+            transaction_fee=state["transaction_fee"],
+            stop_loss_ratio=state["stop_loss_ratio"],
+        )
+        if log_file:
+            backtest_service.transaction_log = TransactionLogBuffer(
+                log_file, streamed_rows=state["log_rows"]
+            )
+        else:
+            backtest_service.transaction_log.extend(state["log_df"])
+        backtest_service.remaining_cash = state["remaining_cash"]
+        backtest_service.restored_positions = state["positions"]
+        backtest_service.restored_tickers = state.get("tickers", pd.Index([]))
+        backtest_service.signals_start_date = signals_start_date
+        backtest_service.last_date = state["last_date"]
+        backtest_service.date_hashes = state["date_hashes"]
+        return backtest_service
+
+    def calculate_total_value(self: Self) -> float:
+        """Calculate total value of open positions (by buy price) and available cash."""
+        if not hasattr(self, "positions"):
+            return self.remaining_cash
+        open_positions = self.positions[self.positions["is_open"]]
+        holdings_value = (open_positions["shares"] * open_positions["buy_price"]).sum()
+        return holdings_value + self.remaining_cash
+
+    def _get_portfolio_positions(self: Self) -> List[dict]:
+        """Return currently held positions valued by the most recent 'Close' price."""
+        if not hasattr(self, "positions"):
+            return []
+
+        recent_prices = get_recent_prices(self.price_matrix).to_numpy() / 100
+
+        open_positions = self.positions[self.positions["is_open"]]
+        return [
+            {
+                "Ticker": self.tickers[position.ticker_idx],
+                "Stock_Index": position.stock_index,
+                "Shares": position.shares,
+                "Recent Close Price": recent_prices[position.ticker_idx],
+                "Total Investment": position.shares
+                * recent_prices[position.ticker_idx],
+            }
+            for position in open_positions.itertuples()
+        ]
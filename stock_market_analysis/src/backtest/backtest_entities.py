@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 import pandas as pd
 from pydantic import BaseModel, PositiveInt
 
@@ -31,9 +33,34 @@ class Holding(BaseModel):
 
     ticker: str
     stock_index: str
+    ticker_idx: int  # column of the ticker in backtest's price matrix
     buy_price: float
     buy_date: pd.Timestamp
     sell_price_stop_loss: float
     shares: PositiveInt
     total_investment: float
-    full_data: pd.DataFrame
+
+
+class WalkForwardWindow(BaseModel):
+    """Represents in-sample and following out-of-sample period of walk-forward run."""
+
+    class Config:  # noqa: D106
+        arbitrary_types_allowed = True
+
+    in_sample_start: pd.Timestamp
+    in_sample_end: pd.Timestamp
+    out_of_sample_start: pd.Timestamp
+    out_of_sample_end: pd.Timestamp
+
+
+class BacktestScenario(BaseModel):
+    """Represents a single configuration of backtest run in a scenario batch."""
+
+    name: str
+    backtest_amounts: List[int]
+    max_stock_amount: float = 5000
+    min_stock_amount: float = 2000
+    # None = BacktestService.TRANSACTION_FEE and BacktestService.DROP_7_PERCENT
+    transaction_fee: Optional[float] = None
+    stop_loss_ratio: Optional[float] = None
+    start_date: Optional[str] = None  # first backtested date ex. '2024-01-01'
@@ -1,13 +1,20 @@
-import copy
 from typing import TYPE_CHECKING, List, Optional, TypeVar
 
+import numpy as np
 import pandas as pd
 from rich.progress import Progress
 
-from stock_market_analysis.src.backtest.backtest_entities import Holding, TransactionLog
-from stock_market_analysis.src.data_providers.yahoo_data import yf_download
+from stock_market_analysis.src.backtest.backtest_entities import Holding
+from stock_market_analysis.src.backtest.metrics import (
+    build_equity_curve,
+    calculate_metrics,
+)
+from stock_market_analysis.src.backtest.price_matrix import (
+    get_recent_prices,
+    load_close_matrix,
+)
+from stock_market_analysis.src.backtest.transaction_log import TransactionLogBuffer
 from stock_market_analysis.src.output.csv_output import CSVOutput
-from stock_market_analysis.src.output.plot_output import PlotOutput
 from stock_market_analysis.src.utils.utils import inject_missing_dates
 
 
@@ -36,6 +43,9 @@ class BacktestService:
             output = CSVOutput()
             output.render(data_df, output_file)
         elif output_format == "plot":
+            # lightweight_charts (and Qt) are imported only for plots
+            from stock_market_analysis.src.output.plot_output import PlotOutput
+
             output = PlotOutput()
             output.render(data_df, output_file, self.columns_to_plot)  # type: ignore
         else:
@@ -49,38 +59,56 @@ class BacktestService:
         max_stock_amount: float,
         min_stock_amount: float,
         backtesting_period: str,
+        log_file: Optional[str] = None,
+        price_matrix: Optional[pd.DataFrame] = None,
+        transaction_fee: Optional[float] = None,
+        stop_loss_ratio: Optional[float] = None,
     ) -> None:
-        """Config of BacktestService."""
+        """Config of BacktestService.
+
+        When log_file is set, transaction log is streamed to that CSV file.
+        price_matrix (dates x tickers 'Close' prices) could be preloaded ex. when
+        many backtests share the same tickers, otherwise it's loaded in run().
+        transaction_fee and stop_loss_ratio default to TRANSACTION_FEE and
+        DROP_7_PERCENT.
+        """
         self.df = df
         self.initial_cash = sum(backtest_amounts)
-        self.remaining_cash = self.initial_cash
+        self.remaining_cash: float = self.initial_cash
         self.backtest_amounts = backtest_amounts
         self.max_stock_amount = max_stock_amount
         self.min_stock_amount = min_stock_amount
         self.holdings: List[Holding] = []
-        self.backtest_df = pd.DataFrame()
+        self.transaction_log = TransactionLogBuffer(log_file)
         self.total_value = self.initial_cash  # Start with total cash as initial value
         self.backtesting_period = backtesting_period
+        self.price_matrix = price_matrix
+        self.transaction_fee = (
+            self.TRANSACTION_FEE if transaction_fee is None else transaction_fee
+        )
+        self.stop_loss_ratio = (
+            self.DROP_7_PERCENT if stop_loss_ratio is None else stop_loss_ratio
+        )
 
     def perform_buy(self: Self, row: pd.Series, amount: float) -> None:
         """Perform a buy transaction if there's enough cash available."""
         price = row["Close"] / 100
-        max_available_amount = min(amount, self.remaining_cash) - self.TRANSACTION_FEE
+        max_available_amount = min(amount, self.remaining_cash) - self.transaction_fee
         shares = int(max_available_amount // price)
-        total_investment = shares * price + self.TRANSACTION_FEE
+        total_investment = shares * price + self.transaction_fee
 
         if shares > 0 and self.remaining_cash >= total_investment:
             # Buy the stock and update remaining cash
             holding = Holding(
                 ticker=row["Ticker"],
                 stock_index=row["Stock_Index"],
+                ticker_idx=self.tickers.get_loc(row["Ticker"]),
                 buy_date=row["Date"],
                 buy_price=price,
                 shares=shares,
                 total_investment=total_investment,
                 sell_price_stop_loss=price
-                * self.DROP_7_PERCENT,  # for 7% rule stop/loss
-                full_data=yf_download(row["Ticker"], self.backtesting_period),
+                * self.stop_loss_ratio,  # for 7% rule stop/loss
             )
             self.holdings.append(holding)
             self.remaining_cash -= total_investment
@@ -97,11 +125,15 @@ class BacktestService:
             )
 
     def perform_sell(
-        self: Self, row: pd.Series, holding: Holding, suffix: str = ""
+        self: Self,
+        row: pd.Series,
+        holding: Holding,
+        suffix: str = "",
+        close_price: Optional[float] = None,
     ) -> None:
-        """Perform a sell transaction and update remaining cash."""
-        price = row["Close"] / 100
-        total_sale = holding.shares * price - self.TRANSACTION_FEE
+        """Perform a sell transaction (by row's 'Close' if close_price is not set)."""
+        price = (row["Close"] if close_price is None else close_price) / 100
+        total_sale = holding.shares * price - self.transaction_fee
         yield_amount = total_sale - holding.total_investment
         yield_percent = (yield_amount / holding.total_investment) * 100
 
@@ -140,8 +172,7 @@ class BacktestService:
         total_yield = total_value - self.initial_cash
         total_yield_percent = (total_yield / self.initial_cash) * 100
 
-        # Create the log entry
-        log_entry = TransactionLog(
+        self.transaction_log.append(
             date=date,
             ticker=ticker,
             stock_index=stock_index,
@@ -155,49 +186,73 @@ class BacktestService:
             total_value=total_value,
             total_yield=total_yield,
             total_yield_percent=total_yield_percent,
-        ).dict()
-
-        # Append the log entry to the DataFrame
-        log_entry_df = pd.DataFrame([log_entry])
-        self.backtest_df = pd.concat([self.backtest_df, log_entry_df])
+        )
 
     def calculate_total_value(self: Self) -> float:
         """Calculate total value of holdings and available cash."""
         holdings_value = sum(h.shares * h.buy_price for h in self.holdings)
         return holdings_value + self.remaining_cash
 
+    def _get_backtested_tickers(self: Self) -> pd.Index:
+        """Return tickers of the signals (columns of the price matrix)."""
+        return pd.Index(self.df["Ticker"].dropna().unique())
+
+    def _load_price_matrix(self: Self) -> pd.DataFrame:
+        """Align (or load once) 'Close' prices of all tickers to the backtested dates."""
+        dates = pd.DatetimeIndex(self.df["Date"].unique())
+        tickers = self._get_backtested_tickers()
+        price_matrix = (
+            load_close_matrix(tickers, self.backtesting_period)
+            if self.price_matrix is None
+            else self.price_matrix
+        ).reindex(index=dates, columns=tickers)
+        self.price_matrix = price_matrix
+        self.tickers = price_matrix.columns
+        self.close_matrix = price_matrix.to_numpy(dtype=float)
+        return price_matrix
+
+    def _get_stop_loss_prices(
+        self: Self, date: pd.Timestamp, date_idx: int
+    ) -> np.ndarray:
+        """Return 'Close' of every holding which hits its stop/loss at date (else NaN)."""
+        if not self.holdings:
+            return np.empty(0)
+        prices = self.close_matrix[date_idx, [h.ticker_idx for h in self.holdings]]
+        stop_loss_prices = np.array([h.sell_price_stop_loss for h in self.holdings])
+        bought_before = np.array([h.buy_date < date for h in self.holdings])
+        with np.errstate(invalid="ignore"):
+            is_stop_loss = bought_before & (prices <= stop_loss_prices * 100)
+        return np.where(is_stop_loss, prices, np.nan)
+
     def run(self: Self) -> None:
         """Run the backtest by iterating through the DataFrame rows with progress tracking."""
         # Perform initial purchases
 
         self.df = inject_missing_dates(self.df, self.backtesting_period)
+        price_matrix = self._load_price_matrix()
+        row_date_idx = price_matrix.index.get_indexer(self.df["Date"])
 
         with Progress() as progress:
             task = progress.add_task("[green]Backtesting...", total=len(self.df))
 
-            for _, row in self.df.iterrows():
+            for row_idx, (_, row) in enumerate(self.df.iterrows()):
+                stop_loss_prices = self._get_stop_loss_prices(
+                    row["Date"], row_date_idx[row_idx]
+                )
 
-                # Check for sell signals first
-                for holding in self.holdings:
-                    row_close_price = (
-                        holding.full_data.loc[row["Date"]]["Close"]
-                        if row["Date"] in holding.full_data.index
-                        and row["Date"] > holding.buy_date
-                        else None
-                    )
+                # Check for sell signals first (iterate over a copy as sold holdings
+                # are removed from the list)
+                for holding, stop_loss_price in zip(
+                    list(self.holdings), stop_loss_prices, strict=True
+                ):
                     if holding.ticker == row["Ticker"] and row["main_advice"] == "sell":
                         # sell because of detected 'sell' signal
                         self.perform_sell(row, holding, "_signal")
-                    elif (
-                        row_close_price
-                        and row_close_price <= holding.sell_price_stop_loss * 100
-                    ):
+                    elif not np.isnan(stop_loss_price):
                         # sell because of stop / loss
-                        if row_close_price:
-                            row_copy = copy.deepcopy(row)
-                            row_copy["Close"] = row_close_price
-                            row_copy["main_advice"] = "sell"  # to avoid buy below
-                        self.perform_sell(row_copy, holding, "_stop_loss")
+                        self.perform_sell(
+                            row, holding, "_stop_loss", close_price=stop_loss_price
+                        )
 
                 # initial_purchases - if backtest_amounts contains money, then get from there
                 idx = 0
@@ -219,31 +274,17 @@ class BacktestService:
                 # Update progress bar
                 progress.update(task, advance=1)
 
-    def get_portfolio(self: Self) -> pd.DataFrame:
-        """Return a summary of the current portfolio with holdings, cash.
-
-        and portfolio value based on today's 'Close' price from Yahoo Finance.
-        """
-
-        def get_latest_price(series: pd.Series) -> float | None:
-            # Remove NaN values and get the last available price
-            non_nan_series = series.dropna()
-            if len(non_nan_series) > 0:
-                return non_nan_series.iloc[-1] / 100
-            return None  # or you could return a default value or raise an exception
-
+    def _get_portfolio_positions(self: Self) -> List[dict]:
+        """Return currently held positions valued by the most recent 'Close' price."""
         if not self.holdings:
-            return pd.DataFrame([])
+            return []
 
-        recent_prices = {
-            holding.ticker: get_latest_price(holding.full_data["Close"])
-            for holding in self.holdings
-        }
+        recent_prices = get_recent_prices(self.price_matrix) / 100
 
         portfolio = []
         for holding in self.holdings:
             # Get the latest close price for each ticker
-            current_close_price = recent_prices.get(holding.ticker)
+            current_close_price = recent_prices.iloc[holding.ticker_idx]
             current_value = holding.shares * current_close_price
             portfolio.append(
                 {
@@ -254,6 +295,16 @@ class BacktestService:
                     "Total Investment": current_value,
                 }
             )
+        return portfolio
+
+    def get_portfolio(self: Self) -> pd.DataFrame:
+        """Return a summary of the current portfolio with holdings, cash.
+
+        and portfolio value based on today's 'Close' price from Yahoo Finance.
+        """
+        portfolio = self._get_portfolio_positions()
+        if not portfolio:
+            return pd.DataFrame([])
 
         portfolio_df = pd.DataFrame(portfolio)
 
@@ -289,4 +340,17 @@ class BacktestService:
 
     def get_backtest_log(self: Self) -> pd.DataFrame:
         """Return the transaction log."""
-        return self.backtest_df
+        return self.transaction_log.to_frame()
+
+    def get_equity_curve(self: Self) -> pd.DataFrame:
+        """Return daily mark-to-market equity curve of the backtest."""
+        if self.price_matrix is None:
+            msg = "Backtest must be run before getting its equity curve."
+            raise ValueError(msg)
+        return build_equity_curve(
+            self.get_backtest_log(), self.price_matrix, self.initial_cash
+        )
+
+    def get_metrics(self: Self) -> pd.DataFrame:
+        """Return performance metrics (CAGR, Sharpe, drawdown etc.) as one-row frame."""
+        return pd.DataFrame([calculate_metrics(self.get_equity_curve())])
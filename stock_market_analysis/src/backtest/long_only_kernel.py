@@ -0,0 +1,107 @@
+"""Vectorized long-only backtest kernel of single assets (or panels of them)."""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _forward_fill_nonzero(signals: np.ndarray) -> np.ndarray:
+    """Replace zeros of every row by the previous nonzero value (or keep 0)."""
+    n_dates = signals.shape[1]
+    last_signal_idx = np.where(signals != 0, np.arange(n_dates), 0)
+    np.maximum.accumulate(last_signal_idx, axis=1, out=last_signal_idx)
+    return np.take_along_axis(signals, last_signal_idx, axis=1)
+
+
+def _ordered_events(events: np.ndarray, trade_ordinal: np.ndarray) -> np.ndarray:
+    """Return assets x trades matrix of date indexes of events (-1 where missing)."""
+    n_trades = int(trade_ordinal.max(initial=0))
+    event_idx = np.full((events.shape[0], n_trades), -1, dtype=np.int64)
+    assets, dates = np.nonzero(events)
+    event_idx[assets, trade_ordinal[assets, dates] - 1] = dates
+    return event_idx
+
+
+def long_only_backtest(
+    prices: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    initial_cash: float,
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Backtest all-in long-only trading of every asset independently.
+
+    An asset is bought (whole shares for all available cash) on its first entry
+    signal when not in position and sold on the first following exit signal.
+    Repeated signals are ignored and exit wins when both signals are set.
+
+    Position state is derived for all assets at once by forward filling signals,
+    only compounding of cash is computed in a loop over trade ordinal (1st, 2nd...
+    trade of all assets at once).
+
+    Args:
+    ----
+        prices (np.ndarray): assets x dates (or dates only) prices, NaN = no price
+        entries (np.ndarray): Boolean entry signals aligned with prices
+        exits (np.ndarray): Boolean exit signals aligned with prices
+        initial_cash (float): Cash available to every asset
+
+    Returns:
+    -------
+        Tuple[pd.DataFrame, np.ndarray]: trades ('asset', 'entry_idx', 'exit_idx'
+        (-1 when still open), 'shares', 'entry_price', 'exit_price') and final
+        equity of every asset (open positions valued by the last price)
+    """
+    prices = np.atleast_2d(np.asarray(prices, dtype=float))
+    has_price = np.isfinite(prices)
+    signals = np.where(
+        np.atleast_2d(exits) & has_price,
+        -1,
+        np.where(np.atleast_2d(entries) & has_price, 1, 0),
+    )
+
+    in_position = _forward_fill_nonzero(signals) == 1
+    was_in_position = np.zeros_like(in_position)
+    was_in_position[:, 1:] = in_position[:, :-1]
+    entry_events = in_position & ~was_in_position
+    exit_events = ~in_position & was_in_position
+
+    trade_ordinal = np.cumsum(entry_events, axis=1)
+    entry_idx = _ordered_events(entry_events, trade_ordinal)
+    exit_idx = _ordered_events(exit_events, trade_ordinal)[:, : entry_idx.shape[1]]
+
+    assets = np.arange(prices.shape[0])[:, None]
+    entry_price = np.where(entry_idx >= 0, prices[assets, entry_idx], np.nan)
+    exit_price = np.where(exit_idx >= 0, prices[assets, exit_idx], np.nan)
+
+    cash = np.full(prices.shape[0], float(initial_cash))
+    shares = np.zeros(entry_idx.shape, dtype=np.int64)
+    for trade in range(entry_idx.shape[1]):
+        is_entered = entry_idx[:, trade] >= 0
+        with np.errstate(invalid="ignore"):
+            shares[:, trade] = np.where(
+                is_entered & (cash > 0),
+                np.floor(cash / np.where(is_entered, entry_price[:, trade], 1)),
+                0,
+            )
+        cash -= shares[:, trade] * np.nan_to_num(entry_price[:, trade])
+        cash += shares[:, trade] * np.nan_to_num(exit_price[:, trade])
+
+    last_price = pd.DataFrame(prices.T).ffill().iloc[-1].to_numpy()
+    is_open = (entry_idx >= 0) & (exit_idx < 0)
+    final_equity = cash + np.nansum(
+        np.where(is_open, shares * last_price[:, None], 0), axis=1
+    )
+
+    trade_assets, trades = np.nonzero(entry_idx >= 0)
+    trades_df = pd.DataFrame(
+        {
+            "asset": trade_assets,
+            "entry_idx": entry_idx[trade_assets, trades],
+            "exit_idx": exit_idx[trade_assets, trades],
+            "shares": shares[trade_assets, trades],
+            "entry_price": entry_price[trade_assets, trades],
+            "exit_price": exit_price[trade_assets, trades],
+        }
+    )
+    return trades_df, final_equity
@@ -0,0 +1,111 @@
+"""Mark-to-market equity curve and performance metrics of backtests."""
+
+import numpy as np
+import pandas as pd
+
+
+TRADING_DAYS_PER_YEAR = 252
+DAYS_PER_YEAR = 365.25
+
+
+def build_equity_curve(
+    transactions_df: pd.DataFrame, price_matrix: pd.DataFrame, initial_cash: float
+) -> pd.DataFrame:
+    """Build daily mark-to-market equity curve from transactions and price matrix.
+
+    Positions (shares held per date and ticker) and cash are cumulative sums of
+    transactions, holdings are valued by the last known 'Close' price (in pence).
+    Only dates with at least one available price (trading days) are returned.
+
+    Args:
+    ----
+        transactions_df (pd.DataFrame): Backtest transaction log
+        price_matrix (pd.DataFrame): dates x tickers 'Close' prices
+        initial_cash (float): Cash available at the start of the backtest
+
+    Returns:
+    -------
+        pd.DataFrame: 'cash', 'holdings_value', 'equity', 'traded_value' per date
+    """
+    n_dates, n_tickers = price_matrix.shape
+    date_idx = price_matrix.index.get_indexer(transactions_df["date"])
+    ticker_idx = price_matrix.columns.get_indexer(transactions_df["ticker"])
+    is_buy = (transactions_df["transaction"] == "buy").to_numpy()
+    signed_shares = np.where(
+        is_buy, 1, -1
+    ) * transactions_df["hold_shares_number"].to_numpy(dtype=np.int64)
+    amounts = transactions_df["transaction_amount"].to_numpy(dtype=float)
+
+    shares_delta = np.zeros((n_dates, n_tickers), dtype=np.int64)
+    np.add.at(shares_delta, (date_idx, ticker_idx), signed_shares)
+    positions = np.cumsum(shares_delta, axis=0)
+
+    cash = initial_cash + np.cumsum(
+        np.bincount(date_idx, weights=amounts, minlength=n_dates)
+    )
+    traded_value = np.bincount(date_idx, weights=np.abs(amounts), minlength=n_dates)
+
+    prices = price_matrix.ffill().to_numpy(dtype=float) / 100
+    holdings_value = np.nansum(positions * np.nan_to_num(prices), axis=1)
+
+    equity_curve = pd.DataFrame(
+        {
+            "cash": cash,
+            "holdings_value": holdings_value,
+            "equity": cash + holdings_value,
+            "traded_value": traded_value,
+        },
+        index=price_matrix.index,
+    )
+    is_trading_day = price_matrix.notna().any(axis=1).to_numpy()
+    return equity_curve[is_trading_day]
+
+
+def calculate_metrics(
+    equity_curve: pd.DataFrame, risk_free_rate: float = 0.0
+) -> dict[str, float]:
+    """Calculate performance metrics of the equity curve.
+
+    Args:
+    ----
+        equity_curve (pd.DataFrame): Result of build_equity_curve()
+        risk_free_rate (float): Annual risk free rate used by Sharpe and Sortino ratios
+
+    Returns:
+    -------
+        dict: CAGR, volatility, Sharpe, Sortino, max drawdown (and its duration
+        in days), annual turnover and average exposure
+    """
+    equity = equity_curve["equity"].to_numpy(dtype=float)
+    dates = equity_curve.index
+    if len(equity) < 2:  # noqa: PLR2004
+        return {}
+
+    years = max((dates[-1] - dates[0]).days / DAYS_PER_YEAR, 1 / DAYS_PER_YEAR)
+    returns = np.diff(equity) / equity[:-1]
+    excess_returns = returns - risk_free_rate / TRADING_DAYS_PER_YEAR
+    annualization = np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    volatility = returns.std(ddof=1) * annualization
+    downside_deviation = np.sqrt(np.mean(np.minimum(excess_returns, 0) ** 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = excess_returns.mean() / returns.std(ddof=1) * annualization
+        sortino = excess_returns.mean() / downside_deviation * annualization
+
+    running_max = np.maximum.accumulate(equity)
+    drawdown = equity / running_max - 1
+    positions = np.arange(len(equity))
+    last_peak = np.maximum.accumulate(np.where(equity >= running_max, positions, 0))
+    drawdown_days = (dates - dates[last_peak]).days
+
+    return {
+        "total_return": equity[-1] / equity[0] - 1,
+        "cagr": (equity[-1] / equity[0]) ** (1 / years) - 1,
+        "volatility": volatility,
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "max_drawdown": drawdown.min(),
+        "max_drawdown_duration_days": int(drawdown_days.max()),
+        "turnover": equity_curve["traded_value"].sum() / equity.mean() / years,
+        "exposure": np.mean(equity_curve["holdings_value"].to_numpy() / equity),
+    }
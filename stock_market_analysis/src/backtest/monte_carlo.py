@@ -0,0 +1,227 @@
+"""Monte Carlo and bootstrap robustness analysis of backtest results.
+
+Every simulation mode produces a (n_simulations x n_steps) matrix of equity paths,
+so thousands of simulations are computed by a few NumPy operations.
+"""
+
+from typing import Optional, Sequence, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+
+
+Self = TypeVar("Self", bound="MonteCarloService")
+
+MONTE_CARLO_MODES = ("trades", "bootstrap", "perturb")
+
+
+def resample_trades(
+    trade_pnl: np.ndarray,
+    initial_cash: float,
+    n_simulations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return equity paths of trade P&L sequences resampled with replacement."""
+    if not len(trade_pnl):
+        return np.full((n_simulations, 1), float(initial_cash))
+    sampled_pnl = rng.choice(trade_pnl, size=(n_simulations, len(trade_pnl)))
+    return _equity_paths(sampled_pnl, initial_cash)
+
+
+def block_bootstrap_returns(
+    daily_returns: np.ndarray,
+    initial_cash: float,
+    n_simulations: int,
+    block_size: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return equity paths built of randomly drawn blocks of consecutive daily returns.
+
+    Blocks (instead of single days) keep short-term autocorrelation of returns.
+    """
+    n_days = len(daily_returns)
+    if not n_days:
+        return np.full((n_simulations, 1), float(initial_cash))
+    block_size = min(block_size, n_days)
+    n_blocks = -(-n_days // block_size)  # ceil
+
+    block_starts = rng.integers(0, n_days - block_size + 1, (n_simulations, n_blocks))
+    day_idx = (block_starts[:, :, None] + np.arange(block_size)).reshape(
+        n_simulations, -1
+    )[:, :n_days]
+    growth = np.cumprod(1 + daily_returns[day_idx], axis=1)
+    return initial_cash * np.hstack([np.ones((n_simulations, 1)), growth])
+
+
+def perturb_entries(  # noqa: PLR0913
+    trades_df: pd.DataFrame,
+    prices: np.ndarray,
+    initial_cash: float,
+    transaction_fee: float,
+    n_simulations: int,
+    max_entry_shift: int,
+    max_slippage: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Return equity paths of trades with randomly shifted entry dates and slippage.
+
+    Entry of every trade is moved by up to max_entry_shift trading days (but not
+    after its exit), both entry and exit prices are worsened by a random slippage
+    of up to max_slippage (ex. 0.005 = 0.5%). Shares of the trades are unchanged.
+
+    Args:
+    ----
+        trades_df (pd.DataFrame): Result of get_trades()
+        prices (np.ndarray): dates x tickers forward-filled prices (in pounds)
+        initial_cash (float): Cash available at the start of the backtest
+        transaction_fee (float): Fee paid per buy and per sell
+        n_simulations (int): Number of simulated equity paths
+        max_entry_shift (int): Maximum shift of entry date in trading days
+        max_slippage (float): Maximum relative slippage of entry / exit price
+        rng (np.random.Generator): Random numbers generator
+
+    Returns:
+    -------
+        np.ndarray: n_simulations x (n_trades + 1) equity paths
+    """
+    n_trades = len(trades_df)
+    if not n_trades:
+        return np.full((n_simulations, 1), float(initial_cash))
+    ticker_idx = trades_df["ticker_idx"].to_numpy()
+    exit_idx = trades_df["exit_date_idx"].to_numpy()
+    shares = trades_df["shares"].to_numpy(dtype=float)
+    is_closed = ~trades_df["is_open"].to_numpy(dtype=bool)
+
+    shifts = rng.integers(-max_entry_shift, max_entry_shift + 1, (n_simulations, n_trades))
+    entry_idx = np.clip(trades_df["entry_date_idx"].to_numpy() + shifts, 0, exit_idx)
+    entry_price = prices[entry_idx, ticker_idx] * (
+        1 + rng.uniform(0, max_slippage, (n_simulations, n_trades))
+    )
+    # open positions are valued by the last price, so they don't pay exit slippage
+    exit_price = prices[exit_idx, ticker_idx] * (
+        1 - rng.uniform(0, max_slippage, (n_simulations, n_trades)) * is_closed
+    )
+    pnl = shares * (exit_price - entry_price) - transaction_fee * (1 + is_closed)
+    return _equity_paths(pnl, initial_cash)
+
+
+def _equity_paths(pnl: np.ndarray, initial_cash: float) -> np.ndarray:
+    """Return equity paths (starting with initial_cash) of P&L sequences."""
+    n_simulations = pnl.shape[0]
+    return initial_cash + np.hstack(
+        [np.zeros((n_simulations, 1)), np.cumsum(pnl, axis=1)]
+    )
+
+
+def summarize_paths(
+    paths: np.ndarray, percentiles: Sequence[float] = (5, 25, 50, 75, 95)
+) -> pd.DataFrame:
+    """Return percentiles of total return and max drawdown of simulated equity paths."""
+    total_return = paths[:, -1] / paths[:, 0] - 1
+    max_drawdown = (paths / np.maximum.accumulate(paths, axis=1) - 1).min(axis=1)
+    return pd.DataFrame(
+        {
+            "total_return": np.percentile(total_return, percentiles),
+            "max_drawdown": np.percentile(max_drawdown, percentiles),
+        },
+        index=pd.Index([f"p{p:g}" for p in percentiles], name="percentile"),
+    )
+
+
+class MonteCarloService:
+    """Performs Monte Carlo robustness analysis of a finished array backtest."""
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        backtest_service: ArrayBacktestService,
+        n_simulations: int = 1000,
+        block_size: int = 20,
+        max_entry_shift: int = 2,
+        max_slippage: float = 0.005,
+        seed: Optional[int] = None,
+    ) -> None:
+        """Config of MonteCarloService."""
+        price_matrix = backtest_service.price_matrix
+        if not hasattr(backtest_service, "positions") or price_matrix is None:
+            msg = "ArrayBacktestService must be run before Monte Carlo analysis."
+            raise ValueError(msg)
+        self.backtest_service = backtest_service
+        self.n_simulations = n_simulations
+        self.block_size = block_size
+        self.max_entry_shift = max_entry_shift
+        self.max_slippage = max_slippage
+        self.rng = np.random.default_rng(seed)
+        # forward-filled prices in pounds, used to value trades at any date
+        self.prices = price_matrix.ffill().bfill().to_numpy(dtype=float) / 100
+
+    def get_trades(self: Self) -> pd.DataFrame:
+        """Return round-trip trades of the backtest ordered by their exit.
+
+        Positions still open are closed (without a fee) by the last price.
+        """
+        positions = self.backtest_service.positions
+        last_date_idx = len(self.prices) - 1
+        is_open = positions["is_open"].to_numpy()
+        exit_idx = np.where(is_open, last_date_idx, positions["sell_date_idx"])
+        exit_price = np.where(
+            is_open,
+            self.prices[last_date_idx, positions["ticker_idx"]],
+            positions["sell_price"],
+        )
+        fee = np.where(is_open, 0, self.backtest_service.transaction_fee)
+        trades_df = pd.DataFrame(
+            {
+                "ticker_idx": positions["ticker_idx"],
+                "shares": positions["shares"],
+                "entry_date_idx": positions["buy_date_idx"],
+                "exit_date_idx": exit_idx,
+                "is_open": is_open,
+                "pnl": positions["shares"] * exit_price
+                - fee
+                - positions["total_investment"],
+            }
+        )
+        return trades_df.sort_values("exit_date_idx", kind="stable").reset_index(
+            drop=True
+        )
+
+    def simulate(self: Self, mode: str) -> np.ndarray:
+        """Return n_simulations x n_steps equity paths simulated by selected mode."""
+        initial_cash = self.backtest_service.initial_cash
+        if mode == "trades":
+            return resample_trades(
+                self.get_trades()["pnl"].to_numpy(),
+                initial_cash,
+                self.n_simulations,
+                self.rng,
+            )
+        if mode == "bootstrap":
+            equity = self.backtest_service.get_equity_curve()["equity"].to_numpy()
+            return block_bootstrap_returns(
+                np.diff(equity) / equity[:-1],
+                initial_cash,
+                self.n_simulations,
+                self.block_size,
+                self.rng,
+            )
+        if mode == "perturb":
+            return perturb_entries(
+                self.get_trades(),
+                self.prices,
+                initial_cash,
+                self.backtest_service.transaction_fee,
+                self.n_simulations,
+                self.max_entry_shift,
+                self.max_slippage,
+                self.rng,
+            )
+        msg = f"Unsupported Monte Carlo mode: {mode}. Use one of {MONTE_CARLO_MODES}"
+        raise ValueError(msg)
+
+    def get_summary(self: Self, mode: str) -> pd.DataFrame:
+        """Return return and drawdown percentiles of simulations of selected mode."""
+        return summarize_paths(self.simulate(mode))
@@ -0,0 +1,32 @@
+"""Aligned price matrix of many tickers used by backtests."""
+
+from typing import Iterable
+
+import pandas as pd
+
+from stock_market_analysis.src.data_providers.yahoo_data import yf_download
+
+
+def load_close_matrix(tickers: Iterable[str], period: str) -> pd.DataFrame:
+    """Return dates x tickers DataFrame of 'Close' prices aligned on union of dates.
+
+    Every ticker is read (from cache or Yahoo Finance) exactly once; tickers without
+    data have all-NaN columns.
+    """
+    tickers = list(tickers)
+    closes = {}
+    for ticker in tickers:
+        data_df = yf_download(ticker, period)
+        if not data_df.empty:
+            closes[ticker] = data_df["Close"]
+
+    close_matrix = pd.DataFrame(closes, columns=tickers, dtype=float)
+    close_matrix.index.name = "Date"
+    return close_matrix.sort_index()
+
+
+def get_recent_prices(close_matrix: pd.DataFrame) -> pd.Series:
+    """Return the most recent non-NaN price of every ticker (column) of close_matrix."""
+    if close_matrix.empty:
+        return pd.Series(float("nan"), index=close_matrix.columns)
+    return close_matrix.ffill().iloc[-1]
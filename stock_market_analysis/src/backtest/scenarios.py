@@ -0,0 +1,169 @@
+"""Batch of backtest scenarios run in parallel over signals kept in shared memory."""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from joblib import delayed
+
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+from stock_market_analysis.src.backtest.backtest_entities import BacktestScenario
+from stock_market_analysis.src.backtest.metrics import calculate_metrics
+from stock_market_analysis.src.executor.config import get_executor_config
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.utils.shared_memory import (
+    ArraySpec,
+    attach_arrays,
+    release_blocks,
+    share_arrays,
+)
+
+
+def _simulate_scenario(
+    scenario: BacktestScenario,
+    arrays: dict[str, np.ndarray],
+    tickers: List[str],
+    stock_indexes: List[str],
+    period: str,
+) -> dict:
+    """Run a single scenario over (shared) arrays and return its summary."""
+    dates = pd.DatetimeIndex(arrays["dates"])
+    row_date_idx = arrays["row_date_idx"]
+    start_idx = 0
+    rows: slice | np.ndarray = slice(None)
+    if scenario.start_date:
+        start_idx = int(dates.searchsorted(pd.Timestamp(scenario.start_date)))
+        rows = row_date_idx >= start_idx
+
+    backtest_service = ArrayBacktestService(
+        pd.DataFrame(),
+        scenario.backtest_amounts,
+        scenario.max_stock_amount,
+        scenario.min_stock_amount,
+        period,
+        transaction_fee=scenario.transaction_fee,
+        stop_loss_ratio=scenario.stop_loss_ratio,
+    )
+    backtest_service.run_prepared(
+        pd.DataFrame(
+            arrays["close_matrix"][start_idx:],
+            index=dates[start_idx:],
+            columns=pd.Index(tickers),
+            copy=False,
+        ),
+        {
+            "row_date_idx": row_date_idx[rows] - start_idx,
+            "row_ticker_idx": arrays["row_ticker_idx"][rows],
+            "row_advice": arrays["row_advice"][rows],
+            "row_close": arrays["row_close"][rows],
+            "row_stock_index": np.asarray(stock_indexes, dtype=object)[
+                arrays["row_stock_index_code"][rows]
+            ],
+        },
+    )
+
+    equity_curve = backtest_service.get_equity_curve()
+    return {
+        "scenario": scenario.name,
+        "backtest_amounts": ",".join(str(a) for a in scenario.backtest_amounts),
+        "max_stock_amount": scenario.max_stock_amount,
+        "min_stock_amount": scenario.min_stock_amount,
+        "transaction_fee": backtest_service.transaction_fee,
+        "stop_loss_ratio": backtest_service.stop_loss_ratio,
+        "start_date": scenario.start_date,
+        "initial_cash": backtest_service.initial_cash,
+        "final_equity": (
+            equity_curve["equity"].iloc[-1]
+            if not equity_curve.empty
+            else backtest_service.initial_cash
+        ),
+        "transactions": len(backtest_service.transaction_log),
+        **calculate_metrics(equity_curve),
+    }
+
+
+def _run_shared_scenario(
+    scenario: BacktestScenario,
+    specs: dict[str, ArraySpec],
+    tickers: List[str],
+    stock_indexes: List[str],
+    period: str,
+) -> dict:
+    """Attach to shared arrays, run the scenario and detach."""
+    blocks, arrays = attach_arrays(specs)
+    try:
+        return _simulate_scenario(scenario, arrays, tickers, stock_indexes, period)
+    finally:
+        del arrays
+        release_blocks(blocks)
+
+
+def run_scenarios(
+    df: pd.DataFrame,
+    scenarios: List[BacktestScenario],
+    period: str,
+    price_matrix: Optional[pd.DataFrame] = None,
+    n_jobs: Optional[int] = None,
+) -> pd.DataFrame:
+    """Backtest signals of df with every scenario and return comparison table.
+
+    Signals and the price matrix are converted into arrays and put into shared
+    memory only once, workers attach to them instead of receiving pickled copies.
+
+    Args:
+    ----
+        df (pd.DataFrame): Signals (with 'Date', 'Ticker', 'Stock_Index', 'Close' and
+            'main_advice' columns) of all backtested tickers
+        scenarios (List[BacktestScenario]): Backtest configurations to compare
+        period (str): Backtested period ex. '1y'
+        price_matrix (pd.DataFrame): Optional preloaded dates x tickers 'Close' prices
+        n_jobs (int): Number of parallel processes (active ExecutorConfig's workers
+            by default)
+
+    Returns:
+    -------
+        pd.DataFrame: Scenario config, final equity, number of transactions and
+        performance metrics per scenario
+    """
+    # arrays are prepared exactly as for a single backtest run
+    preparing_service = ArrayBacktestService(
+        df, [], 0, 0, period, price_matrix=price_matrix
+    )
+    preparing_service.prepare_arrays()
+    stock_index_codes, stock_indexes = pd.factorize(
+        preparing_service.row_stock_index, use_na_sentinel=False
+    )
+
+    blocks, specs = share_arrays(
+        {
+            "dates": preparing_service.dates.to_numpy(dtype="datetime64[ns]"),
+            "close_matrix": preparing_service.close_matrix,
+            "row_date_idx": preparing_service.row_date_idx,
+            "row_ticker_idx": preparing_service.row_ticker_idx,
+            "row_advice": preparing_service.row_advice,
+            "row_close": preparing_service.row_close,
+            "row_stock_index_code": stock_index_codes,
+        }
+    )
+    logger.info(
+        "Running %d backtest scenarios over %d signal rows",
+        len(scenarios),
+        len(preparing_service.row_date_idx),
+    )
+    try:
+        results = get_executor_config().get_parallel(n_jobs)(
+            delayed(_run_shared_scenario)(
+                scenario,
+                specs,
+                preparing_service.tickers.tolist(),
+                list(stock_indexes),
+                period,
+            )
+            for scenario in scenarios
+        )
+    finally:
+        release_blocks(blocks, unlink=True)
+
+    return pd.DataFrame(results)
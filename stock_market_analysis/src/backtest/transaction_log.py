@@ -0,0 +1,119 @@
+"""Columnar append buffer of backtest transactions."""
+
+from pathlib import Path
+from typing import Any, Optional, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.backtest.backtest_entities import TransactionLog
+from stock_market_analysis.src.logger import logger
+
+
+Self = TypeVar("Self", bound="TransactionLogBuffer")
+
+FIELD_DTYPES = {
+    pd.Timestamp: np.dtype("datetime64[ns]"),
+    str: np.dtype(object),
+    float: np.dtype(np.float64),
+    int: np.dtype(np.int64),
+}
+
+
+class TransactionLogBuffer:
+    """Stores transactions in growable NumPy arrays (one per TransactionLog field).
+
+    Appending is amortized O(1) and the DataFrame is built only in to_frame().
+    When log_file is set, full chunks of chunk_size rows are streamed to the CSV
+    file, so memory used by very long backtests stays bounded.
+    """
+
+    def __init__(
+        self: Self,
+        log_file: Optional[str] = None,
+        chunk_size: int = 100_000,
+        initial_capacity: int = 1024,
+        streamed_rows: int = 0,
+    ) -> None:
+        """Config of TransactionLogBuffer.
+
+        streamed_rows is the number of rows already stored in log_file by a previous
+        (resumed) backtest run, otherwise existing log_file is removed.
+        """
+        self.columns = list(TransactionLog.model_fields)
+        self.dtypes: dict[str, np.dtype] = {
+            name: FIELD_DTYPES[field.annotation]
+            for name, field in TransactionLog.model_fields.items()
+        }
+        self.log_file = Path(log_file) if log_file else None
+        self.chunk_size = chunk_size
+        self.size = 0
+        self.streamed_rows = streamed_rows if self.log_file else 0
+        self._arrays = self._allocate(initial_capacity)
+
+        if self.log_file and self.log_file.exists() and not self.streamed_rows:
+            self.log_file.unlink()
+
+    def _allocate(self: Self, capacity: int) -> dict[str, np.ndarray]:
+        return {
+            name: np.empty(capacity, dtype=dtype) for name, dtype in self.dtypes.items()
+        }
+
+    def _grow(self: Self) -> None:
+        """Double capacity of all columns."""
+        arrays = self._allocate(2 * len(self._arrays[self.columns[0]]))
+        for name, array in self._arrays.items():
+            arrays[name][: self.size] = array[: self.size]
+        self._arrays = arrays
+
+    def append(self: Self, **fields: Any) -> None:  # noqa: ANN401
+        """Append a single transaction (all TransactionLog fields are required)."""
+        if self.size == len(self._arrays[self.columns[0]]):
+            self._grow()
+        for name in self.columns:
+            self._arrays[name][self.size] = fields[name]
+        self.size += 1
+
+        if self.log_file and self.size >= self.chunk_size:
+            self.flush()
+
+    def extend(self: Self, log_df: pd.DataFrame) -> None:
+        """Append all transactions of log_df (ex. restored log of a previous run)."""
+        while self.size + len(log_df) > len(self._arrays[self.columns[0]]):
+            self._grow()
+        for name in self.columns:
+            self._arrays[name][self.size : self.size + len(log_df)] = log_df[name]
+        self.size += len(log_df)
+
+        if self.log_file and self.size >= self.chunk_size:
+            self.flush()
+
+    def _buffered_frame(self: Self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {name: self._arrays[name][: self.size].copy() for name in self.columns}
+        )
+
+    def flush(self: Self) -> None:
+        """Write buffered rows to log_file and clear the buffer."""
+        if not self.log_file or not self.size:
+            return
+        logger.debug("Streaming %d transactions to %s", self.size, self.log_file)
+        self._buffered_frame().to_csv(
+            self.log_file, mode="a", header=not self.streamed_rows, index=False
+        )
+        self.streamed_rows += self.size
+        self.size = 0
+
+    def __len__(self: Self) -> int:
+        """Return number of all logged transactions."""
+        return self.streamed_rows + self.size
+
+    def to_frame(self: Self) -> pd.DataFrame:
+        """Materialize all logged transactions as DataFrame."""
+        if not self.log_file:
+            return self._buffered_frame()
+
+        self.flush()
+        if not self.streamed_rows:
+            return pd.DataFrame(columns=self.columns)
+        return pd.read_csv(self.log_file, parse_dates=["date"])
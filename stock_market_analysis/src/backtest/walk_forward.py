@@ -0,0 +1,261 @@
+"""Walk-forward optimization of strategy parameters with out-of-sample evaluation."""
+
+import itertools
+from typing import TYPE_CHECKING, List, Optional, TypeVar
+
+import pandas as pd
+from joblib import Parallel, delayed
+
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+from stock_market_analysis.src.backtest.backtest_entities import WalkForwardWindow
+from stock_market_analysis.src.backtest.price_matrix import load_close_matrix
+from stock_market_analysis.src.executor.config import get_executor_config
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.utils.utils import get_date_range
+
+
+if TYPE_CHECKING:
+    from stock_market_analysis.src.services.base_service import BaseAnalysisService
+    from stock_market_analysis.src.strategies.base import BaseStrategy
+
+Self = TypeVar("Self", bound="WalkForwardService")
+
+
+def split_walk_forward_windows(
+    period: str, in_sample_days: int, out_of_sample_days: int
+) -> List[WalkForwardWindow]:
+    """Split period into rolling in-sample windows each followed by out-of-sample one.
+
+    Every next window is moved forward by `out_of_sample_days`, so out-of-sample
+    windows don't overlap and together cover the period after first in-sample window.
+    """
+    start_date, end_date = (pd.Timestamp(d) for d in get_date_range(period))
+    in_sample = pd.Timedelta(days=in_sample_days)
+    out_of_sample = pd.Timedelta(days=out_of_sample_days)
+    one_day = pd.Timedelta(days=1)
+
+    windows = []
+    in_sample_start = start_date
+    while in_sample_start + in_sample <= end_date:
+        out_of_sample_start = in_sample_start + in_sample
+        windows.append(
+            WalkForwardWindow(
+                in_sample_start=in_sample_start,
+                in_sample_end=out_of_sample_start - one_day,
+                out_of_sample_start=out_of_sample_start,
+                out_of_sample_end=min(
+                    out_of_sample_start + out_of_sample - one_day, end_date
+                ),
+            )
+        )
+        in_sample_start += out_of_sample
+
+    return windows
+
+
+def expand_param_grid(param_grid: dict[str, list]) -> list[dict]:
+    """Return all combinations of params ex. {'A.x': [1, 2]} => [{'A.x': 1}, {'A.x': 2}]."""
+    if not param_grid:
+        return [{}]
+    keys = list(param_grid.keys())
+    return [
+        dict(zip(keys, values, strict=True))
+        for values in itertools.product(*param_grid.values())
+    ]
+
+
+def build_strategies(strategies: list, params: dict) -> list:
+    """Create copies of strategies with kwargs overwritten by 'StrategyClass.kwarg' params."""
+    overrides: dict[str, dict] = {}
+    for key, value in params.items():
+        cls_name, _, kwarg = key.partition(".")
+        overrides.setdefault(cls_name, {})[kwarg] = value
+
+    unknown = set(overrides) - {strategy.__class__.__name__ for strategy in strategies}
+    if unknown:
+        msg = f"Params refer to strategies not used by service: {', '.join(unknown)}"
+        raise ValueError(msg)
+
+    return [
+        strategy.__class__(
+            **{**strategy.kwargs, **overrides.get(strategy.__class__.__name__, {})}
+        )
+        for strategy in strategies
+    ]
+
+
+def _apply_param_combinations(
+    service_obj: "BaseAnalysisService",
+    ticker: str,
+    period: str,
+    strategies_per_combination: list[list["BaseStrategy"]],
+) -> list[pd.DataFrame]:
+    """Compute indicators of a ticker once and apply every combination of strategies."""
+    indicators_df = service_obj.compute_indicators(ticker, period)
+    if indicators_df.empty:
+        return [indicators_df for _ in strategies_per_combination]
+
+    return [
+        service_obj.apply_strategies(indicators_df.copy(), strategies)
+        for strategies in strategies_per_combination
+    ]
+
+
+class WalkForwardService:
+    """Performs walk-forward optimization of strategy params of selected service."""
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        service_obj: "BaseAnalysisService",
+        tickers_df: pd.DataFrame,
+        param_grid: dict[str, list],
+        backtest_amounts: List[int],
+        max_stock_amount: float,
+        min_stock_amount: float,
+        period: str,
+        in_sample_days: int,
+        out_of_sample_days: int,
+        n_jobs: Optional[int] = None,
+    ) -> None:
+        """Config of WalkForwardService (n_jobs = active ExecutorConfig's workers by default)."""
+        self.service_obj = service_obj
+        self.tickers_df = tickers_df
+        self.param_combinations = expand_param_grid(param_grid)
+        self.backtest_amounts = backtest_amounts
+        self.max_stock_amount = max_stock_amount
+        self.min_stock_amount = min_stock_amount
+        self.period = period
+        self.windows = split_walk_forward_windows(
+            period, in_sample_days, out_of_sample_days
+        )
+        self.n_jobs = n_jobs
+        self.results_df = pd.DataFrame()
+
+        if not self.windows:
+            msg = f"Period '{period}' is too short for {in_sample_days} in-sample days."
+            raise ValueError(msg)
+
+    def _build_signals(self: Self, parallel: Parallel) -> list[pd.DataFrame]:
+        """Return post-run signals (with 'main_advice') of all tickers per param combination.
+
+        Indicators are computed only once per ticker over the full period and
+        shared by all param combinations.
+        """
+        strategies_per_combination = [
+            build_strategies(self.service_obj.pre_run_strategies, params)
+            for params in self.param_combinations
+        ]
+        results = parallel(
+            delayed(_apply_param_combinations)(
+                self.service_obj, ticker, self.period, strategies_per_combination
+            )
+            for ticker in self.tickers_df["Ticker"].tolist()
+        )
+
+        signals = []
+        for combination_idx in range(len(self.param_combinations)):
+            combination_df = pd.concat(
+                [result[combination_idx] for result in results]
+            )
+            combination_df = (
+                combination_df.reset_index()
+                .merge(
+                    self.tickers_df[["Ticker", "Stock_Index"]],
+                    on="Ticker",
+                    how="left",
+                )
+                .set_index("Date")
+            )
+            combination_df = self.service_obj.post_run_analysis(combination_df)
+            signals.append(combination_df.reset_index())
+
+        return signals
+
+    def _backtest_yield_percent(
+        self: Self,
+        data_df: pd.DataFrame,
+        price_matrix: pd.DataFrame,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+    ) -> float:
+        """Backtest signals between start and end and return total yield in percents.
+
+        The yield is taken from the final equity of the mark-to-market equity curve,
+        so positions still open at the end are valued by their last 'Close' price.
+        """
+        window_df = data_df[(data_df["Date"] >= start) & (data_df["Date"] <= end)]
+        backtest_service = ArrayBacktestService(
+            window_df.copy(),
+            self.backtest_amounts,
+            self.max_stock_amount,
+            self.min_stock_amount,
+            f"{start:%Y-%m-%d}:{end:%Y-%m-%d}",
+            price_matrix=price_matrix,
+        )
+        backtest_service.run()
+        equity_curve = backtest_service.get_equity_curve()
+        if equity_curve.empty:
+            return 0.0
+        initial_cash = backtest_service.initial_cash
+        return (equity_curve["equity"].iloc[-1] - initial_cash) / initial_cash * 100
+
+    def _run_window(
+        self: Self,
+        window: WalkForwardWindow,
+        signals: list[pd.DataFrame],
+        price_matrix: pd.DataFrame,
+    ) -> dict:
+        """Select best params on in-sample window and evaluate them on out-of-sample one."""
+        in_sample_yields = [
+            self._backtest_yield_percent(
+                signals_df, price_matrix, window.in_sample_start, window.in_sample_end
+            )
+            for signals_df in signals
+        ]
+        best_idx = max(range(len(signals)), key=lambda idx: in_sample_yields[idx])
+        out_of_sample_yield = self._backtest_yield_percent(
+            signals[best_idx],
+            price_matrix,
+            window.out_of_sample_start,
+            window.out_of_sample_end,
+        )
+        return {
+            **window.dict(),
+            "best_params": self.param_combinations[best_idx],
+            "in_sample_yield_percent": in_sample_yields[best_idx],
+            "out_of_sample_yield_percent": out_of_sample_yield,
+        }
+
+    def run(self: Self) -> None:
+        """Run walk-forward optimization where windows are processed in parallel."""
+        logger.info(
+            "Walk-forward: %d windows, %d param combinations",
+            len(self.windows),
+            len(self.param_combinations),
+        )
+        # both stages share the same pool of workers
+        with get_executor_config().get_parallel(self.n_jobs) as parallel:
+            signals = self._build_signals(parallel)
+            price_matrix = load_close_matrix(self.tickers_df["Ticker"], self.period)
+
+            results = parallel(
+                delayed(self._run_window)(
+                    window,
+                    [
+                        signals_df[
+                            (signals_df["Date"] >= window.in_sample_start)
+                            & (signals_df["Date"] <= window.out_of_sample_end)
+                        ]
+                        for signals_df in signals
+                    ],
+                    price_matrix.loc[window.in_sample_start : window.out_of_sample_end],
+                )
+                for window in self.windows
+            )
+        self.results_df = pd.DataFrame(results)
+
+    def get_results(self: Self) -> pd.DataFrame:
+        """Return per-window results of walk-forward optimization."""
+        return self.results_df
@@ -3,6 +3,8 @@ from typing import TypeVar
 
 import pandas as pd
 
+from stock_market_analysis.src.utils.utils import get_period_of_last_bars
+
 
 Self = TypeVar("Self", bound="BaseDataProvider")
 
@@ -13,3 +15,7 @@ class BaseDataProvider(ABC):
     @abstractmethod
     def get_data(self: Self, ticker: str, period: str) -> pd.DataFrame:
         """Return dataframe containing data from implemented provider."""
+
+    def get_latest_data(self: Self, ticker: str, bars: int) -> pd.DataFrame:
+        """Return dataframe containing only the last bars rows of ticker's data."""
+        return self.get_data(ticker, get_period_of_last_bars(bars)).tail(bars).copy()
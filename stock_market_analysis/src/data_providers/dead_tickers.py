@@ -0,0 +1,82 @@
+"""Negative cache of tickers without data (ex. delisted or misspelled symbols).
+
+Every dead ticker and period is a small file of the cache directory, so parallel
+workers can record them at once, and the file's modification time is the time it
+was found dead. TTL of the cache is taken from DEAD_TICKERS_TTL environment
+variable by default (set by CLI), so worker processes inherit it.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, TypeVar
+
+from stock_market_analysis.src.logger import logger
+
+
+Self = TypeVar("Self", bound="DeadTickersCache")
+
+DEFAULT_DEAD_TICKERS_TTL = 7 * 24 * 60 * 60  # a week in seconds
+DEAD_TICKERS_TTL_ENV_VARIABLE = "DEAD_TICKERS_TTL"
+
+
+class DeadTickersCache:
+    """Tickers which returned no data for a period, skipped until their TTL expires."""
+
+    def __init__(
+        self: Self,
+        cache_dir: Path = Path("/tmp/cache/dead_tickers"),  # noqa: S108
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Config of DeadTickersCache.
+
+        Args:
+        ----
+            cache_dir (Path): Directory dead tickers are stored in
+            ttl (float): Seconds a ticker is skipped for (0 disables the cache),
+                DEAD_TICKERS_TTL environment variable or a week by default
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def get_ttl(self: Self) -> float:
+        """Return seconds a ticker is skipped for (0 = the cache is disabled)."""
+        if self.ttl is not None:
+            return self.ttl
+        return float(
+            os.environ.get(DEAD_TICKERS_TTL_ENV_VARIABLE, DEFAULT_DEAD_TICKERS_TTL)
+        )
+
+    def _get_file(self: Self, ticker: str, period: str) -> Path:
+        """Return file of the dead ticker and period."""
+        name = f"{ticker}_{period}".replace("/", "_").replace(":", "_")
+        return self.cache_dir / f"{name}.json"
+
+    def get_reason(self: Self, ticker: str, period: str) -> Optional[str]:
+        """Return why the ticker has no data for the period, None if it's unknown.
+
+        Tickers are unknown also when their TTL expired.
+        """
+        ttl = self.get_ttl()
+        if not ttl:
+            return None
+        file = self._get_file(ticker, period)
+        try:
+            if time.time() - file.stat().st_mtime > ttl:
+                return None
+            return json.loads(file.read_text(encoding="utf-8"))["reason"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def add(self: Self, ticker: str, period: str, reason: str) -> None:
+        """Record the ticker as dead for the period."""
+        ttl = self.get_ttl()
+        if not ttl:
+            return
+        logger.info("Caching dead ticker for %d seconds: %s (%s)", ttl, ticker, reason)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._get_file(ticker, period).write_text(
+            json.dumps({"ticker": ticker, "period": period, "reason": reason}),
+            encoding="utf-8",
+        )
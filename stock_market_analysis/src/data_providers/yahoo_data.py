@@ -1,16 +1,60 @@
 """Provider of data from Yahoo Finance service."""
+import logging
 from pathlib import Path
-from typing import TypeVar
+from typing import Optional, TypeVar
 
 import pandas as pd
 import yfinance as yf
 
 from stock_market_analysis.src.data_providers.base_provider import BaseDataProvider
+from stock_market_analysis.src.data_providers.dead_tickers import DeadTickersCache
+from stock_market_analysis.src.executor.scheduler import TaskTimeoutError
 from stock_market_analysis.src.logger import logger
-from stock_market_analysis.src.utils.utils import EMPTY_DF, cache_to_pickle
+from stock_market_analysis.src.utils.utils import (
+    EMPTY_DF,
+    cache_to_pickle,
+    get_period_of_last_bars,
+)
 
 
 Self = TypeVar("Self", bound="YahooDataProvider")
+HandlerSelf = TypeVar("HandlerSelf", bound="_TickerErrorsHandler")
+
+# data of dead tickers, the same as Yahoo Finance returns for tickers without data
+NO_DATA_DF = pd.DataFrame(
+    columns=["Open", "High", "Low", "Close", "Volume"],
+    index=pd.DatetimeIndex([], name="Date"),
+)
+
+# errors yfinance reports for tickers without data, other errors (ex. network
+# errors, rate limits) are transient
+NO_DATA_ERRORS = ("delisted", "no price data found", "no timezone found", "no data found")
+
+
+class DownloadError(Exception):
+    """Yahoo Finance data weren't downloaded for a transient reason (ex. network error)."""
+
+
+class _TickerErrorsHandler(logging.Handler):
+    """Collects errors yfinance logs for a ticker, yf.download doesn't raise them."""
+
+    def __init__(self: HandlerSelf, ticker: str) -> None:
+        super().__init__(logging.ERROR)
+        # yfinance quotes tickers ('AAA', ['AAA']) or prefixes them by $ ($AAA: ...)
+        self.markers = (f"'{ticker.upper()}'", f"${ticker.upper()}:")
+        self.errors: list[str] = []
+
+    def emit(self: HandlerSelf, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if any(marker in message.upper() for marker in self.markers):
+            self.errors.append(message)
+
+
+def is_no_data_error(errors: list[str]) -> bool:
+    """Return True if all errors of a download mean that the ticker has no data."""
+    return bool(errors) and all(
+        any(reason in error.lower() for reason in NO_DATA_ERRORS) for error in errors
+    )
 
 
 @cache_to_pickle(Path("/tmp/cache/yf_download"))  # noqa: S108
@@ -25,18 +69,31 @@ def yf_download(ticker: str, period: str) -> pd.DataFrame:
     Returns:
     -------
         Dict: Stock data as a dictionary
+
+    Raises:
+    ------
+        DownloadError: yfinance failed for other reason than missing data
     """
     logger.info(
         "Downloading Yahoo Finance history data for: ticker: %s; period: %s",
         ticker,
         period,
     )
-    if ":" in period:
-        start, end = period.split(":")
-        data = yf.download(ticker, start=start, end=end, progress=False)
-    else:
-        data = yf.download(ticker, period=period, progress=False)
+    errors_handler = _TickerErrorsHandler(ticker)
+    yf_logger = logging.getLogger("yfinance")
+    yf_logger.addHandler(errors_handler)
+    try:
+        if ":" in period:
+            start, end = period.split(":")
+            data = yf.download(ticker, start=start, end=end, progress=False)
+        else:
+            data = yf.download(ticker, period=period, progress=False)
+    finally:
+        yf_logger.removeHandler(errors_handler)
 
+    if data.empty and not is_no_data_error(errors_handler.errors):
+        msg = "; ".join(errors_handler.errors) or "no data without an error"
+        raise DownloadError(msg)
     data.columns = data.columns.get_level_values(0)
     return data
 
@@ -44,6 +101,16 @@ def yf_download(ticker: str, period: str) -> pd.DataFrame:
 class YahooDataProvider(BaseDataProvider):
     """Fetches stock data from Yahoo Finance."""
 
+    def __init__(self: Self, dead_tickers: Optional[DeadTickersCache] = None) -> None:
+        """Config of YahooDataProvider.
+
+        Args:
+        ----
+            dead_tickers (DeadTickersCache): Tickers without data for a period,
+                skipped without requests to Yahoo Finance
+        """
+        self.dead_tickers = dead_tickers if dead_tickers is not None else DeadTickersCache()
+
     def get_data(self: Self, ticker: str, period: str) -> pd.DataFrame:
         """Fetch data for a single ticker within the specified period.
 
@@ -56,8 +123,29 @@ class YahooDataProvider(BaseDataProvider):
         -------
             Dict: Stock data as a dictionary
         """
+        return self._get_data(ticker, period, period)
+
+    def get_latest_data(self: Self, ticker: str, bars: int) -> pd.DataFrame:
+        """Return dataframe containing only the last bars rows of ticker's data.
+
+        Period of the last bars moves every day, so dead tickers are recorded
+        for the number of bars instead of the period.
+        """
+        data = self._get_data(ticker, get_period_of_last_bars(bars), f"last_{bars}_bars")
+        return data.tail(bars).copy()
+
+    def _get_data(self: Self, ticker: str, period: str, dead_period: str) -> pd.DataFrame:
+        """Fetch data of the ticker, dead tickers are recorded for dead_period."""
+        reason = self.dead_tickers.get_reason(ticker, dead_period)
+        if reason is not None:
+            logger.info("Skipping dead ticker: %s (%s)", ticker, reason)
+            return NO_DATA_DF.copy()
+
         try:
-            return yf_download(ticker, period)
+            data = yf_download(ticker, period)
+        except TaskTimeoutError:
+            # the scheduler reports the task as timed out
+            raise
         except Exception as ex:
             logger.error(
                 "ERROR: cannot download data for ticker: %s; period: %s; msg: %s",
@@ -65,4 +153,9 @@ class YahooDataProvider(BaseDataProvider):
                 period,
                 str(ex),
             )
+            # errors may be transient (ex. network), so they aren't cached
             return EMPTY_DF
+
+        if data.empty:
+            self.dead_tickers.add(ticker, dead_period, f"no data for period: {dead_period}")
+        return data
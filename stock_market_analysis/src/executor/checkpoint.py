@@ -0,0 +1,80 @@
+"""Per-ticker checkpoints of long runs, so interrupted runs resume where they stopped.
+
+Results of every ticker are saved by the worker computing them into a run
+directory keyed by the service's fingerprint and the version of analyzed data:
+
+    <checkpoint_dir>/<service>_<fingerprint>/<data version>/<ticker>.pkl
+"""
+
+from datetime import date
+from pathlib import Path
+from typing import Optional, TypeVar
+
+import pandas as pd
+
+from stock_market_analysis.src.services.registry import ServiceDefinition
+from stock_market_analysis.src.utils.utils import get_date_range
+
+
+Self = TypeVar("Self", bound="CheckpointStore")
+
+DEFAULT_CHECKPOINT_DIR = "checkpoints"
+
+
+def get_data_version(period: str, latest: Optional[int] = None) -> str:
+    """Return version of data analyzed by a run.
+
+    Relative periods (ex. '1y') and latest bars move every day, so they're
+    resolved into dates.
+    """
+    if latest:
+        return f"latest_{latest}_{date.today()}"  # noqa: DTZ011
+    start_date, end_date = get_date_range(period)
+    return f"{start_date}_{end_date}"
+
+
+class CheckpointStore:
+    """Results of tickers of a single run saved as pickle files."""
+
+    def __init__(self: Self, run_dir: str | Path) -> None:
+        """Config of CheckpointStore."""
+        self.run_dir = Path(run_dir)
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def for_run(
+        cls: type[Self],
+        checkpoint_dir: str | Path,
+        definition: ServiceDefinition,
+        period: str,
+        latest: Optional[int] = None,
+    ) -> Self:
+        """Return checkpoints of run of the service over the period."""
+        return cls(
+            Path(checkpoint_dir)
+            / f"{definition.name}_{definition.get_fingerprint()[:16]}"
+            / get_data_version(period, latest)
+        )
+
+    def _get_file(self: Self, ticker: str) -> Path:
+        """Return checkpoint file of the ticker."""
+        return self.run_dir / f"{ticker.replace('/', '_')}.pkl"
+
+    def has(self: Self, ticker: str) -> bool:
+        """Check if results of the ticker are checkpointed."""
+        return self._get_file(ticker).exists()
+
+    def save(self: Self, ticker: str, data_df: pd.DataFrame) -> None:
+        """Save results of the ticker (written at once, so they're never partial)."""
+        file = self._get_file(ticker)
+        tmp_file = file.with_suffix(".tmp")
+        data_df.to_pickle(tmp_file)
+        tmp_file.replace(file)
+
+    def load(self: Self, ticker: str) -> pd.DataFrame:
+        """Load checkpointed results of the ticker."""
+        return pd.read_pickle(self._get_file(ticker))  # noqa: S301
+
+    def remove(self: Self, ticker: str) -> None:
+        """Remove checkpoint of the ticker (if any), so it's analyzed again."""
+        self._get_file(ticker).unlink(missing_ok=True)
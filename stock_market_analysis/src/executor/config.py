@@ -0,0 +1,105 @@
+"""Central configuration of parallel workers used by all commands.
+
+Every worker process of a pool gets only its share of CPUs for BLAS/OpenMP
+threads of NumPy and pandas (cpu_count / workers by default), so N workers don't
+start N x cpu_count threads fighting for the same cores. Commands activate their
+config once and all their stages build pools from it:
+
+    with ExecutorConfig(n_workers=16).activate():
+        with get_executor_config().get_parallel() as parallel:
+            parallel(...)  # the same pool is reused by both stages
+            parallel(...)
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, TypeVar
+
+from joblib import Parallel, cpu_count, effective_n_jobs, parallel_config
+from pydantic import BaseModel
+
+
+Self = TypeVar("Self", bound="ExecutorConfig")
+
+BACKENDS = ("loky", "multiprocessing", "threading", "sequential")
+
+# environment variables limiting threads of BLAS/OpenMP libraries in workers
+THREAD_LIMIT_ENV_VARIABLES = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "BLIS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+class ExecutorConfig(BaseModel):
+    """Number and type of parallel workers and threads inside of them."""
+
+    class Config:  # noqa: D106
+        frozen = True
+
+    n_workers: int = -1
+    backend: str = "loky"
+    inner_threads: Optional[int] = None
+
+    def __init__(self: Self, **data: Any) -> None:  # noqa: ANN401
+        """Validate config of workers."""
+        super().__init__(**data)
+        if self.backend not in BACKENDS:
+            msg = f"Unsupported backend: {self.backend}. Use one of {BACKENDS}"
+            raise ValueError(msg)
+
+    def get_n_workers(self: Self) -> int:
+        """Return number of workers (-1 = all CPUs is resolved)."""
+        return 1 if self.backend == "sequential" else effective_n_jobs(self.n_workers)
+
+    def get_inner_threads(self: Self) -> int:
+        """Return number of BLAS/OpenMP threads per worker process."""
+        if self.inner_threads:
+            return self.inner_threads
+        return max(cpu_count() // self.get_n_workers(), 1)
+
+    def get_worker_env(self: Self) -> dict[str, str]:
+        """Return environment variables limiting threads of worker processes."""
+        inner_threads = str(self.get_inner_threads())
+        return dict.fromkeys(THREAD_LIMIT_ENV_VARIABLES, inner_threads)
+
+    def _get_parallel_config(self: Self) -> dict[str, Any]:
+        """Return joblib's parallel_config() arguments of the config."""
+        config = {"backend": self.backend, "n_jobs": self.get_n_workers()}
+        # other backends don't support limiting threads of their workers
+        if self.backend == "loky":
+            config["inner_max_num_threads"] = self.get_inner_threads()
+        return config
+
+    def get_parallel(
+        self: Self, n_jobs: Optional[int] = None, **kwargs: Any  # noqa: ANN401
+    ) -> Parallel:
+        """Return joblib Parallel of the config (n_jobs overrides n_workers)."""
+        # Parallel takes its backend from the config active when it's created
+        with parallel_config(**self._get_parallel_config()):
+            return Parallel(n_jobs=n_jobs, **kwargs)
+
+    @contextmanager
+    def activate(self: Self) -> Iterator["ExecutorConfig"]:
+        """Make the config active (see get_executor_config()) within the context.
+
+        Parallel objects created without backend (ex. by libraries) use it too.
+        """
+        global _active_config  # noqa: PLW0603
+        previous_config = _active_config
+        _active_config = self
+        try:
+            with parallel_config(**self._get_parallel_config()):
+                yield self
+        finally:
+            _active_config = previous_config
+
+
+_active_config = ExecutorConfig()
+
+
+def get_executor_config() -> ExecutorConfig:
+    """Return active config of parallel workers (all CPUs with loky by default)."""
+    return _active_config
@@ -0,0 +1,164 @@
+"""Two-stage scheduling: fetching threads feed computing workers.
+
+Downloads wait on the network, so they run in a thread pool of the main process
+and every ticker is sent to a computing worker as soon as its data arrives. The
+number of tickers in flight (fetching, fetched or computing) is bounded, so fast
+fetching can't pile up data in memory while workers are busy, and wall time
+approaches max(network, compute) instead of their sum.
+"""
+
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+from joblib.externals.loky import get_reusable_executor
+
+from stock_market_analysis.src.executor.scheduler import (
+    TaskFailure,
+    TickerScheduler,
+    run_task,
+)
+from stock_market_analysis.src.logger import logger
+
+
+Self = TypeVar("Self", bound="PipelinedScheduler")
+
+
+class PipelinedScheduler(TickerScheduler):
+    """Fetches tickers' data by threads and computes them by workers at once."""
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        n_workers: Optional[int] = None,
+        backend: Optional[str] = None,
+        batches_per_worker: int = 4,
+        n_fetchers: int = 8,
+        max_pending: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+    ) -> None:
+        """Config of PipelinedScheduler.
+
+        Args:
+        ----
+            n_workers (int): Number of computing workers (see TickerScheduler)
+            backend (str): Backend of computing workers (see TickerScheduler)
+            batches_per_worker (int): Batches per worker of not staged run()
+            n_fetchers (int): Number of fetching threads
+            max_pending (int): Maximum number of tickers in flight, it bounds
+                memory of fetched data (2 x (fetchers + workers) by default)
+            task_timeout (float): Seconds a single fetch or compute can run
+        """
+        super().__init__(n_workers, backend, batches_per_worker, task_timeout)
+        self.n_fetchers = n_fetchers
+        self.max_pending = max_pending
+
+    def _get_compute_executor(self: Self, stack: ExitStack, n_workers: int) -> Executor:
+        """Return executor of computing workers (closed by the stack)."""
+        if self.backend == "loky":
+            # loky workers are reused by next runs, like the ones of joblib
+            return get_reusable_executor(
+                max_workers=n_workers, env=self.config.get_worker_env()
+            )
+        if self.backend == "multiprocessing":
+            return stack.enter_context(ProcessPoolExecutor(max_workers=n_workers))
+        return stack.enter_context(ThreadPoolExecutor(max_workers=n_workers))
+
+    def run_staged(
+        self: Self,
+        fetch: Callable,
+        compute: Callable,
+        tasks: Sequence[tuple],
+        costs: Optional[Sequence[float]] = None,
+    ) -> list[Any]:
+        """Return compute(*args, fetch(*args)) of all tasks (in order of tasks).
+
+        fetch is run by threads of the main process and tasks are fetched from
+        the most expensive one, compute is run by workers as soon as data of its
+        task is fetched. Failed tasks don't stop the others, their results are
+        TaskFailure. Threads can't be interrupted, so fetches exceeding timeout
+        are abandoned and their threads are freed once the request ends.
+        """
+        if costs is None:
+            costs = [1.0] * len(tasks)
+        n_workers = self.config.get_n_workers()
+        max_pending = self.max_pending or 2 * (self.n_fetchers + n_workers)
+        logger.info(
+            "Pipelining %d tasks: %d fetching threads, %d %s workers, %d in flight",
+            len(tasks),
+            self.n_fetchers,
+            n_workers,
+            self.backend,
+            max_pending,
+        )
+
+        order = iter(sorted(range(len(tasks)), key=lambda idx: costs[idx], reverse=True))
+        results: list[Any] = [None] * len(tasks)
+        with ExitStack() as stack:
+            fetch_pool = ThreadPoolExecutor(self.n_fetchers)
+            # hung fetches aren't waited for
+            stack.callback(fetch_pool.shutdown, wait=False, cancel_futures=True)
+            compute_pool = self._get_compute_executor(stack, n_workers)
+            # futures of fetched or computed tasks: future -> (is_fetch, task index)
+            in_flight: dict[Future, tuple[bool, int]] = {}
+            fetch_starts: dict[Future, float] = {}
+
+            def fetch_next() -> None:
+                idx = next(order, None)
+                if idx is not None:
+                    in_flight[fetch_pool.submit(run_task, fetch, tasks[idx])] = (True, idx)
+
+            for _ in range(max_pending):
+                fetch_next()
+            while in_flight:
+                done, _ = wait(
+                    in_flight,
+                    timeout=self.task_timeout and self.task_timeout / 10,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    is_fetch, idx = in_flight.pop(future)
+                    fetch_starts.pop(future, None)
+                    result = future.result()
+                    if is_fetch and not isinstance(result, TaskFailure):
+                        compute_future = compute_pool.submit(
+                            run_task, compute, (*tasks[idx], result), self.task_timeout
+                        )
+                        in_flight[compute_future] = (False, idx)
+                    else:
+                        results[idx] = result
+                        # a slot is free only when the data left the memory
+                        fetch_next()
+                if self.task_timeout is not None:
+                    for idx in self._abandon_timed_out_fetches(in_flight, fetch_starts):
+                        results[idx] = TaskFailure(
+                            error_type="TaskTimeoutError",
+                            message="Fetching exceeded its timeout",
+                        )
+                        fetch_next()
+        return results
+
+    def _abandon_timed_out_fetches(
+        self: Self,
+        in_flight: dict[Future, tuple[bool, int]],
+        fetch_starts: dict[Future, float],
+    ) -> list[int]:
+        """Remove fetches running longer than timeout and return their task indexes."""
+        now = time.monotonic()
+        timed_out = []
+        for future, (is_fetch, idx) in list(in_flight.items()):
+            if not is_fetch or not future.running():
+                continue
+            if now - fetch_starts.setdefault(future, now) > self.task_timeout:  # type: ignore
+                logger.error("ERROR: task failed; fetching exceeded its timeout")
+                del in_flight[future]
+                del fetch_starts[future]
+                timed_out.append(idx)
+        return timed_out
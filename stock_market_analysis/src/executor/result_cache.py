@@ -0,0 +1,73 @@
+"""Memoized results of services keyed by their config and analyzed data.
+
+Results of a ticker depend only on the service's fingerprint (indicators and
+strategies with their params, see ServiceDefinition.get_fingerprint()) and on
+the content of its data, so reruns which change only post-run stages (filters,
+sorting, limit) load them instead of computing indicators and strategies again:
+
+    <cache_dir>/<sha256 of fingerprint, ticker, stock index, latest and data>.pkl
+"""
+
+import os
+from hashlib import sha256
+from pathlib import Path
+from typing import Optional, TypeVar
+
+import pandas as pd
+
+from stock_market_analysis.src.logger import logger
+
+
+Self = TypeVar("Self", bound="ResultCache")
+
+DEFAULT_RESULT_CACHE_DIR = Path("/tmp/cache/results")  # noqa: S108
+
+
+def get_data_hash(data_df: pd.DataFrame) -> str:
+    """Return hash of content (columns, index and values) of the data."""
+    data_hash = sha256(repr(list(data_df.columns)).encode())
+    data_hash.update(pd.util.hash_pandas_object(data_df, index=True).to_numpy().tobytes())
+    return data_hash.hexdigest()
+
+
+class ResultCache:
+    """Results of services per ticker saved as pickle files."""
+
+    def __init__(self: Self, cache_dir: Path = DEFAULT_RESULT_CACHE_DIR) -> None:
+        """Config of ResultCache."""
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_key(  # noqa: PLR0913
+        self: Self,
+        fingerprint: str,
+        ticker: str,
+        stock_index: Optional[str],
+        latest: Optional[int],
+        data_df: pd.DataFrame,
+    ) -> str:
+        """Return key of results of the service's fingerprint over the ticker's data."""
+        config = (fingerprint, ticker, stock_index, latest, get_data_hash(data_df))
+        return sha256(repr(config).encode()).hexdigest()
+
+    def _get_file(self: Self, key: str) -> Path:
+        """Return file of the results."""
+        return self.cache_dir / f"{key}.pkl"
+
+    def load(self: Self, key: str) -> Optional[pd.DataFrame]:
+        """Load cached results, None if they aren't cached (or can't be read)."""
+        file = self._get_file(key)
+        try:
+            data_df = pd.read_pickle(file)  # noqa: S301
+        except (OSError, EOFError, ValueError):
+            return None
+        logger.debug("Loading cached results from %s", file)
+        return data_df
+
+    def save(self: Self, key: str, data_df: pd.DataFrame) -> None:
+        """Save results (written at once, so they're never partial)."""
+        file = self._get_file(key)
+        # workers of concurrent runs could save results of the same key
+        tmp_file = file.with_suffix(f".{os.getpid()}.tmp")
+        data_df.to_pickle(tmp_file)
+        tmp_file.replace(file)
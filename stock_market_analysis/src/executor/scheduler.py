@@ -0,0 +1,203 @@
+"""Cost-aware scheduling of per-ticker tasks over joblib workers.
+
+Tasks are packed into batches of similar cost, so cheap tickers don't pay
+dispatching overhead one by one, and batches are dispatched from the most
+expensive one (longest-processing-time first), so expensive tickers don't
+leave the other workers idle at the end of a run.
+"""
+
+import signal
+import threading
+from typing import Any, Callable, Optional, Sequence, TypeVar
+
+import pandas as pd
+from joblib import delayed
+from pydantic import BaseModel
+
+from stock_market_analysis.src.executor.config import ExecutorConfig, get_executor_config
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.utils.utils import get_date_range
+
+
+Self = TypeVar("Self", bound="TickerScheduler")
+
+
+class TaskFailure(BaseModel):
+    """Result of a task which raised an error or exceeded its timeout."""
+
+    class Config:  # noqa: D106
+        frozen = True
+
+    error_type: str
+    message: str
+
+
+class TaskTimeoutError(Exception):
+    """Task exceeded its timeout."""
+
+
+def count_period_bars(period: str) -> int:
+    """Return number of business days (bars) of yf.download-like period."""
+    start_date, end_date = get_date_range(period)
+    return max(len(pd.bdate_range(start_date, end_date)), 1)
+
+
+def plan_batches(costs: Sequence[float], n_batches: int) -> list[list[int]]:
+    """Pack task indexes into batches ordered from the most expensive one.
+
+    Tasks more expensive than the average batch cost get their own batch, cheaper
+    ones (ordered by cost) are packed together until the average cost is reached.
+    """
+    order = sorted(range(len(costs)), key=lambda idx: costs[idx], reverse=True)
+    target_cost = sum(costs) / max(n_batches, 1)
+
+    batches: list[list[int]] = []
+    batch_costs: list[float] = []
+    batch: list[int] = []
+    batch_cost = 0.0
+    for idx in order:
+        batch.append(idx)
+        batch_cost += costs[idx]
+        if batch_cost >= target_cost:
+            batches.append(batch)
+            batch_costs.append(batch_cost)
+            batch, batch_cost = [], 0.0
+    if batch:
+        batches.append(batch)
+        batch_costs.append(batch_cost)
+
+    return [
+        batches[i]
+        for i in sorted(range(len(batches)), key=lambda i: batch_costs[i], reverse=True)
+    ]
+
+
+def _raise_timeout(signum: int, frame: Any) -> None:  # noqa: ANN401, ARG001
+    """Interrupt the running task by timeout alarm."""
+    msg = "Task exceeded its timeout"
+    raise TaskTimeoutError(msg)
+
+
+def run_task(func: Callable, args: tuple, timeout: Optional[float] = None) -> Any:  # noqa: ANN401
+    """Return func(*args), or TaskFailure if it raises or exceeds timeout seconds.
+
+    Timeout interrupts the task by SIGALRM, so it's enforced only in main threads
+    of processes (ex. loky and multiprocessing workers), not by threading workers.
+    """
+    has_alarm = (
+        timeout is not None
+        and hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if has_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)  # type: ignore
+    try:
+        return func(*args)
+    except Exception as ex:
+        logger.error("ERROR: task failed; %s: %s", ex.__class__.__name__, str(ex))
+        return TaskFailure(error_type=ex.__class__.__name__, message=str(ex))
+    finally:
+        if has_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _run_batch(func: Callable, batch_args: list[tuple], timeout: Optional[float]) -> list:
+    """Run func for every args of the batch in a worker."""
+    return [run_task(func, args, timeout) for args in batch_args]
+
+
+def _fetch_and_compute(fetch: Callable, compute: Callable, *args: Any) -> Any:  # noqa: ANN401
+    """Fetch data of a task and compute its result in the same worker."""
+    return compute(*args, fetch(*args))
+
+
+class TickerScheduler:
+    """Runs per-ticker tasks in batches, the most expensive ones first."""
+
+    def __init__(
+        self: Self,
+        n_workers: Optional[int] = None,
+        backend: Optional[str] = None,
+        batches_per_worker: int = 4,
+        task_timeout: Optional[float] = None,
+    ) -> None:
+        """Config of TickerScheduler.
+
+        Args:
+        ----
+            n_workers (int): Number of parallel workers (-1 = all CPUs), the active
+                ExecutorConfig's one by default
+            backend (str): joblib backend: 'loky', 'multiprocessing', 'threading'
+                or 'sequential', the active ExecutorConfig's one by default
+            batches_per_worker (int): Number of batches planned per worker, more
+                batches balance load better, less ones have lower overhead
+            task_timeout (float): Seconds a single task can run (see run_task())
+        """
+        active_config = get_executor_config()
+        self.config = ExecutorConfig(
+            n_workers=active_config.n_workers if n_workers is None else n_workers,
+            backend=backend or active_config.backend,
+            inner_threads=active_config.inner_threads,
+        )
+        self.n_workers = self.config.n_workers
+        self.backend = self.config.backend
+        self.batches_per_worker = batches_per_worker
+        self.task_timeout = task_timeout
+        if task_timeout is not None and self.backend == "threading":
+            logger.warning("Task timeouts aren't enforced by threading backend.")
+
+    def run(
+        self: Self,
+        func: Callable,
+        tasks: Sequence[tuple],
+        costs: Optional[Sequence[float]] = None,
+    ) -> list[Any]:
+        """Return func(*args) of all tasks (in order of tasks).
+
+        Failed tasks don't stop the others, their results are TaskFailure.
+
+        Args:
+        ----
+            func (Callable): Picklable function run by workers
+            tasks (Sequence[tuple]): Arguments of func per task
+            costs (Sequence[float]): Estimated cost per task (equal by default)
+        """
+        if costs is None:
+            costs = [1.0] * len(tasks)
+        n_workers = self.config.get_n_workers()
+        batches = plan_batches(costs, n_workers * self.batches_per_worker)
+        logger.info(
+            "Scheduling %d tasks in %d batches over %d %s workers",
+            len(tasks),
+            len(batches),
+            n_workers,
+            self.backend,
+        )
+        batch_results = self.config.get_parallel(batch_size=1)(
+            delayed(_run_batch)(func, [tasks[idx] for idx in batch], self.task_timeout)
+            for batch in batches
+        )
+
+        results: list[Any] = [None] * len(tasks)
+        for batch, batch_result in zip(batches, batch_results):
+            for idx, result in zip(batch, batch_result):
+                results[idx] = result
+        return results
+
+    def run_staged(
+        self: Self,
+        fetch: Callable,
+        compute: Callable,
+        tasks: Sequence[tuple],
+        costs: Optional[Sequence[float]] = None,
+    ) -> list[Any]:
+        """Return compute(*args, fetch(*args)) of all tasks (in order of tasks).
+
+        Every worker fetches data of its tasks itself, see PipelinedScheduler for
+        fetching overlapped with computing.
+        """
+        return self.run(
+            _fetch_and_compute, [(fetch, compute, *args) for args in tasks], costs
+        )
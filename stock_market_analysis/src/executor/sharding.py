@@ -0,0 +1,124 @@
+"""Sharded runs of tickers partitioned across machines (or processes).
+
+Partial results of the shards are merged by a single run.
+"""
+
+import pickle
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from pydantic import BaseModel
+
+from stock_market_analysis.src.logger import logger
+
+
+class PartialResult(BaseModel):
+    """Results of a single shard before post-run analyses."""
+
+    class Config:  # noqa: D106
+        arbitrary_types_allowed = True
+        frozen = True
+
+    service: str
+    period: str
+    latest: Optional[int] = None
+    shard: int
+    shard_count: int
+    # positions of the shard's tickers in the whole universe, so merged results
+    # keep the order of a single run
+    ticker_positions: dict[str, int]
+    data_df: pd.DataFrame
+
+
+def parse_shard(shard: str) -> tuple[int, int]:
+    """Parse 'i/N' shard (1 <= i <= N) into (i, N)."""
+    try:
+        index, count = (int(value) for value in shard.split("/"))
+    except ValueError as ex:
+        msg = f"Invalid shard: {shard}. Use 'i/N' format, ex. '1/4'"
+        raise ValueError(msg) from ex
+    if not 1 <= index <= count:
+        msg = f"Invalid shard: {shard}. Shard index must be between 1 and {count}"
+        raise ValueError(msg)
+    return index, count
+
+
+def get_ticker_shard(ticker: str, shard_count: int) -> int:
+    """Return shard (1..N) of the ticker, it's the same on every machine and run."""
+    return zlib.crc32(ticker.encode("utf-8")) % shard_count + 1
+
+
+def select_shard(tickers: list, shard: int, shard_count: int) -> list:
+    """Return tickers of the shard (in the original order)."""
+    return [ticker for ticker in tickers if get_ticker_shard(ticker, shard_count) == shard]
+
+
+def get_partial_file(service: str, shard: int, shard_count: int) -> str:
+    """Return default name of the shard's partial result file."""
+    return f"{service}_shard_{shard}_of_{shard_count}.pkl"
+
+
+def save_partial(partial: PartialResult, file: str) -> None:
+    """Save partial result of a shard into pickle file."""
+    logger.info(
+        "Saving %d rows of shard %d/%d into: %s",
+        len(partial.data_df),
+        partial.shard,
+        partial.shard_count,
+        file,
+    )
+    with Path(file).open("wb") as f:
+        pickle.dump(partial, f)
+
+
+def load_partials(files: list[str]) -> PartialResult:
+    """Load partial results of all shards of a run and combine them.
+
+    Returns
+    -------
+        PartialResult: Combined results of all shards (shard = shard_count = 1)
+    """
+    partials = []
+    for file in files:
+        with Path(file).open("rb") as f:
+            partials.append(pickle.load(f))  # noqa: S301
+
+    first = partials[0]
+    for partial in partials:
+        if (partial.service, partial.period, partial.latest, partial.shard_count) != (
+            first.service,
+            first.period,
+            first.latest,
+            first.shard_count,
+        ):
+            msg = (
+                "Partial results come from different runs: "
+                f"{partial.service} {partial.period} vs {first.service} {first.period}"
+            )
+            raise ValueError(msg)
+
+    shards = sorted(partial.shard for partial in partials)
+    if shards != list(range(1, first.shard_count + 1)):
+        msg = f"Expected partial results of shards 1..{first.shard_count}, got: {shards}"
+        raise ValueError(msg)
+
+    ticker_positions = {
+        ticker: position
+        for partial in partials
+        for ticker, position in partial.ticker_positions.items()
+    }
+    # shards without any tickers have empty results
+    data_dfs = [partial.data_df for partial in partials if not partial.data_df.empty]
+    data_df = pd.concat(data_dfs or [first.data_df])
+    data_df = data_df.iloc[data_df["Ticker"].map(ticker_positions).argsort(kind="stable")]
+    return PartialResult(
+        service=first.service,
+        period=first.period,
+        latest=first.latest,
+        shard=1,
+        shard_count=1,
+        ticker_positions=ticker_positions,
+        data_df=data_df,
+    )
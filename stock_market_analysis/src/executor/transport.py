@@ -0,0 +1,131 @@
+"""Transport of result frames from worker processes through Arrow IPC files.
+
+Workers of process backends return results pickled, so the parent process
+unpickles every frame (including object columns of advice strings) before
+concatenating them. With pyarrow installed, workers write result frames as
+Arrow IPC files into shared memory (/dev/shm) and return only their paths, the
+parent memory-maps the files, concatenates Arrow tables without copying and
+converts them to pandas once. Without pyarrow, frames are pickled as before.
+"""
+
+import shutil
+import tempfile
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Sequence, TypeVar, Union
+
+import pandas as pd
+from pydantic import BaseModel
+
+from stock_market_analysis.src.logger import logger
+
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+Self = TypeVar("Self", bound="FrameTransport")
+
+# backends pickling results of their workers
+ARROW_BACKENDS = ("loky", "multiprocessing")
+
+SHARED_MEMORY_DIR = Path("/dev/shm")  # noqa: S108
+
+
+class ArrowFrame(BaseModel):
+    """Result frame written by a worker into an Arrow IPC file."""
+
+    class Config:  # noqa: D106
+        frozen = True
+
+    path: str
+    num_rows: int
+
+    def read(self: "ArrowFrame") -> Any:  # noqa: ANN401
+        """Return memory-mapped Arrow table of the frame and remove its file.
+
+        Mapped memory stays valid until the table is released.
+        """
+        table = pa.ipc.open_file(pa.memory_map(self.path)).read_all()
+        Path(self.path).unlink(missing_ok=True)
+        return table
+
+    def to_pandas(self: "ArrowFrame") -> pd.DataFrame:
+        """Return the frame converted to pandas."""
+        return self.read().to_pandas()
+
+
+class FrameTransport:
+    """Directory of Arrow IPC files result frames of a single run pass through."""
+
+    def __init__(self: Self, transport_dir: Path) -> None:
+        """Config of FrameTransport."""
+        self.transport_dir = transport_dir
+
+    @classmethod
+    @contextmanager
+    def open(cls: type[Self], backend: str) -> Iterator[Optional[Self]]:
+        """Yield transport of results of workers of the backend, removed afterwards.
+
+        None is yielded when pyarrow isn't installed or workers of the backend
+        don't pickle their results (threading, sequential).
+        """
+        if pa is None or backend not in ARROW_BACKENDS:
+            yield None
+            return
+        transport_dir = Path(
+            tempfile.mkdtemp(
+                prefix="frames_",
+                dir=SHARED_MEMORY_DIR if SHARED_MEMORY_DIR.is_dir() else None,
+            )
+        )
+        try:
+            yield cls(transport_dir)
+        finally:
+            shutil.rmtree(transport_dir, ignore_errors=True)
+
+    def pack(self: Self, data_df: pd.DataFrame) -> Union[pd.DataFrame, ArrowFrame]:
+        """Write the frame into an Arrow IPC file (frames Arrow can't store are kept)."""
+        try:
+            table = pa.Table.from_pandas(data_df)
+        except (pa.ArrowException, TypeError, ValueError) as ex:
+            logger.debug("Frame is pickled, it can't be converted to Arrow: %s", ex)
+            return data_df
+        path = self.transport_dir / f"{uuid.uuid4().hex}.arrow"
+        with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        return ArrowFrame(path=str(path), num_rows=table.num_rows)
+
+    def run(self: Self, func: Callable, *args: Any) -> Any:  # noqa: ANN401
+        """Return func(*args) with resulting frame (or list of frames) packed (see pack())."""
+        result = func(*args)
+        if isinstance(result, list):
+            return [
+                self.pack(frame) if isinstance(frame, pd.DataFrame) else frame
+                for frame in result
+            ]
+        return self.pack(result) if isinstance(result, pd.DataFrame) else result
+
+
+def concat_frames(frames: Sequence[Union[pd.DataFrame, ArrowFrame]]) -> pd.DataFrame:
+    """Concatenate result frames like pd.concat(), Arrow ones are read only once.
+
+    When all frames are Arrow ones, their tables are concatenated without copying
+    and converted to pandas at once.
+    """
+    arrow_frames = [frame for frame in frames if isinstance(frame, ArrowFrame)]
+    if not arrow_frames:
+        return pd.concat(frames)
+    tables = [frame.read() for frame in arrow_frames]
+    if len(arrow_frames) == len(frames):
+        try:
+            # missing columns and types differing by ticker are unified as pandas does
+            return pa.concat_tables(tables, promote_options="permissive").to_pandas()
+        except (pa.ArrowException, TypeError, ValueError) as ex:
+            logger.debug("Arrow tables can't be concatenated: %s", ex)
+    converted = iter(table.to_pandas() for table in tables)
+    return pd.concat(
+        [next(converted) if isinstance(frame, ArrowFrame) else frame for frame in frames]
+    )
@@ -117,14 +117,46 @@ def momentum_10(df: pd.DataFrame) -> pd.Series:
     return momentum(df, window=10)
 
 
+# number of bars needed before an indicator has its first valid value
+INDICATOR_WARMUP_BARS = {
+    "rsi": 14,
+    "macd": 26,
+    "macd_signal": 26 + 9,
+    "macd_hist": 26 + 9,
+    "bb_upper": 20,
+    "bb_lower": 20,
+    "ma_20": 20,
+    "ma_50": 50,
+    "ma_200": 200,
+    "ma_20_slope": 20 + 1,
+    "ma_50_slope": 50 + 1,
+    "ma_200_slope": 200 + 1,
+    "volume_ma_20": 20,
+    "momentum_10": 10 + 1,
+}
+
+
 class TechnicalIndicators:
     """Applies selected technical indicators on stock data."""
 
+    def get_warmup_bars(self: Self, selected_indicators: Optional[list] = None) -> int:
+        """Return number of bars needed by the slowest of selected indicators."""
+        warmup_bars = 0
+        for indicator in selected_indicators or []:
+            if indicator not in INDICATOR_WARMUP_BARS:
+                msg = f"Warmup of indicator '{indicator}' is not known."
+                raise ValueError(msg)
+            warmup_bars = max(warmup_bars, INDICATOR_WARMUP_BARS[indicator])
+        return warmup_bars
+
     def add_indicators(
         self: Self, df: pd.DataFrame, selected_indicators: Optional[list] = None
     ) -> pd.DataFrame:
         """Add the selected technical indicators to the dataframe.
 
+        Indicators already in the dataframe (ex. shared by services of
+        multi-service runs) aren't computed again.
+
         Args:
         ----
             df (pd.DataFrame): Stock data as a DataFrame
@@ -148,9 +180,16 @@ class TechnicalIndicators:
 
         # Apply selected indicators
         for indicator in selected_indicators:
+            if indicator in df.columns:
+                continue
             if indicator in indicator_functions:
                 df[indicator] = indicator_functions[indicator](df)
             else:
                 msg = f"Warning: Indicator '{indicator}' not found in available functions."
                 raise ValueError(msg)
         return df
+
+
+def ensure_indicator(df: pd.DataFrame, indicator: str) -> pd.Series:
+    """Return column of the indicator, it's added to df only if it's missing."""
+    return TechnicalIndicators().add_indicators(df, [indicator])[indicator]
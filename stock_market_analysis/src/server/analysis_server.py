@@ -0,0 +1,248 @@
+"""Long-running local analysis server keeping services and their results in memory.
+
+Repeated 'analyze' requests (ex. with different filters, sorting or limit) are
+answered from memory, only tickers which weren't analyzed yet are computed.
+"""
+
+import json
+from collections import OrderedDict
+from datetime import date
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Optional, TypeVar
+
+import pandas as pd
+from pydantic import BaseModel
+
+from stock_market_analysis.src.analysis.filtering import filter_tickers_df
+from stock_market_analysis.src.executor.scheduler import TaskFailure, TickerScheduler
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.server.client import (
+    DEFAULT_HOST,
+    DEFAULT_MAX_RESULTS,
+    DEFAULT_PORT,
+)
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import service_registry
+from stock_market_analysis.src.utils.utils import (
+    parse_columns_input,
+    parse_filters_input,
+    parse_sort_input,
+)
+
+
+Self = TypeVar("Self", bound="AnalysisServer")
+
+
+class AnalyzeRequest(BaseModel):
+    """Parameters of 'analyze' request (the same as of 'analyze' CLI command)."""
+
+    service: str = "RSIBase"
+    file: str
+    ticker: Optional[str] = None
+    period: str = "1y"
+    latest: Optional[int] = None
+    filters: str = ""
+    order_by: str = ""
+    columns: str = ""
+    limit: int = 100
+
+
+class AnalysisServer:
+    """Analyzes requests using tickers files and results kept in memory.
+
+    Every request builds its own AnalysisPipeline of the (cached) service definition.
+    """
+
+    def __init__(
+        self: Self,
+        scheduler: Optional[TickerScheduler] = None,
+        max_results: int = DEFAULT_MAX_RESULTS,
+    ) -> None:
+        """Config of AnalysisServer."""
+        self.scheduler = scheduler if scheduler is not None else TickerScheduler()
+        self.max_results = max_results
+        self.tickers_dfs: dict[tuple[str, float], pd.DataFrame] = {}
+        # results of service.run() per (service, ticker, stock index, period, latest)
+        # ordered from the least recently used
+        self.results: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
+        self.results_date = date.today()  # noqa: DTZ011
+
+    def get_tickers_df(self: Self, file: str) -> pd.DataFrame:
+        """Return (cached until the file is modified) tickers CSV file."""
+        key = (file, Path(file).stat().st_mtime)
+        if key not in self.tickers_dfs:
+            logger.info("Loading tickers file: %s", file)
+            self.tickers_dfs[key] = pd.read_csv(file)
+        return self.tickers_dfs[key]
+
+    def _expire_results(self: Self) -> None:
+        """Drop results of previous days, as periods like '1y' move every day."""
+        today = date.today()  # noqa: DTZ011
+        if today != self.results_date:
+            logger.info("Dropping %d results of %s", len(self.results), self.results_date)
+            self.results = OrderedDict()
+            self.results_date = today
+
+    def _store_results(self: Self, results: dict[tuple, pd.DataFrame]) -> None:
+        """Add results, dropping the least recently used ones above max_results."""
+        self.results.update(results)
+        while len(self.results) > self.max_results:
+            self.results.popitem(last=False)
+
+    def analyze(self: Self, request: AnalyzeRequest) -> pd.DataFrame:
+        """Return (limited) results of analyze request."""
+        self._expire_results()
+        filters_dict = parse_filters_input(request.filters)
+        tickers_df = filter_tickers_df(self.get_tickers_df(request.file), filters_dict)
+        tickers = (
+            [request.ticker]
+            if request.ticker is not None
+            else tickers_df["Ticker"].tolist()
+        )
+        if not tickers:
+            msg = "Input filtering criteria selected 0 tickers to analyse."
+            raise ValueError(msg)
+
+        sort_columns, sort_orders = parse_sort_input(request.order_by)
+        pipeline = AnalysisPipeline(
+            service_registry.get_definition(request.service),
+            filters_dict,
+            sort_columns,
+            sort_orders,
+            request.latest,
+            extra_columns=parse_columns_input(request.columns),
+        )
+        stock_indexes = (
+            tickers_df.drop_duplicates("Ticker").set_index("Ticker")["Stock_Index"]
+        )
+        keys = [
+            (request.service, ticker, stock_indexes.get(ticker), request.period, request.latest)
+            for ticker in tickers
+        ]
+        missing_keys = [key for key in keys if key not in self.results]
+        logger.info(
+            "Analyzing %d tickers (%d in memory)",
+            len(missing_keys),
+            len(keys) - len(missing_keys),
+        )
+        # results are kept unfiltered, so they serve requests with any filters
+        missing_tickers = [key[1] for key in missing_keys]
+        # bars of tickers are known from results of other services of the period
+        bar_counts = {
+            key[1]: len(result_df)
+            for key, result_df in self.results.items()
+            if key[3:] == (request.period, None)
+        }
+        missing_results = self.scheduler.run(
+            pipeline.service.run_with_analyses,
+            [
+                (ticker, period, stock_index, [], latest)
+                for _, ticker, stock_index, period, latest in missing_keys
+            ],
+            pipeline.estimate_costs(missing_tickers, request.period, bar_counts),
+        )
+        # failed tickers are analyzed again by next requests
+        request_results = {
+            key: self.results[key] for key in keys if key in self.results
+        }
+        request_results.update(
+            (key, result)
+            for key, result in zip(missing_keys, missing_results)
+            if not isinstance(result, TaskFailure)
+        )
+        for key in request_results:
+            self.results.pop(key, None)
+        self._store_results(request_results)
+
+        result_df = pipeline.post_run(
+            pd.concat(
+                [
+                    pipeline.filter_rows(request_results[key])
+                    for key in keys
+                    if key in request_results
+                ]
+            )
+        )
+        return result_df.tail(request.limit)
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """Handles JSON requests: 'GET /health' and 'POST /analyze'."""
+
+    server: "AnalysisHTTPServer"
+
+    def _send_json(self: "AnalysisRequestHandler", status: HTTPStatus, body: str) -> None:
+        """Send JSON response."""
+        encoded_body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def do_GET(self: "AnalysisRequestHandler") -> None:  # noqa: N802
+        """Report state of the server."""
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, json.dumps({"error": "Not found"}))
+            return
+        analysis_server = self.server.analysis_server
+        self._send_json(
+            HTTPStatus.OK,
+            json.dumps({"status": "ok", "results": len(analysis_server.results)}),
+        )
+
+    def do_POST(self: "AnalysisRequestHandler") -> None:  # noqa: N802
+        """Analyze request and respond with results in pandas 'split' JSON format."""
+        if self.path != "/analyze":
+            self._send_json(HTTPStatus.NOT_FOUND, json.dumps({"error": "Not found"}))
+            return
+        try:
+            content_length = int(self.headers.get("Content-Length", 0))
+            request = AnalyzeRequest(**json.loads(self.rfile.read(content_length)))
+            result_df = self.server.analysis_server.analyze(request)
+        except (ValueError, KeyError, OSError) as ex:
+            logger.error("ERROR: cannot analyze request; msg: %s", str(ex))
+            self._send_json(HTTPStatus.BAD_REQUEST, json.dumps({"error": str(ex)}))
+            return
+        self._send_json(
+            HTTPStatus.OK,
+            result_df.to_json(orient="split", date_format="iso"),
+        )
+
+    def log_message(self: "AnalysisRequestHandler", format: str, *args: str) -> None:
+        """Log requests by the tool's logger."""
+        logger.info("Analysis server: " + format, *args)
+
+
+class AnalysisHTTPServer(HTTPServer):
+    """HTTP server of AnalysisServer (requests are handled one by one)."""
+
+    def __init__(
+        self: "AnalysisHTTPServer",
+        server_address: tuple[str, int],
+        analysis_server: AnalysisServer,
+    ) -> None:
+        """Bind the server to address."""
+        super().__init__(server_address, AnalysisRequestHandler)
+        self.analysis_server = analysis_server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    scheduler: Optional[TickerScheduler] = None,
+    max_results: int = DEFAULT_MAX_RESULTS,
+) -> None:
+    """Run analysis server until it's interrupted."""
+    http_server = AnalysisHTTPServer(
+        (host, port), AnalysisServer(scheduler, max_results)
+    )
+    logger.info("Analysis server is listening on: http://%s:%d", host, port)
+    try:
+        http_server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Analysis server stopped.")
+    finally:
+        http_server.server_close()
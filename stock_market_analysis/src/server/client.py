@@ -0,0 +1,42 @@
+"""Thin client of the analysis server, it depends on the standard library only."""
+
+import json
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_SERVER_URL = f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"
+# results (of a single ticker) kept by the server, the least recently used are dropped
+DEFAULT_MAX_RESULTS = 5000
+
+
+def is_server_running(server_url: str, timeout: float = 0.2) -> bool:
+    """Check if the analysis server responds on server_url."""
+    try:
+        with urlopen(f"{server_url}/health", timeout=timeout) as response:  # noqa: S310
+            return response.status == 200  # noqa: PLR2004
+    except (URLError, OSError, ValueError):
+        return False
+
+
+def post_analyze(server_url: str, request: dict) -> dict:
+    """Send analyze request to the server and return results.
+
+    Returns
+    -------
+        dict: Results in pandas 'split' format ('columns', 'index' and 'data' keys)
+    """
+    http_request = Request(
+        f"{server_url}/analyze",
+        data=json.dumps(request).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urlopen(http_request) as response:  # noqa: S310
+            return json.loads(response.read())
+    except HTTPError as ex:
+        msg = f"Analysis server error: {json.loads(ex.read()).get('error')}"
+        raise ValueError(msg) from ex
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, ClassVar, Optional, TypeVar
+from typing import TYPE_CHECKING, ClassVar, Optional, Sequence, TypeVar
 
 import pandas as pd
 
@@ -7,7 +7,6 @@ from stock_market_analysis.src.indicators.technical_indicators import (
 )
 from stock_market_analysis.src.logger import logger
 from stock_market_analysis.src.output.csv_output import CSVOutput
-from stock_market_analysis.src.output.plot_output import PlotOutput
 from stock_market_analysis.src.utils.utils import get_class_init_params
 
 
@@ -17,6 +16,18 @@ if TYPE_CHECKING:
 
 Self = TypeVar("Self", bound="BaseAnalysisService")
 
+# price data columns kept in outputs of all services
+BASE_OUTPUT_COLUMNS = (
+    "Open",
+    "High",
+    "Low",
+    "Close",
+    "Adj Close",
+    "Volume",
+    "Ticker",
+    "Stock_Index",
+)
+
 
 class BaseAnalysisService:
     """Facade service for stock market analysis."""
@@ -30,8 +41,16 @@ class BaseAnalysisService:
     )  # could be overwritten in the concrete classes
     backtest_main_advice_column = None  # could be overwritten in the concrete classes
     columns_to_plot: ClassVar = []  # could be overwritten in concrete classes
+    # columns read by _set_main_advice_column(), could be overwritten in concrete classes
+    main_advice_columns: ClassVar[list[str]] = []
 
-    def run(self: Self, ticker: str, period: str) -> None:
+    def run(
+        self: Self,
+        ticker: str,
+        period: str,
+        latest: Optional[int] = None,
+        data_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
         """Analyze a single stock ticker.
 
         Args:
@@ -39,26 +58,157 @@ class BaseAnalysisService:
             ticker (str): Stock ticker symbol
             output_format (str): Output format ('csv', 'json', 'plot')
             period (str): Data period (e.g., '1y', '2023-01-01:2024-01-01')
+            latest (int): If set, period is ignored, only the warmup bars plus the
+                latest bars are loaded and only the latest rows are returned
+            data_df (pd.DataFrame): Data already fetched by fetch_data() (ex. by
+                another thread), it's fetched by run() by default
+        """
+        data_df = self.compute_indicators(ticker, period, latest, data_df)
+        if data_df.empty:
+            return data_df
+
+        data_df = self.apply_strategies(data_df)
+        if latest:
+            return data_df.tail(latest)
+        return data_df
+
+    def run_with_analyses(  # noqa: PLR0913
+        self: Self,
+        ticker: str,
+        period: str,
+        stock_index: Optional[str],
+        analyses: list,
+        latest: Optional[int] = None,
+        data_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Analyze a single ticker, attach its Stock_Index and apply analyses.
+
+        Used by parallel workers with row-local post-run analyses (ex. filters), so
+        only remaining rows are sent back to the main process.
         """
-        # Fetch and prepare data
-        data_df = self.data_provider.get_data(ticker, period)  # type: ignore
+        data_df = self.run(ticker, period, latest, data_df)
+        if data_df.empty:
+            return data_df
+
+        data_df["Stock_Index"] = stock_index
+        for analysis in analyses:
+            data_df = analysis.apply(data_df)
+        return data_df
+
+    def finalize_results(self: Self, result_df: pd.DataFrame) -> pd.DataFrame:
+        """Convert datetime-based index of analyzed data into 'Date' column."""
+        result_df = result_df.reset_index().rename(columns={"index": "Date"})
+        return result_df.reset_index(drop=True)
+
+    def fetch_data(
+        self: Self, ticker: str, period: str, latest: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Fetch data of a single ticker.
+
+        If latest is set, only the warmup bars plus latest bars are fetched.
+        """
+        if latest:
+            return self.data_provider.get_latest_data(  # type: ignore
+                ticker, self.get_warmup_bars() + latest
+            )
+        return self.data_provider.get_data(ticker, period)  # type: ignore
+
+    def compute_indicators(
+        self: Self,
+        ticker: str,
+        period: str,
+        latest: Optional[int] = None,
+        data_df: Optional[pd.DataFrame] = None,
+    ) -> pd.DataFrame:
+        """Fetch data of a single ticker (if not given) and apply technical indicators."""
+        if data_df is None:
+            data_df = self.fetch_data(ticker, period, latest)
         if data_df.empty:
             return data_df
 
         data_df["Ticker"] = ticker
 
         # Apply technical indicators
-        data_df = self.indicator_service.add_indicators(
+        return self.indicator_service.add_indicators(
             data_df, self.technical_indicators  # type: ignore
         )
 
-        # Apply strategies
-        for strategy in self.pre_run_strategies:  # type: ignore
+    def get_warmup_bars(self: Self) -> int:
+        """Return number of bars needed before the service gives valid advice.
+
+        Strategies compute their own indicators, so it's the longest warmup of
+        service's technical indicators and pre-run strategies. Warmup of EMA-based
+        indicators (RSI, MACD) is only their window, so their values differ
+        slightly from values computed over a longer history.
+        """
+        return max(
+            [
+                self.indicator_service.get_warmup_bars(
+                    self.technical_indicators  # type: ignore
+                ),
+                *(
+                    strategy.get_warmup_bars()
+                    for strategy in self.pre_run_strategies  # type: ignore
+                ),
+            ]
+        )
+
+    def get_complexity(self: Self) -> float:
+        """Return relative cost of analyzing a bar (fetching + indicators = 1)."""
+        return 1.0 + sum(
+            strategy.complexity for strategy in self.pre_run_strategies  # type: ignore
+        )
+
+    def get_output_columns(
+        self: Self, analyses: Optional[list] = None, extra_columns: Sequence[str] = ()
+    ) -> Optional[list[str]]:
+        """Return columns of per-ticker results which are kept (None = all columns).
+
+        It's price data, results of strategies and columns read by analyses
+        (service's post_run_analysis_list by default), by main advice or plotted
+        plus extra columns (ex. requested by user). Intermediate columns of
+        strategies are dropped. All columns are kept if any analysis doesn't
+        declare columns it reads.
+        """
+        if analyses is None:
+            analyses = self.post_run_analysis_list
+
+        analyses_columns = [analysis.get_columns() for analysis in analyses]  # type: ignore
+        if any(columns is None for columns in analyses_columns):
+            return None
+        columns = [
+            *BASE_OUTPUT_COLUMNS,
+            *(
+                column
+                for strategy in self.pre_run_strategies  # type: ignore
+                for column in strategy.get_output_columns()
+            ),
+            *(column for columns in analyses_columns for column in columns),
+            *(
+                [self.backtest_main_advice_column]
+                if self.backtest_main_advice_column
+                else self.main_advice_columns
+            ),
+            *self.columns_to_plot,
+            *extra_columns,
+        ]
+        return list(dict.fromkeys(columns))
+
+    def apply_strategies(
+        self: Self, data_df: pd.DataFrame, strategies: Optional[list] = None
+    ) -> pd.DataFrame:
+        """Apply strategies (service's pre_run_strategies by default) to data_df."""
+        if strategies is None:
+            strategies = self.pre_run_strategies
+
+        for strategy in strategies:  # type: ignore
             strategy.apply(data_df)  # type: ignore
 
         return data_df
 
-    def _print_all_analysis_report(self: Self, data_df: pd.DataFrame) -> None:
+    def _print_all_analysis_report(
+        self: Self, data_df: pd.DataFrame, analyses: list
+    ) -> None:
         """Print final report after each analysis."""
         logger.info("=========================================================")
         logger.info("                    SERVICE REPORT")
@@ -69,7 +219,7 @@ class BaseAnalysisService:
             cls_name, init_params = get_class_init_params(strategy)
             logger.info(f"      - {cls_name}({init_params})")
         logger.info("  APPLIED POST_RUN_ANAYSIS:")
-        for analysis in self.post_run_analysis_list:  # type: ignore
+        for analysis in analyses:
             cls_name, init_params = get_class_init_params(analysis)
             logger.info(f"      - {cls_name}({init_params})")
         logger.info("  NUMBER OF FILTERED OUT ROWS: %d", len(data_df))
@@ -85,18 +235,30 @@ class BaseAnalysisService:
         """
         return data_df
 
-    def post_run_analysis(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
-        """Trigger for post-run analysis. data_df contains data of all tickers."""
-        for analysis in self.post_run_analysis_list:  # type: ignore
+    def post_run_analysis(
+        self: Self, data_df: pd.DataFrame, analyses: Optional[list] = None
+    ) -> pd.DataFrame:
+        """Trigger for post-run analysis. data_df contains data of all tickers.
+
+        Applies analyses (service's post_run_analysis_list by default).
+        """
+        if analyses is None:
+            analyses = self.post_run_analysis_list
+
+        for analysis in analyses:  # type: ignore
             data_df = analysis.apply(data_df)  # type: ignore
 
-        # set 'main_advice' column for backtesting
+        data_df = self.set_main_advice(data_df)
+
+        self._print_all_analysis_report(data_df, analyses)  # type: ignore
+        return data_df
+
+    def set_main_advice(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """Set 'main_advice' column used by backtesting and signal studies."""
         if self.backtest_main_advice_column:
             data_df["main_advice"] = data_df[self.backtest_main_advice_column]
         else:
             self._set_main_advice_column(data_df)
-
-        self._print_all_analysis_report(data_df)
         return data_df
 
     def output_data(
@@ -112,6 +274,9 @@ class BaseAnalysisService:
             output = CSVOutput()
             output.render(data_df, output_file)
         elif output_format == "plot":
+            # lightweight_charts (and Qt) are imported only for plots
+            from stock_market_analysis.src.output.plot_output import PlotOutput
+
             output = PlotOutput()
             output.render(data_df, output_file, self.columns_to_plot)
         else:
@@ -66,6 +66,7 @@ class BBAndRSIAndMAService(BaseAnalysisService):
         ),
     ]  # type: ignore
     columns_to_plot: ClassVar = [*technical_indicators, "Close"]  # type: ignore
+    main_advice_columns: ClassVar = ["bb_advice", "rsi_advice", "ma_trend_short"]  # type: ignore
 
     def _set_main_advice_column(self: Self, data: pd.DataFrame) -> pd.DataFrame:
         """Set main_advice data frame."""
@@ -61,6 +61,7 @@ class FourPSService(BaseAnalysisService):
         ),
     ]  # type: ignore
     columns_to_plot: ClassVar = [*technical_indicators, "Close"]  # type: ignore
+    main_advice_columns: ClassVar = ["4ps_advice"]  # type: ignore
 
     def _set_main_advice_column(self: Self, data: pd.DataFrame) -> pd.DataFrame:
         """Set main_advice data frame."""
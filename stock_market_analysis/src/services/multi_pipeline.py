@@ -0,0 +1,188 @@
+"""Single-pass run of several services sharing data and indicators of tickers.
+
+Every ticker is fetched once (with the longest warmup of the services) and the
+union of technical indicators of all services, including the ones their
+strategies use, is computed once. Strategies of every service are applied to
+its own copy of the data, so services writing the same columns (ex.
+'macd_advice') don't overwrite each other.
+"""
+
+import functools
+from typing import Optional, TypeVar
+
+import pandas as pd
+
+from stock_market_analysis.src.executor.scheduler import TaskFailure, TickerScheduler
+from stock_market_analysis.src.executor.transport import FrameTransport, concat_frames
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+
+
+Self = TypeVar("Self", bound="MultiServicePipeline")
+
+
+class MultiServicePipeline:
+    """Single run of pipelines of several services over the same tickers."""
+
+    def __init__(self: Self, pipelines: list[AnalysisPipeline]) -> None:
+        """Build run of the pipelines (one per service, with the same latest)."""
+        names = [pipeline.definition.name for pipeline in pipelines]
+        if len(set(names)) != len(names):
+            msg = f"Services of multi-service run must be unique: {', '.join(names)}"
+            raise ValueError(msg)
+        self.pipelines = pipelines
+        self.latest = pipelines[0].latest
+        # tickers failed by the last run (see get_failure_report())
+        self.failures: dict[str, TaskFailure] = {}
+        # the service fetching data has the longest warmup of all services
+        self.fetching_service = max(
+            (pipeline.service for pipeline in pipelines),
+            key=lambda service: service.get_warmup_bars(),
+        )
+
+    def get_indicators(self: Self) -> list[str]:
+        """Return union of technical indicators of all services and their strategies."""
+        indicators = [
+            indicator
+            for pipeline in self.pipelines
+            for indicator in (
+                *pipeline.service.technical_indicators,  # type: ignore
+                *(
+                    indicator
+                    for strategy in pipeline.service.pre_run_strategies  # type: ignore
+                    for indicator in strategy.indicators
+                ),
+            )
+        ]
+        return list(dict.fromkeys(indicators))
+
+    def fetch_ticker(
+        self: Self, ticker: str, period: str, stock_index: Optional[str]  # noqa: ARG002
+    ) -> pd.DataFrame:
+        """Fetch data of a single ticker once for all services."""
+        return self.fetching_service.fetch_data(ticker, period, self.latest)
+
+    def compute_ticker(
+        self: Self,
+        ticker: str,
+        period: str,
+        stock_index: Optional[str],
+        data_df: pd.DataFrame,
+    ) -> list[pd.DataFrame]:
+        """Analyze fetched data of a single ticker by every service (in order of pipelines).
+
+        With latest, services get warmup bars of the slowest service, so their
+        EMA-based indicators could differ slightly from their single runs.
+        """
+        if not data_df.empty:
+            data_df["Ticker"] = ticker
+            data_df = self.fetching_service.indicator_service.add_indicators(
+                data_df, self.get_indicators()
+            )
+        return [
+            pipeline.compute_ticker(ticker, period, stock_index, data_df.copy())
+            for pipeline in self.pipelines
+        ]
+
+    def run_tickers(  # noqa: PLR0913
+        self: Self,
+        tickers: list,
+        period: str,
+        stock_indexes: pd.Series,
+        scheduler: Optional[TickerScheduler] = None,
+        bar_counts: Optional[dict[str, int]] = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Analyze tickers in parallel and return results of every service before post-run.
+
+        See AnalysisPipeline.run_tickers() for arguments.
+
+        Returns
+        -------
+            dict[str, pd.DataFrame]: Results of all tickers per service name
+        """
+        if scheduler is None:
+            scheduler = TickerScheduler()
+        logger.info(
+            "Analyzing %d tickers by services in a single pass: %s",
+            len(tickers),
+            ", ".join(pipeline.definition.name for pipeline in self.pipelines),
+        )
+        # a ticker costs the sum of its costs of all services
+        costs = [
+            sum(ticker_costs)
+            for ticker_costs in zip(
+                *(
+                    pipeline.estimate_costs(tickers, period, bar_counts)
+                    for pipeline in self.pipelines
+                )
+            )
+        ]
+        with FrameTransport.open(scheduler.backend) as transport:
+            results = scheduler.run_staged(
+                self.fetch_ticker,
+                (
+                    functools.partial(transport.run, self.compute_ticker)
+                    if transport is not None
+                    else self.compute_ticker
+                ),
+                [(ticker, period, stock_indexes.get(ticker)) for ticker in tickers],
+                costs,
+            )
+            self.failures = {
+                ticker: result
+                for ticker, result in zip(tickers, results)
+                if isinstance(result, TaskFailure)
+            }
+            if self.failures:
+                logger.warning(
+                    "Analysis of %d tickers failed: %s",
+                    len(self.failures),
+                    ", ".join(self.failures),
+                )
+            if self.failures and len(self.failures) == len(tickers):
+                failure = next(iter(self.failures.values()))
+                msg = f"Analysis of all tickers failed, ex. {failure.error_type}: {failure.message}"
+                raise ValueError(msg)
+            succeeded_results = [
+                result for result in results if not isinstance(result, TaskFailure)
+            ]
+            # results of workers are passed through the transport if there's any
+            return {
+                pipeline.definition.name: concat_frames(
+                    [service_results[idx] for service_results in succeeded_results]
+                )
+                for idx, pipeline in enumerate(self.pipelines)
+            }
+
+    def get_failure_report(self: Self) -> pd.DataFrame:
+        """Return tickers failed by the last run with their errors."""
+        return pd.DataFrame(
+            [
+                {"Ticker": ticker, **failure.dict()}
+                for ticker, failure in self.failures.items()
+            ],
+            columns=["Ticker", "error_type", "message"],
+        )
+
+    def run(  # noqa: PLR0913
+        self: Self,
+        tickers: list,
+        period: str,
+        stock_indexes: pd.Series,
+        scheduler: Optional[TickerScheduler] = None,
+        bar_counts: Optional[dict[str, int]] = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Analyze tickers in parallel and return final results of every service.
+
+        See AnalysisPipeline.run_tickers() for arguments.
+
+        Returns
+        -------
+            dict[str, pd.DataFrame]: Results of all tickers with 'Date' column
+                per service name
+        """
+        results = self.run_tickers(tickers, period, stock_indexes, scheduler, bar_counts)
+        return {
+            pipeline.definition.name: pipeline.post_run(results[pipeline.definition.name])
+            for pipeline in self.pipelines
+        }
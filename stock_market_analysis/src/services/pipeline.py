@@ -0,0 +1,304 @@
+import functools
+from typing import Optional, Sequence, TypeVar
+
+import pandas as pd
+
+from stock_market_analysis.src.analysis.base_analysis import split_row_local_analyses
+from stock_market_analysis.src.analysis.filtering import FilterBy
+from stock_market_analysis.src.analysis.sorting import SortBy
+from stock_market_analysis.src.executor.checkpoint import CheckpointStore
+from stock_market_analysis.src.executor.result_cache import ResultCache
+from stock_market_analysis.src.executor.scheduler import (
+    TaskFailure,
+    TickerScheduler,
+    count_period_bars,
+)
+from stock_market_analysis.src.executor.transport import FrameTransport, concat_frames
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.services.registry import ServiceDefinition
+
+
+Self = TypeVar("Self", bound="AnalysisPipeline")
+
+
+class AnalysisPipeline:
+    """Single run of a service: its definition plus user's filters and sorting.
+
+    Every run builds its own pipeline and the definition is never changed, so the
+    same service can be reused by repeated or concurrent runs.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        definition: ServiceDefinition,
+        filters: Optional[dict] = None,
+        sort_columns: Optional[list] = None,
+        sort_orders: Optional[list] = None,
+        latest: Optional[int] = None,
+        checkpoint: Optional[CheckpointStore] = None,
+        resume: bool = False,
+        extra_columns: Optional[Sequence[str]] = (),
+        result_cache: Optional[ResultCache] = None,
+    ) -> None:
+        """Build pipeline of the service definition.
+
+        Args:
+        ----
+            definition (ServiceDefinition): Definition of the run service
+            filters (dict): User's filters of output rows (see FilterBy)
+            sort_columns (list): User's sorting columns of output rows
+            sort_orders (list): User's sorting orders (True = ascending)
+            latest (int): Optional number of latest rows per ticker (see run())
+            checkpoint (CheckpointStore): Checkpoints results of every ticker are
+                saved to (see CheckpointStore.for_run())
+            resume (bool): Load results of checkpointed tickers instead of
+                analyzing them again
+            extra_columns (Sequence[str]): Columns kept in results besides the
+                service's output columns (None keeps all columns, see
+                BaseAnalysisService.get_output_columns())
+            result_cache (ResultCache): Cache of results of the service per ticker,
+                reused by runs with the same service and data (ex. differing only
+                in filters or sorting)
+        """
+        self.definition = definition
+        self.service = definition.create_service()
+        self.latest = latest
+        self.checkpoint = checkpoint
+        self.resume = resume
+        self.result_cache = result_cache
+        # tickers failed by the last run (see get_failure_report())
+        self.failures: dict[str, TaskFailure] = {}
+        self.analyses = (
+            *definition.post_run_analyses,
+            FilterBy(filters=filters),
+            SortBy(columns=sort_columns or [], orders_asc=sort_orders or []),
+        )
+        # row-local analyses (filters) are applied per ticker (ex. in workers), so
+        # only remaining rows are concatenated
+        self.row_local_analyses, self.post_run_analyses = split_row_local_analyses(
+            list(self.analyses)
+        )
+        # intermediate columns of strategies are dropped by workers, so they aren't
+        # sent back and concatenated
+        self.output_columns = (
+            None
+            if extra_columns is None
+            else self.service.get_output_columns(list(self.analyses), extra_columns)
+        )
+
+    def run_ticker(
+        self: Self, ticker: str, period: str, stock_index: Optional[str]
+    ) -> pd.DataFrame:
+        """Analyze a single ticker and apply row-local analyses."""
+        return self.compute_ticker(
+            ticker, period, stock_index, self.fetch_ticker(ticker, period, stock_index)
+        )
+
+    def fetch_ticker(
+        self: Self, ticker: str, period: str, stock_index: Optional[str]  # noqa: ARG002
+    ) -> pd.DataFrame:
+        """Fetch data of a single ticker (the I/O-bound step of run_ticker())."""
+        return self.service.fetch_data(ticker, period, self.latest)
+
+    def compute_ticker(
+        self: Self,
+        ticker: str,
+        period: str,
+        stock_index: Optional[str],
+        data_df: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Analyze fetched data of a single ticker (the CPU-bound step of run_ticker())."""
+        cache_key, cached_df = None, None
+        if self.result_cache is not None and not data_df.empty:
+            # the key is taken before the service adds its columns to data_df
+            cache_key = self.result_cache.get_key(
+                self.definition.get_fingerprint(), ticker, stock_index, self.latest, data_df
+            )
+            cached_df = self.result_cache.load(cache_key)
+        if cached_df is not None:
+            data_df = cached_df
+        else:
+            data_df = self.service.run_with_analyses(
+                ticker, period, stock_index, [], self.latest, data_df
+            )
+            if cache_key is not None:
+                self.result_cache.save(cache_key, data_df)  # type: ignore
+        if self.checkpoint is not None and not data_df.empty:
+            # unfiltered results, so resumed runs can use any filters (tickers
+            # without data aren't checkpointed, so resumed runs try them again)
+            self.checkpoint.save(ticker, data_df)
+        return self.filter_rows(data_df)
+
+    def filter_rows(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """Apply row-local analyses to (not filtered) results of a single ticker.
+
+        Only output columns of the pipeline are kept.
+        """
+        if data_df.empty:
+            return data_df
+        for analysis in self.row_local_analyses:
+            data_df = analysis.apply(data_df)
+        if self.output_columns is not None:
+            data_df = data_df[data_df.columns[data_df.columns.isin(self.output_columns)]]
+        return data_df
+
+    def post_run(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """Apply remaining analyses to results of all tickers."""
+        logger.info("Triggering post-run service: %s", self.definition.name)
+        return self.service.finalize_results(
+            self.service.post_run_analysis(data_df, self.post_run_analyses)
+        )
+
+    def estimate_costs(
+        self: Self,
+        tickers: list,
+        period: str,
+        bar_counts: Optional[dict[str, int]] = None,
+    ) -> list[float]:
+        """Estimate cost of every ticker as its number of bars x service complexity.
+
+        Bars of the period (or warmup + latest bars) are used for tickers without
+        known bar_counts (ex. observed in previous runs).
+        """
+        bars = (
+            self.service.get_warmup_bars() + self.latest
+            if self.latest
+            else count_period_bars(period)
+        )
+        bar_counts = bar_counts or {}
+        complexity = self.service.get_complexity()
+        return [min(bar_counts.get(ticker, bars), bars) * complexity for ticker in tickers]
+
+    def run_tickers(  # noqa: PLR0913
+        self: Self,
+        tickers: list,
+        period: str,
+        stock_indexes: pd.Series,
+        scheduler: Optional[TickerScheduler] = None,
+        bar_counts: Optional[dict[str, int]] = None,
+    ) -> pd.DataFrame:
+        """Analyze tickers in parallel and return their results before post-run analyses.
+
+        Args:
+        ----
+            tickers (list): Analyzed stock ticker symbols
+            period (str): Data period (e.g., '1y', '2023-01-01:2024-01-01')
+            stock_indexes (pd.Series): Stock_Index of tickers (indexed by ticker)
+            scheduler (TickerScheduler): Scheduler of tickers (all CPUs by default),
+                PipelinedScheduler overlaps fetching with computing
+            bar_counts (dict): Known number of bars per ticker (see estimate_costs())
+
+        Returns:
+        -------
+            pd.DataFrame: Results of all tickers filtered by row-local analyses
+        """
+        if scheduler is None:
+            scheduler = TickerScheduler()
+        logger.info(
+            "Post-run analyses applied by workers: %s",
+            ", ".join(analysis.__class__.__name__ for analysis in self.row_local_analyses),
+        )
+        resumed_results = {}
+        if self.checkpoint is not None and self.resume:
+            resumed_results = {
+                ticker: self.filter_rows(self.checkpoint.load(ticker))
+                for ticker in tickers
+                if self.checkpoint.has(ticker)
+            }
+            logger.info(
+                "Resuming run from checkpoints of %d tickers: %s",
+                len(resumed_results),
+                self.checkpoint.run_dir,
+            )
+
+        with FrameTransport.open(scheduler.backend) as transport:
+            return self._run_missing_tickers(
+                tickers,
+                period,
+                stock_indexes,
+                scheduler,
+                bar_counts,
+                resumed_results,
+                transport,
+            )
+
+    def _run_missing_tickers(  # noqa: PLR0913
+        self: Self,
+        tickers: list,
+        period: str,
+        stock_indexes: pd.Series,
+        scheduler: TickerScheduler,
+        bar_counts: Optional[dict[str, int]],
+        resumed_results: dict[str, pd.DataFrame],
+        transport: Optional[FrameTransport],
+    ) -> pd.DataFrame:
+        """Analyze tickers without resumed results and concatenate results of all tickers.
+
+        Results of workers are passed through the transport (see FrameTransport)
+        if there's any.
+        """
+        missing_tickers = [ticker for ticker in tickers if ticker not in resumed_results]
+        results = scheduler.run_staged(
+            self.fetch_ticker,
+            (
+                functools.partial(transport.run, self.compute_ticker)
+                if transport is not None
+                else self.compute_ticker
+            ),
+            [(ticker, period, stock_indexes.get(ticker)) for ticker in missing_tickers],
+            self.estimate_costs(missing_tickers, period, bar_counts),
+        )
+        results_by_ticker = {**resumed_results, **dict(zip(missing_tickers, results))}
+        self.failures = {
+            ticker: result
+            for ticker, result in results_by_ticker.items()
+            if isinstance(result, TaskFailure)
+        }
+        if self.failures:
+            logger.warning(
+                "Analysis of %d tickers failed: %s",
+                len(self.failures),
+                ", ".join(self.failures),
+            )
+        if self.failures and len(self.failures) == len(results_by_ticker):
+            failure = next(iter(self.failures.values()))
+            msg = f"Analysis of all tickers failed, ex. {failure.error_type}: {failure.message}"
+            raise ValueError(msg)
+        logger.info("Contactenating results of the service: %s", self.definition.name)
+        return concat_frames(
+            [results_by_ticker[ticker] for ticker in tickers if ticker not in self.failures]
+        )
+
+    def get_failure_report(self: Self) -> pd.DataFrame:
+        """Return tickers failed by the last run with their errors."""
+        return pd.DataFrame(
+            [
+                {"Ticker": ticker, **failure.dict()}
+                for ticker, failure in self.failures.items()
+            ],
+            columns=["Ticker", "error_type", "message"],
+        )
+
+    def run(  # noqa: PLR0913
+        self: Self,
+        tickers: list,
+        period: str,
+        stock_indexes: pd.Series,
+        scheduler: Optional[TickerScheduler] = None,
+        bar_counts: Optional[dict[str, int]] = None,
+    ) -> pd.DataFrame:
+        """Analyze tickers in parallel and return results of all of them.
+
+        See run_tickers() for arguments.
+
+        Returns
+        -------
+            pd.DataFrame: Results of all tickers with 'Date' column
+        """
+        return self.post_run(
+            self.run_tickers(tickers, period, stock_indexes, scheduler, bar_counts)
+        )
+
+    def merge(self: Self, data_df: pd.DataFrame) -> pd.DataFrame:
+        """Return final results of combined run_tickers() results (ex. of shards)."""
+        return self.post_run(self.filter_rows(data_df))
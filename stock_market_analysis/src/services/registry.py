@@ -0,0 +1,173 @@
+"""Registry of analysis services and their immutable definitions.
+
+Services are registered by name as 'module:Class' import paths and imported
+only when used. Besides built-in services, plugins can register services by
+entry points of 'stock_market_analysis.services' group ex. in pyproject.toml:
+
+    [tool.poetry.plugins."stock_market_analysis.services"]
+    MyService = "my_package.my_service:MyService"
+"""
+
+import importlib
+from hashlib import sha256
+from importlib.metadata import entry_points
+from typing import Optional, TypeVar
+
+from pydantic import BaseModel
+
+from stock_market_analysis.src.logger import logger
+from stock_market_analysis.src.services.base_service import BaseAnalysisService
+from stock_market_analysis.src.utils.utils import get_class_init_params
+
+
+Self = TypeVar("Self", bound="ServiceRegistry")
+
+SERVICES_ENTRY_POINT_GROUP = "stock_market_analysis.services"
+
+BUILTIN_SERVICES = {
+    "RSIBase": "stock_market_analysis.src.services.rsi_service:RSIBaseService",
+    "MACDBase": "stock_market_analysis.src.services.macd_service:MACDBaseService",
+    "MACD3DaysRSI": "stock_market_analysis.src.services.macd_rsi_service:MACD3DaysRSIService",
+    "BBBase": "stock_market_analysis.src.services.bb_service:BBBaseService",
+    "BBAndRSI": "stock_market_analysis.src.services.bb_rsi_service:BBAndRSIAndMAService",
+    "TrendBased": "stock_market_analysis.src.services.trend_based_service:TrendBasedService",
+    "FourPS": "stock_market_analysis.src.services.four_ps_service:FourPSService",
+    "SupportResistance": (
+        "stock_market_analysis.src.services.sup_res_service:SupportResistanceService"
+    ),
+    "TenDays": "stock_market_analysis.src.services.ten_days_service:TenDaysLowsHighsService",
+}
+
+
+class ServiceDefinition(BaseModel):
+    """Immutable snapshot of service class config, shared by all its runs."""
+
+    class Config:  # noqa: D106
+        arbitrary_types_allowed = True
+        frozen = True
+
+    name: str
+    service_cls: type[BaseAnalysisService]
+    technical_indicators: tuple[str, ...]
+    pre_run_strategies: tuple
+    post_run_analyses: tuple
+    backtest_main_advice_column: Optional[str] = None
+
+    @classmethod
+    def from_service_cls(
+        cls: type["ServiceDefinition"],
+        name: str,
+        service_cls: type[BaseAnalysisService],
+    ) -> "ServiceDefinition":
+        """Create definition of service class (its lists are copied into tuples)."""
+        return cls(
+            name=name,
+            service_cls=service_cls,
+            technical_indicators=tuple(service_cls.technical_indicators),
+            pre_run_strategies=tuple(service_cls.pre_run_strategies),
+            post_run_analyses=tuple(service_cls.post_run_analysis_list),
+            backtest_main_advice_column=service_cls.backtest_main_advice_column,
+        )
+
+    def create_service(self: "ServiceDefinition") -> BaseAnalysisService:
+        """Return new service object configured by the definition.
+
+        Its lists are copies of the definition's tuples, so changes of the service
+        object don't leak into the definition (or its class).
+        """
+        service = self.service_cls()
+        # instance attributes shadow the class-level config of the service
+        vars(service).update(
+            technical_indicators=list(self.technical_indicators),
+            pre_run_strategies=list(self.pre_run_strategies),
+            post_run_analysis_list=list(self.post_run_analyses),
+            backtest_main_advice_column=self.backtest_main_advice_column,
+        )
+        return service
+
+    def get_fingerprint(self: "ServiceDefinition") -> str:
+        """Return hash of the config per-ticker results depend on.
+
+        It's the service class, its indicators and strategies with their params,
+        so results of changed services aren't mixed with the old ones.
+        """
+        config = (
+            f"{self.service_cls.__module__}:{self.service_cls.__qualname__}",
+            self.technical_indicators,
+            [get_class_init_params(strategy) for strategy in self.pre_run_strategies],
+        )
+        return sha256(repr(config).encode()).hexdigest()
+
+
+class ServiceRegistry:
+    """Lazily imported services by their names (ex. CLI '--service' values)."""
+
+    def __init__(
+        self: Self,
+        services: Optional[dict[str, str]] = None,
+        entry_point_group: Optional[str] = SERVICES_ENTRY_POINT_GROUP,
+    ) -> None:
+        """Config of ServiceRegistry.
+
+        Args:
+        ----
+            services (dict): 'module:Class' import paths by service names
+                (built-in services by default)
+            entry_point_group (str): Entry points group of plugin services (None
+                disables discovery)
+        """
+        self.service_paths = dict(BUILTIN_SERVICES if services is None else services)
+        self.entry_point_group = entry_point_group
+        self.definitions: dict[str, ServiceDefinition] = {}
+        self.is_discovered = entry_point_group is None
+
+    def _discover(self: Self) -> None:
+        """Register services of installed plugins (once)."""
+        if self.is_discovered:
+            return
+        self.is_discovered = True
+        if self.entry_point_group is None:
+            return
+        for entry_point in entry_points(group=self.entry_point_group):
+            logger.info("Discovered plugin service: %s", entry_point.name)
+            self.service_paths.setdefault(entry_point.name, entry_point.value)
+
+    def register(self: Self, name: str, service: str | type) -> None:
+        """Register service given by 'module:Class' import path or class."""
+        self.definitions.pop(name, None)
+        if isinstance(service, str):
+            self.service_paths[name] = service
+        else:
+            self.service_paths[name] = f"{service.__module__}:{service.__qualname__}"
+            self.definitions[name] = ServiceDefinition.from_service_cls(name, service)
+
+    def get_names(self: Self) -> list[str]:
+        """Return names of all registered services."""
+        self._discover()
+        return list(self.service_paths)
+
+    def get_definition(self: Self, name: str) -> ServiceDefinition:
+        """Return (imported on first use) definition of the service."""
+        if name not in self.definitions:
+            self._discover()
+            if name not in self.service_paths:
+                msg = f"Unsupported service: {name}"
+                raise ValueError(msg)
+            module_name, class_name = self.service_paths[name].split(":")
+            service_cls = getattr(importlib.import_module(module_name), class_name)
+            self.definitions[name] = ServiceDefinition.from_service_cls(
+                name, service_cls
+            )
+        return self.definitions[name]
+
+    def get_service(self: Self, name: str) -> BaseAnalysisService:
+        """Return new service object of the service."""
+        return self.get_definition(name).create_service()
+
+
+service_registry = ServiceRegistry()
+
+
+def get_service(service: Optional[str]) -> BaseAnalysisService:
+    """Return service object based on its CLI name."""
+    return service_registry.get_service(service)  # type: ignore
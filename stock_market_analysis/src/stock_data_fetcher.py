@@ -1,6 +1,5 @@
 """Fetching data from yahoo finance."""
 
-import math
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import List, Optional
@@ -13,6 +12,12 @@ from joblib import Parallel, delayed
 from pydantic import NonNegativeInt, constr
 from yfinance import Ticker
 
+from stock_market_analysis.src.analysis.signal_study import (
+    UNIVERSE_TICKER,
+    SignalStudy,
+)
+from stock_market_analysis.src.backtest.long_only_kernel import long_only_backtest
+from stock_market_analysis.src.executor.config import get_executor_config
 from stock_market_analysis.src.logger import logger
 from stock_market_analysis.src.utils.utils import cache_to_pickle, yf_download
 
@@ -285,7 +290,6 @@ def fetch_momentum_analysis_single(
     recent_rsi = None
     if len(rsi_df) > 1:
         recent_rsi = rsi_df.iloc[-1]
-        print(recent_rsi)
 
     # Calculate short-term and long-term Moving Averages
     stock_data["MA_10"] = stock_data["Adj Close"].rolling(window=10).mean()
@@ -312,17 +316,18 @@ def fetch_momentum_analysis_single(
     )
 
     # Historical analysis: Check how often a momentum signal led to 5% gain in next 10 days
-    win_count = 0
-    signal_count = 0
-
-    for i in range(len(stock_data) - lookback_days):
-        if stock_data["Momentum Signal"].iloc[i] == 1:
-            signal_count += 1
-            future_price = stock_data["Adj Close"].iloc[i + lookback_days]
-            current_price = stock_data["Adj Close"].iloc[i]
-            price_change = ((future_price - current_price) / current_price) * 100
-            if price_change >= lookup_yield:
-                win_count += 1
+    stock_data["Ticker"] = ticker
+    study = SignalStudy(
+        signal_column="Momentum Signal",
+        signal_values=[1],
+        horizons=[lookback_days],
+        thresholds=[lookup_yield],
+        price_column="Adj Close",
+    ).apply(stock_data)
+    # single ticker is studied, so its stats are the universe ones
+    ticker_study = study[study["Ticker"] == UNIVERSE_TICKER].iloc[0]
+    signal_count = int(ticker_study["signals"])
+    win_count = int(ticker_study[f"hits_{lookup_yield:g}"])
 
     # Calculate probability of gaining 5% in the next 10 days after a momentum signal
     probability = win_count / signal_count * 100 if signal_count > 0 else 0
@@ -374,7 +379,7 @@ def fetch_momentum_analysis(
         return fetch_momentum_analysis_single(ticker, lookback_days, lookup_yield)
 
     # Use joblib to run fetching in parallel
-    results = Parallel(n_jobs=-1)(
+    results = get_executor_config().get_parallel()(
         delayed(fetch_momentum_for_ticker)(ticker) for ticker in tickers
     )
 
@@ -453,7 +458,12 @@ def fetch_chart_trend(ticker: str, days: int = 90, window: int = 30):
     )
 
 
-def fetch_chart_trends(tickers: list[str], days: int = 90, window: int = 30):
+def fetch_chart_trends(
+    tickers: list[str],
+    days: int = 90,
+    window: int = 30,
+    parallel: Optional[Parallel] = None,
+):
     """Fetch stock price trends for a list of tickers.
 
     and returns a DataFrame sorted by trend direction and duration.
@@ -463,6 +473,8 @@ def fetch_chart_trends(tickers: list[str], days: int = 90, window: int = 30):
         tickers (list of str): List of ticker symbols.
         days (int): Number of days to consider for the trend analysis.
         window (int): The window size for calculating the moving average.
+        parallel (Parallel): Pool of workers shared with other stages (a new one
+            of the active ExecutorConfig by default)
 
     Returns:
     -------
@@ -473,9 +485,9 @@ def fetch_chart_trends(tickers: list[str], days: int = 90, window: int = 30):
         return fetch_chart_trend(ticker, days, window)
 
     # Use joblib to run fetching in parallel
-    results = Parallel(n_jobs=-1)(
-        delayed(fetch_trend_for_ticker)(ticker) for ticker in tickers
-    )
+    if parallel is None:
+        parallel = get_executor_config().get_parallel()
+    results = parallel(delayed(fetch_trend_for_ticker)(ticker) for ticker in tickers)
 
     # Combine all individual DataFrame results into one DataFrame
     if not results:
@@ -533,7 +545,10 @@ def fetch_volume_analysis_data(
 
 
 def fetch_volume_analysis_data_multiple_tickers(
-    tickers: List[constr(min_length=1)], days: NonNegativeInt, n_jobs: int = -1  # type: ignore
+    tickers: List[constr(min_length=1)],  # type: ignore
+    days: NonNegativeInt,
+    n_jobs: Optional[int] = None,
+    parallel: Optional[Parallel] = None,
 ) -> pd.DataFrame:
     """Perform volume analysis on multiple stock tickers in parallel.
 
@@ -541,13 +556,18 @@ def fetch_volume_analysis_data_multiple_tickers(
     ----
         tickers (List[str]): List of stock ticker symbols.
         days (NonNegativeInt): Number of recent days to analyze for each ticker.
-        n_jobs (int): Number of jobs to run in parallel. Default is -1 (use all processors).
+        n_jobs (int): Number of jobs to run in parallel. Default is the active
+            ExecutorConfig's workers (all processors by default).
+        parallel (Parallel): Pool of workers shared with other stages (overrides
+            n_jobs)
 
     Returns:
     -------
         pd.DataFrame: DataFrame containing the analysis results for all tickers.
     """
-    results = Parallel(n_jobs=n_jobs)(
+    if parallel is None:
+        parallel = get_executor_config().get_parallel(n_jobs)
+    results = parallel(
         delayed(fetch_volume_analysis_data)(ticker, days) for ticker in tickers
     )
     result_df = pd.concat(results, ignore_index=True)
@@ -562,130 +582,99 @@ def fetch_volume_analysis_data_multiple_tickers(
 
 
 @cache_to_pickle(Path("/tmp/cache/macd"))  # noqa: S108
-def fetch_macd_3_day_rule_backtesting_single(
-    ticker: constr(min_length=1), period: str = "1y", amount: int = 5000  # type: ignore
+def fetch_macd_3_day_rule_signals(
+    ticker: constr(min_length=1), period: str = "1y"  # type: ignore
 ) -> pd.DataFrame:
-    """Backtesting of MACD-based rule with 3 days of buy."""
+    """Return 'Close' and 'Raw_Signal' (1 = buy, -1 = sell) of MACD 3 days rule."""
     # Download data
     data = yf_download(ticker, period=period, progress=False)
     # Calculate MACD
     macd = ta.trend.MACD(close=data["Close"])
-    data["MACD"] = macd.macd()
-    data["Signal"] = macd.macd_signal()
-    data["Histogram"] = macd.macd_diff()
-
-    # Generate signals
-    data["Ticker"] = ticker
-    data["Raw_Signal"] = 0
+    histogram = macd.macd_diff()
 
     # Buy signal: 3 consecutive days of negative but growing histogram values
     buy_condition = (
-        (data["Histogram"] < 0)
-        & (data["Histogram"] > data["Histogram"].shift(1))
-        & (data["Histogram"].shift(1) < 0)
-        & (data["Histogram"].shift(1) > data["Histogram"].shift(2))
-        & (data["Histogram"].shift(2) < 0)
-        & (data["Histogram"].shift(2) > data["Histogram"].shift(3))
+        (histogram < 0)
+        & (histogram > histogram.shift(1))
+        & (histogram.shift(1) < 0)
+        & (histogram.shift(1) > histogram.shift(2))
+        & (histogram.shift(2) < 0)
+        & (histogram.shift(2) > histogram.shift(3))
     )
 
     # Sell signal: 3 consecutive days of declining histogram values (regardless of sign)
     sell_condition = (
-        (data["Histogram"] < data["Histogram"].shift(1))
-        & (data["Histogram"].shift(1) < data["Histogram"].shift(2))
-        & (data["Histogram"].shift(2) < data["Histogram"].shift(3))
+        (histogram < histogram.shift(1))
+        & (histogram.shift(1) < histogram.shift(2))
+        & (histogram.shift(2) < histogram.shift(3))
     )
 
-    data.loc[buy_condition, "Raw_Signal"] = 1
-    data.loc[sell_condition, "Raw_Signal"] = -1
-
-    # Process signals to ensure correct order
-    data["Trade_Signal"] = 0
-    data["Transaction"] = ""
-    data["Shares"] = 0
-    data["Transaction_Price"] = 0
-    data["Transaction_Value"] = 0
-
-    in_position = False
-    shares = 0
-    cash = amount
-
-    for i in range(len(data)):
-        if not in_position and data["Raw_Signal"].iloc[i] == 1 and cash > 0:
-            data.loc[data.index[i], "Trade_Signal"] = 1
-            shares = math.floor(cash / data["Close"].iloc[i])
-            actual_investment = shares * data["Close"].iloc[i]
-            data.loc[data.index[i], "Transaction"] = "Buy"
-            data.loc[data.index[i], "Shares"] = shares
-            data.loc[data.index[i], "Transaction_Price"] = data["Close"].iloc[i]
-            data.loc[data.index[i], "Transaction_Value"] = actual_investment
-            cash -= actual_investment
-            in_position = True
-        elif in_position and data["Raw_Signal"].iloc[i] == -1:
-            data.loc[data.index[i], "Trade_Signal"] = -1
-            data.loc[data.index[i], "Transaction"] = "Sell"
-            data.loc[data.index[i], "Shares"] = shares
-            data.loc[data.index[i], "Transaction_Price"] = data["Close"].iloc[i]
-            sell_value = shares * data["Close"].iloc[i]
-            data.loc[data.index[i], "Transaction_Value"] = sell_value
-            cash += sell_value
-            shares = 0
-            in_position = False
-
-    # Print transactions
-    transaction_data = data[data["Transaction"] != ""]
-    print("\nTransactions:")
-    print(
-        transaction_data[
-            [
-                "Ticker",
-                "Transaction",
-                "Transaction_Price",
-                "Shares",
-                "Transaction_Value",
-            ]
-        ]
-    )
+    signals = pd.DataFrame({"Close": data["Close"], "Raw_Signal": 0})
+    signals.loc[buy_condition, "Raw_Signal"] = 1
+    signals.loc[sell_condition, "Raw_Signal"] = -1
+    return signals
 
-    # Calculate final value and return
-    final_value = cash
-    if in_position:
-        final_value += shares * data["Close"].iloc[-1]
 
-    cumulative_return = (final_value - amount) / amount
+def _macd_3_day_rule_results(
+    tickers: List[str], signals: List[pd.DataFrame], amount: int
+) -> pd.DataFrame:
+    """Backtest signals of all tickers at once as a (tickers x dates) panel."""
+    close = pd.concat([s["Close"] for s in signals], axis=1, keys=range(len(tickers)))
+    raw_signal = pd.concat(
+        [s["Raw_Signal"] for s in signals], axis=1, keys=range(len(tickers))
+    ).fillna(0)
+    trades_df, final_value = long_only_backtest(
+        close.T.to_numpy(),
+        raw_signal.T.to_numpy() == 1,
+        raw_signal.T.to_numpy() == -1,
+        amount,
+    )
+    logger.debug("MACD 3 days rule trades:\n%s", trades_df)
 
-    # Create result dataframe
     return pd.DataFrame(
         {
-            "ticker": [ticker],
-            "Cumulative Amount": [final_value],
-            "Cumulative Yield (%)": [cumulative_return * 100],
+            "ticker": tickers,
+            "Cumulative Amount": final_value,
+            "Cumulative Yield (%)": (final_value - amount) / amount * 100,
         }
     )
 
 
+@cache_to_pickle(Path("/tmp/cache/macd"))  # noqa: S108
+def fetch_macd_3_day_rule_backtesting_single(
+    ticker: constr(min_length=1), period: str = "1y", amount: int = 5000  # type: ignore
+) -> pd.DataFrame:
+    """Backtesting of MACD-based rule with 3 days of buy."""
+    signals = fetch_macd_3_day_rule_signals(ticker, period)
+    return _macd_3_day_rule_results([ticker], [signals], amount)
+
+
 def fetch_macd_3_day_rule_backtesting(
     tickers: List[constr(min_length=1)],  # type: ignore
     period: str = "1y",
     amount: int = 5000,
-    n_jobs: int = -1,
+    n_jobs: Optional[int] = None,
 ) -> pd.DataFrame:
-    """Perform volume analysis on multiple stock tickers in parallel.
+    """Backtest MACD 3 days rule on multiple stock tickers.
+
+    Signals are fetched in parallel, then all tickers are backtested at once.
 
     Args:
     ----
         tickers (List[str]): List of stock ticker symbols.
-        days (NonNegativeInt): Number of recent days to analyze for each ticker.
-        n_jobs (int): Number of jobs to run in parallel. Default is -1 (use all processors).
+        period (str): Pandas' based period of downloading data.
+        amount (int): Amount invested in every ticker.
+        n_jobs (int): Number of jobs to run in parallel. Default is the active
+            ExecutorConfig's workers (all processors by default).
 
     Returns:
     -------
         pd.DataFrame: DataFrame containing the analysis results for all tickers.
     """
-    results = Parallel(n_jobs=n_jobs)(
-        delayed(fetch_macd_3_day_rule_backtesting_single)(ticker, period, amount)
-        for ticker in tickers
+    signals = get_executor_config().get_parallel(n_jobs)(
+        delayed(fetch_macd_3_day_rule_signals)(ticker, period) for ticker in tickers
     )
-    result_df = pd.concat(results, ignore_index=True)
+    result_df = _macd_3_day_rule_results(tickers, signals, amount)
 
     result_df = result_df.sort_values(
         by=["Cumulative Amount"],
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar
+from typing import Any, ClassVar, TypeVar
 
 import pandas as pd
 
@@ -10,10 +10,31 @@ Self = TypeVar("Self", bound="BaseStrategy")
 class BaseStrategy(ABC):
     """Base class for strategies, allowing plug-in of different indicators."""
 
+    # bars needed (including indicators computed by the strategy itself) before
+    # the strategy gives valid advice, could be overwritten in concrete classes
+    warmup_bars: ClassVar[int] = 0
+    # relative cost of applying the strategy to a bar (vectorized pandas = 1), used
+    # to schedule expensive tickers first, could be overwritten in concrete classes
+    complexity: ClassVar[float] = 1.0
+    # result columns kept in outputs of services (intermediate columns are dropped
+    # by workers, see BaseAnalysisService.get_output_columns())
+    output_columns: ClassVar[tuple[str, ...]] = ()
+    # technical indicators used by the strategy (see ensure_indicator()), they're
+    # computed once for all services of multi-service runs
+    indicators: ClassVar[tuple[str, ...]] = ()
+
     def __init__(self: Self, **kwargs: dict) -> None:
         """Configure strategy."""
-        self.kwargs = kwargs
+        self.kwargs: dict[str, Any] = kwargs
 
     @abstractmethod
     def apply(self: Self, data: pd.DataFrame):
         """Apply strategy to the stock data."""
+
+    def get_warmup_bars(self: Self) -> int:
+        """Return number of bars needed before the strategy gives valid advice."""
+        return self.warmup_bars
+
+    def get_output_columns(self: Self) -> tuple[str, ...]:
+        """Return result columns of the strategy kept in outputs."""
+        return self.output_columns
@@ -1,22 +1,27 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
-from stock_market_analysis.src.indicators.technical_indicators import bb_lower, bb_upper
+from stock_market_analysis.src.indicators.technical_indicators import ensure_indicator
 from stock_market_analysis.src.logger import logger
 from stock_market_analysis.src.strategies.base import BaseStrategy
 
 
-Self = TypeVar("Self", bound="BBOverupperUnderlowerStrategy")
+Self = TypeVar("Self", bound="BBOverupperUnderlowerStrategyBase")
 
 
 class BBOverupperUnderlowerStrategyBase(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    warmup_bars: ClassVar[int] = 20
+    complexity: ClassVar[float] = 5.0  # row by row apply() of bb_diff_percent
+    output_columns: ClassVar[tuple[str, ...]] = ("bb_advice",)
+    indicators: ClassVar[tuple[str, ...]] = ("bb_lower", "bb_upper")
+
     def apply(self: Self, data: pd.DataFrame):
         """Apply strategy to data."""
-        data["bb_lower"] = bb_lower(data)
-        data["bb_upper"] = bb_upper(data)
+        ensure_indicator(data, "bb_lower")
+        ensure_indicator(data, "bb_upper")
 
         # Create bb_meaning column
         data["bb_meaning"] = "within_bb"
@@ -65,6 +70,13 @@ class BBOverupperUnderlowerNDaysAgoStrategy(BBOverupperUnderlowerStrategyBase):
     - 'sell' signal => when BB was higher than bb_upper N days ago, but is lower later.
     """
 
+    def get_warmup_bars(self: Self) -> int:
+        """Return Bollinger Bands window plus the longest of days_ago."""
+        return self.warmup_bars + max(
+            self.kwargs.get("days_ago_under") or 0,
+            self.kwargs.get("days_ago_over") or 0,
+        )
+
     def apply(self: Self, data: pd.DataFrame):
         """Assign 'buy', 'sell', or 'neutral' to 'bb_advice' column.
 
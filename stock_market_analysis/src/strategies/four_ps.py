@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
@@ -15,6 +15,9 @@ class Phases4PSDetectionStrategy(BaseStrategy):
     - 'sell' signal => when stock is 15 months after buy date
     """
 
+    complexity: ClassVar[float] = 20.0  # iterrows() over bars
+    output_columns: ClassVar[tuple[str, ...]] = ("4ps_phase", "4ps_advice")
+
     def _classify_phase(
         self: Self, row: pd.Series, prev_phase: str, prev_high: float, prev_low: float
     ) -> str:
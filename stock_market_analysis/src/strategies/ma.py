@@ -1,8 +1,9 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
 from stock_market_analysis.src.indicators.technical_indicators import (
+    ensure_indicator,
     moving_average,
 )
 from stock_market_analysis.src.strategies.base import BaseStrategy
@@ -14,6 +15,14 @@ Self = TypeVar("Self", bound="MovingAverageTrandDirectionStrategy")
 class MovingAverageTrandDirectionStrategy(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    def get_warmup_bars(self: Self) -> int:
+        """Return window of the long moving average of selected term."""
+        return 200 if self.kwargs.get("term") == "long" else 50
+
+    def get_output_columns(self: Self) -> tuple[str, ...]:
+        """Return trend column of selected term."""
+        return (f"ma_trend_{self.kwargs.get('term') or 'short'}",)
+
     def apply(self: Self, data: pd.DataFrame):
         """Apply strategy to data."""
         super().apply(data)
@@ -46,6 +55,10 @@ class MovingAverageTrandDirectionStrategy(BaseStrategy):
 class MovingAverageGetTrandDirectionStrategy(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    warmup_bars: ClassVar[int] = 200
+    complexity: ClassVar[float] = 3.0  # row by row apply()
+    output_columns: ClassVar[tuple[str, ...]] = ("trend",)
+
     def apply(self: Self, data: pd.DataFrame):
         """Apply strategy to data."""
         super().apply(data)
@@ -69,6 +82,10 @@ class MovingAverageGetTrandDirectionStrategy(BaseStrategy):
 class MovingAverageTrendBasedStrategy(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    warmup_bars: ClassVar[int] = 50
+    complexity: ClassVar[float] = 3.0  # row by row apply()
+    output_columns: ClassVar[tuple[str, ...]] = ("ma_short_advice",)
+
     def _get_ma_short_advice(self: Self, row: pd.Series) -> str:
         """Generate short-term moving average advice based on trend."""
         ma_diff = row["ma_short"] - row["ma_medium"]
@@ -96,6 +113,11 @@ class MovingAverageTrendBasedStrategy(BaseStrategy):
 class MovingAverageMomentumMACDTrandDirectionStrategy(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    warmup_bars: ClassVar[int] = 50 + 1
+    complexity: ClassVar[float] = 3.0  # row by row apply()
+    output_columns: ClassVar[tuple[str, ...]] = ("trend",)
+    indicators: ClassVar[tuple[str, ...]] = ("ma_20", "ma_50", "ma_20_slope", "ma_50_slope")
+
     def apply(self: Self, data: pd.DataFrame):
         """Determine the trend ('uptrend', 'downtrend', 'sideways') for each row.
 
@@ -132,10 +154,8 @@ class MovingAverageMomentumMACDTrandDirectionStrategy(BaseStrategy):
                 return "sideways"
 
         # Calculate moving averages
-        data["ma_20"] = data["Close"].rolling(window=20).mean()
-        data["ma_50"] = data["Close"].rolling(window=50).mean()
-        data["ma_20_slope"] = data["ma_20"].diff()
-        data["ma_50_slope"] = data["ma_50"].diff()
+        for indicator in self.indicators:
+            ensure_indicator(data, indicator)
 
         # Calculate price momentum (percentage change over 5 days)
         data["price_momentum"] = data["Close"].pct_change(periods=5)
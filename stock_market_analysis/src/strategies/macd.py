@@ -1,12 +1,8 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
-from stock_market_analysis.src.indicators.technical_indicators import (
-    macd,
-    macd_hist,
-    macd_signal,
-)
+from stock_market_analysis.src.indicators.technical_indicators import ensure_indicator
 from stock_market_analysis.src.strategies.base import BaseStrategy
 
 
@@ -40,11 +36,15 @@ def find_and_apply_macd_days_signal(data: pd.DataFrame):
 class MACDDay3BuyDay3SellStrategy(BaseStrategy):
     """Strategy based on RSI Indicator."""
 
+    # MACD histogram and its diffs of 3 consecutive days
+    warmup_bars: ClassVar[int] = 26 + 9 + 3
+    output_columns: ClassVar[tuple[str, ...]] = ("macd_advice",)
+    indicators: ClassVar[tuple[str, ...]] = ("macd", "macd_signal", "macd_hist")
+
     def apply(self: Self, data: pd.DataFrame):
         """Apply RSI strategy to data."""
-        data["macd"] = macd(data)
-        data["macd_signal"] = macd_signal(data)
-        data["macd_hist"] = macd_hist(data)
+        for indicator in self.indicators:
+            ensure_indicator(data, indicator)
 
         find_and_apply_macd_days_signal(data)
 
@@ -52,6 +52,11 @@ class MACDDay3BuyDay3SellStrategy(BaseStrategy):
 class MACDTrendBasedAdviceStrategy(BaseStrategy):
     """Strategy based on RSI Indicator."""
 
+    warmup_bars: ClassVar[int] = 26 + 9
+    complexity: ClassVar[float] = 3.0  # row by row apply()
+    output_columns: ClassVar[tuple[str, ...]] = ("macd_advice",)
+    indicators: ClassVar[tuple[str, ...]] = ("macd", "macd_signal")
+
     def _get_macd_advice(self: Self, row: pd.Series) -> str:
         """Generate MACD advice based on trend and MACD crossover."""
         macd_diff = row["macd"] - row["macd_signal"]
@@ -73,7 +78,7 @@ class MACDTrendBasedAdviceStrategy(BaseStrategy):
 
     def apply(self: Self, data: pd.DataFrame):
         """Apply RSI strategy to data."""
-        data["macd"] = macd(data)
-        data["macd_signal"] = macd_signal(data)
+        ensure_indicator(data, "macd")
+        ensure_indicator(data, "macd_signal")
 
         data["macd_advice"] = data.apply(self._get_macd_advice, axis=1)
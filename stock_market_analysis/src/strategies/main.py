@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import pandas as pd
 
@@ -11,6 +11,8 @@ Self = TypeVar("Self", bound="MainAdviceScoreStrategy")
 class MainAdviceScoreStrategy(BaseStrategy):
     """Base class for all BBOverupperUnderlower-based strategies."""
 
+    output_columns: ClassVar[tuple[str, ...]] = ("main_advice", "main_advice_score")
+
     def apply(self: Self, data: pd.DataFrame):
         """Calculate the main advice based on weighted indicator."""
         weights = self.kwargs["advice_weights"]
@@ -1,8 +1,8 @@
-from typing import Optional, TypeVar
+from typing import ClassVar, Optional, TypeVar
 
 import pandas as pd
 
-from stock_market_analysis.src.indicators.technical_indicators import rsi
+from stock_market_analysis.src.indicators.technical_indicators import ensure_indicator
 from stock_market_analysis.src.strategies.base import BaseStrategy
 
 
@@ -36,9 +36,13 @@ def categorize_rsi(
 class RSIOverboughtOversoldStrategy(BaseStrategy):
     """Strategy based on RSI Indicator."""
 
+    warmup_bars: ClassVar[int] = 14
+    output_columns: ClassVar[tuple[str, ...]] = ("rsi_advice",)
+    indicators: ClassVar[tuple[str, ...]] = ("rsi",)
+
     def apply(self: Self, data: pd.DataFrame):
         """Apply RSI strategy to data."""
-        data["rsi"] = rsi(data)
+        ensure_indicator(data, "rsi")
         data["rsi_meaning"] = data["rsi"].apply(categorize_rsi, **self.kwargs)
 
         data["rsi_advice"] = "neutral"
@@ -49,6 +53,11 @@ class RSIOverboughtOversoldStrategy(BaseStrategy):
 class RSITrendBasedStrategy(BaseStrategy):
     """Strategy based on RSI Indicator."""
 
+    warmup_bars: ClassVar[int] = 14
+    complexity: ClassVar[float] = 3.0  # row by row apply()
+    output_columns: ClassVar[tuple[str, ...]] = ("rsi_advice",)
+    indicators: ClassVar[tuple[str, ...]] = ("rsi",)
+
     def _get_rsi_advice(self: Self, row: pd.Series) -> str:
         """Generate RSI advice based on trend and RSI thresholds."""
         if row["trend"] == "uptrend" or row["trend"] == "sideways":
@@ -69,5 +78,5 @@ class RSITrendBasedStrategy(BaseStrategy):
 
     def apply(self: Self, data: pd.DataFrame):
         """Apply RSI strategy to data."""
-        data["rsi"] = rsi(data)
+        ensure_indicator(data, "rsi")
         data["rsi_advice"] = data.apply(self._get_rsi_advice, axis=1)
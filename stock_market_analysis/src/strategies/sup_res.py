@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import numpy as np
 import pandas as pd
@@ -12,6 +12,16 @@ Self = TypeVar("Self", bound="SupportResistanceStrategy")
 class SupportResistanceStrategy(BaseStrategy):
     """Strategy based on RSI Indicator."""
 
+    # local extremes confirmed by window of 3 bars and advice minimal window of
+    # 30 days between matching supports / resistances
+    warmup_bars: ClassVar[int] = 2 * 3 + 30
+    complexity: ClassVar[float] = 35.0  # loops over bars and found levels
+    output_columns: ClassVar[tuple[str, ...]] = (
+        "sup_res_advice",
+        "sup_res_window",
+        "sup_res_window_date",
+    )
+
     def find_support_resistance(
         self: Self,
         data: pd.DataFrame,
@@ -1,4 +1,4 @@
-from typing import TypeVar
+from typing import ClassVar, TypeVar
 
 import numpy as np
 import pandas as pd
@@ -12,6 +12,10 @@ Self = TypeVar("Self", bound="TenDaysLowsHighsStrategy")
 class TenDaysLowsHighsStrategy(BaseStrategy):
     """Strategy based on finding 10 day lows for buy and 10 day highs for sell."""
 
+    warmup_bars: ClassVar[int] = 200
+    complexity: ClassVar[float] = 20.0  # loop over bars with polyfit()
+    output_columns: ClassVar[tuple[str, ...]] = ("ten_days_advice", "ten_days_score")
+
     def add_ten_days_advice(self, df):
         """Add two columns to the DataFrame.
 
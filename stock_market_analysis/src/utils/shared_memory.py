@@ -0,0 +1,59 @@
+"""Sharing of NumPy arrays between processes without copying (pickling) them."""
+
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+
+# name of shared memory block, shape and dtype of the array stored there
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+def share_arrays(
+    arrays: dict[str, np.ndarray],
+) -> Tuple[List[shared_memory.SharedMemory], dict[str, ArraySpec]]:
+    """Copy arrays into new shared memory blocks.
+
+    Returns blocks (the caller must close() and unlink() them when all processes
+    are done) and specs which are cheap to pass to other processes.
+    """
+    blocks = []
+    specs = {}
+    for key, array in arrays.items():
+        array = np.ascontiguousarray(array)  # noqa: PLW2901
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks.append(block)
+        specs[key] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def attach_arrays(
+    specs: dict[str, ArraySpec],
+) -> Tuple[List[shared_memory.SharedMemory], dict[str, np.ndarray]]:
+    """Return read-only views of arrays shared by share_arrays().
+
+    Blocks must be kept referenced while the arrays are used and closed afterwards.
+    """
+    blocks = []
+    arrays = {}
+    for key, (name, shape, dtype) in specs.items():
+        # joblib (loky) workers share resource tracker of the parent process, so
+        # attaching only re-registers the block and it's unlinked by its creator
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        blocks.append(block)
+        arrays[key] = array
+    return blocks, arrays
+
+
+def release_blocks(
+    blocks: List[shared_memory.SharedMemory], unlink: bool = False
+) -> None:
+    """Close (and optionally unlink) shared memory blocks."""
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
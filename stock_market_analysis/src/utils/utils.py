@@ -1,5 +1,6 @@
 """Helper functions."""
 
+import ast
 import inspect
 import pickle
 from datetime import datetime, timedelta
@@ -9,7 +10,6 @@ from pathlib import Path
 from typing import Any, Callable
 
 import pandas as pd
-import yfinance as yf
 from tabulate import tabulate
 
 from stock_market_analysis.src.logger import logger
@@ -86,6 +86,8 @@ def yf_download(*args: Any, **kwargs: Any):  # noqa: ANN401
     logger.info(
         "Downloading Yahoo Finance data for: args=(%s); kwargs=(%s)", args, kwargs
     )
+    import yfinance as yf
+
     df = yf.download(*args, **kwargs)
     df.columns = df.columns.get_level_values(0)
     return df
@@ -117,6 +119,15 @@ def parse_sort_input(input_string: str | None) -> tuple[list[str], list[bool]]:
     return columns, order_asc_column
 
 
+def parse_columns_input(input_string: str | None) -> list[str] | None:
+    """Parse columns input into list of columns ('all' = None, keep all columns)."""
+    if not input_string:
+        return []
+    if input_string.strip() == "all":
+        return None
+    return [column.strip() for column in input_string.split(",") if column.strip()]
+
+
 def parse_filters_input(input_string: str | None) -> dict:
     """Parse input filters string into dict of filters."""
     # Split the string into key-value pairs
@@ -136,6 +147,24 @@ def parse_filters_input(input_string: str | None) -> dict:
     return result
 
 
+def parse_param_grid_input(input_strings: tuple[str, ...] | None) -> dict[str, list]:
+    """Parse params like 'MainAdviceScoreStrategy.buy_score_threshold=0.3|0.4' into grid dict."""
+    if not input_strings:
+        return {}
+
+    def parse_value(value: str) -> Any:  # noqa: ANN401
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return value
+
+    result = {}
+    for input_string in input_strings:
+        key, values = input_string.split("=")
+        result[key.strip()] = [parse_value(value.strip()) for value in values.split("|")]
+    return result
+
+
 def check_columns_exist_in_df(df: pd.DataFrame, required_columns: list) -> None:
     """Check if all required columns exist in the DataFrame.
 
@@ -211,6 +240,18 @@ def get_date_range(date_input: str):
     return start_date_str, end_date_str
 
 
+def get_period_of_last_bars(bars: int) -> str:
+    """Get yf.download-like period which contains at least last bars trading days.
+
+    Trading days are converted into calendar days (252 trading days a year) with
+    a margin for holidays.
+    """
+    calendar_days = -(-bars * 365 // 252) + 10  # ceil
+    end_date = datetime.now() + timedelta(days=1)  # noqa: DTZ005
+    start_date = end_date - timedelta(days=calendar_days)
+    return f"{start_date.strftime('%Y-%m-%d')}:{end_date.strftime('%Y-%m-%d')}"
+
+
 def inject_missing_dates(df: pd.DataFrame, period: str) -> pd.DataFrame:
     """Inject missing dates into dataframe for full backtesting."""
     start_date, end_date = get_date_range(period)
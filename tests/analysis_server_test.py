@@ -0,0 +1,109 @@
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from stock_market_analysis.cli import new_cli
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.server.analysis_server import (
+    AnalysisHTTPServer,
+    AnalysisServer,
+    AnalyzeRequest,
+)
+from stock_market_analysis.src.server.client import is_server_running, post_analyze
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+
+from .helpers import FakeDataProvider
+
+
+@pytest.fixture()
+def server_url(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    # in-process workers see the fake data provider
+    http_server = AnalysisHTTPServer(
+        ("127.0.0.1", 0), AnalysisServer(TickerScheduler(backend="sequential"))
+    )
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{http_server.server_address[1]}"
+    http_server.shutdown()
+    http_server.server_close()
+
+
+@pytest.fixture()
+def tickers_file(tmp_path: Path):
+    tickers_file = tmp_path / "tickers.csv"
+    pd.DataFrame(
+        {"Ticker": ["AAA", "BBB"], "Stock_Index": ["FTSE_100", "FTSE_250"]}
+    ).to_csv(tickers_file, index=False)
+    return tickers_file
+
+
+def test_analyze_requests_are_served_from_memory(server_url: str, tickers_file: Path):
+    tickers_count, limit = 2, 3
+    request = {"service": "MACDBase", "file": str(tickers_file), "limit": 1000}
+    data_provider = MACDBaseService.data_provider
+    assert isinstance(data_provider, FakeDataProvider)
+
+    assert is_server_running(server_url)
+    all_results = post_analyze(server_url, request)
+    downloads = len(data_provider.periods)
+    filtered_results = post_analyze(
+        server_url, {**request, "filters": "Stock_Index=FTSE_250", "limit": limit}
+    )
+
+    # the second request is filtered and limited results of the first one
+    assert downloads == tickers_count
+    assert len(data_provider.periods) == downloads
+    ticker_col = all_results["columns"].index("Ticker")
+    assert {row[ticker_col] for row in all_results["data"]} == {"AAA", "BBB"}
+    assert len(filtered_results["data"]) == limit
+    assert {row[ticker_col] for row in filtered_results["data"]} == {"BBB"}
+
+
+def test_analyze_request_errors_are_reported(server_url: str, tickers_file: Path):
+    with pytest.raises(ValueError, match="Unsupported service"):
+        post_analyze(server_url, {"service": "Unknown", "file": str(tickers_file)})
+
+
+def test_least_recently_used_results_are_dropped(
+    monkeypatch: pytest.MonkeyPatch, tickers_file: Path
+):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    analysis_server = AnalysisServer(TickerScheduler(backend="sequential"), max_results=1)
+
+    result_df = analysis_server.analyze(
+        AnalyzeRequest(service="MACDBase", file=str(tickers_file), limit=1000)
+    )
+
+    # results of the request are complete, only the last one is kept
+    assert set(result_df["Ticker"]) == {"AAA", "BBB"}
+    assert [key[1] for key in analysis_server.results] == ["BBB"]
+
+
+class ForwardedError(Exception):
+    """Raised instead of forwarding request to the server."""
+
+
+@pytest.mark.parametrize(
+    ("options", "is_forwarded"),
+    [([], True), (["--failure-report", "failed.csv"], False), (["--workers", "2"], False)],
+)
+def test_runs_with_local_options_are_not_forwarded(
+    monkeypatch: pytest.MonkeyPatch, options: list[str], is_forwarded: bool
+):
+    def forward(server_url: str, request: dict) -> dict:  # noqa: ARG001
+        raise ForwardedError
+
+    monkeypatch.setattr(new_cli, "is_server_running", lambda _: True)
+    monkeypatch.setattr(new_cli, "post_analyze", forward)
+
+    result = CliRunner().invoke(
+        new_cli.tech_analysis, ["analyze", "--file", "missing.csv", *options]
+    )
+
+    # local runs fail on the missing tickers file
+    expected_error = ForwardedError if is_forwarded else FileNotFoundError
+    assert isinstance(result.exception, expected_error)
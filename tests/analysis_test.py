@@ -0,0 +1,20 @@
+from stock_market_analysis.src.analysis.base_analysis import split_row_local_analyses
+from stock_market_analysis.src.analysis.filtering import FilterBy
+from stock_market_analysis.src.analysis.signal_study import SignalStudy
+from stock_market_analysis.src.analysis.sorting import SortBy
+
+
+def test_split_row_local_analyses_keeps_results_unchanged():
+    service_filter = FilterBy(filters={"rsi_advice": "buy"})
+    service_sort = SortBy(columns=["Date"], orders_asc=[True])
+    user_filter = FilterBy(filters={"Stock_Index": "FTSE_100"})
+    study = SignalStudy("main_advice")
+    late_filter = FilterBy(filters={"Ticker": "AAA"})
+
+    row_local, remaining = split_row_local_analyses(
+        [service_filter, service_sort, user_filter, study, late_filter]
+    )
+
+    # filters commute with sorting, but not with the study using all rows
+    assert row_local == [service_filter, user_filter]
+    assert remaining == [service_sort, study, late_filter]
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.backtest.metrics import (
+    build_equity_curve,
+    calculate_metrics,
+)
+
+
+def test_build_equity_curve_marks_positions_to_market():
+    dates = pd.date_range("2024-01-01", periods=5, name="Date")
+    price_matrix = pd.DataFrame(
+        {"AAA.L": [100.0, 110.0, np.nan, 120.0, 90.0], "BBB.L": [50.0] * 5},
+        index=dates,
+    )
+    transactions = pd.DataFrame(
+        {
+            "date": [dates[0], dates[1], dates[3]],
+            "ticker": ["AAA.L", "BBB.L", "AAA.L"],
+            "transaction": ["buy", "buy", "sell_signal"],
+            "hold_shares_number": [10, 20, 10],
+            "transaction_amount": [-10.0, -10.0, 12.0],
+        }
+    )
+
+    curve = build_equity_curve(transactions, price_matrix, initial_cash=100.0)
+
+    assert curve["cash"].tolist() == [90.0, 80.0, 80.0, 92.0, 92.0]
+    # AAA.L price on 3rd day is missing, so the last known price is used
+    assert curve["holdings_value"].tolist() == pytest.approx([10.0, 21.0, 21.0, 10.0, 10.0])
+    assert curve["equity"].iloc[-1] == pytest.approx(102.0)
+    assert curve["traded_value"].tolist() == [10.0, 10.0, 0.0, 12.0, 0.0]
+
+
+def test_calculate_metrics_of_known_equity_curve():
+    dates = pd.bdate_range("2024-01-01", periods=5)
+    equity = [100.0, 110.0, 99.0, 104.5, 121.0]
+    curve = pd.DataFrame(
+        {
+            "equity": equity,
+            "holdings_value": [0.0, 55.0, 49.5, 52.25, 0.0],
+            "traded_value": [0.0, 50.0, 0.0, 0.0, 50.0],
+        },
+        index=dates,
+    )
+
+    metrics = calculate_metrics(curve)
+
+    assert metrics["total_return"] == pytest.approx(0.21)
+    assert metrics["max_drawdown"] == pytest.approx(99.0 / 110.0 - 1)
+    # under water from 2nd (peak) till 4th business day
+    expected_drawdown_days = 2
+    assert metrics["max_drawdown_duration_days"] == expected_drawdown_days
+    assert metrics["exposure"] == pytest.approx(np.mean([0, 0.5, 0.5, 0.5, 0]))
+    assert metrics["sharpe"] > 0
+    assert metrics["sortino"] > metrics["sharpe"]
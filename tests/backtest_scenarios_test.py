@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+from stock_market_analysis.src.backtest.backtest_entities import BacktestScenario
+from stock_market_analysis.src.backtest.backtest_service import BacktestService
+from stock_market_analysis.src.backtest.scenarios import run_scenarios
+
+from .helpers import PERIOD, fake_yf_download, make_signals, run_backtest
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_run_scenarios_matches_single_backtests(n_jobs: int):
+    signals = make_signals(1)
+    start_date, transaction_fee, stop_loss_ratio = "2023-07-01", 1.0, 0.97
+    scenarios = [
+        BacktestScenario(name="default", backtest_amounts=[4000, 3000]),
+        BacktestScenario(
+            name="cheap_tight",
+            backtest_amounts=[4000, 3000],
+            transaction_fee=transaction_fee,
+            stop_loss_ratio=stop_loss_ratio,
+            start_date=start_date,
+        ),
+    ]
+
+    with patch(
+        "stock_market_analysis.src.backtest.price_matrix.yf_download",
+        fake_yf_download,
+    ):
+        results = run_scenarios(signals.copy(), scenarios, PERIOD, n_jobs=n_jobs)
+
+    expected = run_backtest(ArrayBacktestService, signals)
+    default = results.set_index("scenario").loc["default"]
+    assert default["transactions"] == len(expected.transaction_log)
+    assert default["final_equity"] == pytest.approx(
+        expected.get_equity_curve()["equity"].iloc[-1]
+    )
+    assert default["sharpe"] == pytest.approx(expected.get_metrics()["sharpe"][0])
+    assert default["transaction_fee"] == BacktestService.TRANSACTION_FEE
+    assert list(results["scenario"]) == ["default", "cheap_tight"]
+
+    # overrides of the scenario equal a single backtest with them over its dates
+    late_signals = signals[signals["Date"] >= start_date]
+    assert expected.price_matrix is not None
+    late_expected = ArrayBacktestService(
+        late_signals.copy(),
+        [4000, 3000],
+        5000,
+        2000,
+        PERIOD,
+        price_matrix=expected.price_matrix.loc[start_date:],
+        transaction_fee=transaction_fee,
+        stop_loss_ratio=stop_loss_ratio,
+    )
+    late_expected.run()
+    cheap_tight = results.set_index("scenario").loc["cheap_tight"]
+    assert cheap_tight["transaction_fee"] == transaction_fee
+    assert cheap_tight["stop_loss_ratio"] == stop_loss_ratio
+    assert cheap_tight["start_date"] == start_date
+    assert 0 < cheap_tight["transactions"] < default["transactions"]
+    assert cheap_tight["transactions"] == len(late_expected.transaction_log)
+    assert cheap_tight["final_equity"] == pytest.approx(
+        late_expected.get_equity_curve()["equity"].iloc[-1]
+    )
+    assert cheap_tight["final_equity"] != pytest.approx(default["final_equity"])
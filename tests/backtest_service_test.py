@@ -0,0 +1,148 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from stock_market_analysis.cli.new_cli import tech_analysis
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+from stock_market_analysis.src.backtest.backtest_service import BacktestService
+
+from .helpers import PERIOD, fake_yf_download, make_signals, run_backtest
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_array_backtest_matches_backtest_service(seed: int):
+    signals = make_signals(seed)
+
+    expected = run_backtest(BacktestService, signals)
+    result = run_backtest(ArrayBacktestService, signals)
+
+    expected_log = expected.get_backtest_log().reset_index(drop=True)
+    result_log = result.get_backtest_log().reset_index(drop=True)
+    assert len(expected_log) > 0
+    assert set(expected_log["transaction"]) >= {"buy", "sell_signal", "sell_stop_loss"}
+    pd.testing.assert_frame_equal(result_log, expected_log, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        result.get_portfolio(), expected.get_portfolio(), check_dtype=False
+    )
+    assert result.calculate_total_value() == pytest.approx(
+        expected.calculate_total_value()
+    )
+
+
+def test_equity_curve_ends_with_portfolio_value():
+    result = run_backtest(ArrayBacktestService, make_signals(1))
+
+    equity_curve = result.get_equity_curve()
+    portfolio = result.get_portfolio()
+    metrics = result.get_metrics()
+
+    expected_value = (
+        portfolio["Total Investment"].iloc[-1] if len(portfolio) else result.remaining_cash
+    )
+    assert equity_curve["equity"].iloc[-1] == pytest.approx(expected_value)
+    assert equity_curve["cash"].iloc[-1] == pytest.approx(result.remaining_cash)
+    assert {"cagr", "sharpe", "max_drawdown", "turnover"} <= set(metrics.columns)
+
+
+def test_backtest_without_signals_has_no_transactions():
+    result = run_backtest(ArrayBacktestService, make_signals(1).iloc[:0])
+
+    assert result.get_backtest_log().empty
+    assert result.last_date is None
+    assert result.date_hashes.empty
+
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_resumed_backtest_matches_full_run(tmp_path: Path, streamed: bool):
+    signals = make_signals(2)
+    first_period = "2023-01-01:2023-06-30"
+    first_signals = signals[signals["Date"] <= "2023-06-30"]
+    log_file = str(tmp_path / "log.csv") if streamed else None
+    state_file = str(tmp_path / "state.pkl")
+
+    with patch(
+        "stock_market_analysis.src.backtest.price_matrix.yf_download",
+        fake_yf_download,
+    ):
+        first_run = ArrayBacktestService(
+            first_signals.copy(), [4000, 3000], 5000, 2000, first_period, log_file
+        )
+        first_run.run()
+        first_run.save_state(state_file)
+
+        resumed = ArrayBacktestService.from_state(signals.copy(), PERIOD, state_file)
+        resumed.run()
+
+        changed_signals = signals.copy()
+        changed_signals.iloc[0, changed_signals.columns.get_loc("main_advice")] = "hold"
+        with pytest.raises(ValueError, match="Signals of already backtested dates"):
+            ArrayBacktestService.from_state(changed_signals, PERIOD, state_file).run()
+
+    expected = run_backtest(ArrayBacktestService, signals)
+    pd.testing.assert_frame_equal(
+        resumed.get_backtest_log(), expected.get_backtest_log(), check_dtype=False
+    )
+    pd.testing.assert_frame_equal(resumed.get_portfolio(), expected.get_portfolio())
+
+
+def test_resumed_backtest_with_later_period_start_matches_full_run(tmp_path: Path):
+    signals = make_signals(2)
+    state_file = str(tmp_path / "state.pkl")
+
+    with patch(
+        "stock_market_analysis.src.backtest.price_matrix.yf_download",
+        fake_yf_download,
+    ):
+        first_run = ArrayBacktestService(
+            signals[signals["Date"] <= "2023-06-30"].copy(),
+            [4000, 3000],
+            5000,
+            2000,
+            "2023-01-01:2023-06-30",
+        )
+        first_run.run()
+        first_run.save_state(state_file)
+
+        # ex. '1y' period of a later day starts later than the saved run
+        resumed = ArrayBacktestService.from_state(
+            signals[signals["Date"] >= "2023-02-01"].copy(),
+            "2023-02-01:2023-12-31",
+            state_file,
+        )
+        resumed.run()
+
+    expected = run_backtest(ArrayBacktestService, signals)
+    pd.testing.assert_frame_equal(
+        resumed.get_backtest_log(), expected.get_backtest_log(), check_dtype=False
+    )
+    pd.testing.assert_frame_equal(resumed.get_metrics(), expected.get_metrics())
+    assert resumed.get_equity_curve()["equity"].iloc[-1] == pytest.approx(
+        expected.get_equity_curve()["equity"].iloc[-1]
+    )
+
+
+def test_backtest_state_is_rejected_with_legacy_engine(tmp_path: Path):
+    state_file = tmp_path / "state.pkl"
+    result = CliRunner().invoke(
+        tech_analysis,
+        [
+            "analyze",
+            "--file",
+            str(tmp_path / "tickers.csv"),
+            "--server",
+            "",
+            "--backtest-engine",
+            "legacy",
+            "--backtest-state",
+            str(state_file),
+        ],
+    )
+
+    assert result.exit_code != 0
+    assert "--backtest-engine" in result.output
+    assert not state_file.exists()
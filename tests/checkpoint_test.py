@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.executor.checkpoint import CheckpointStore
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_resumed_run_analyzes_only_tickers_without_checkpoints(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    data_provider = FakeDataProvider()
+    monkeypatch.setattr(MACDBaseService, "data_provider", data_provider)
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACDBase")
+    tickers = ["AAA", "BBB", "CCC"]
+    stock_indexes = pd.Series(dict.fromkeys(tickers, "FTSE_100"))
+    scheduler = TickerScheduler(backend="sequential")
+    checkpoint = CheckpointStore.for_run(tmp_path, definition, "1y")
+
+    full_df = AnalysisPipeline(definition, checkpoint=checkpoint).run(
+        tickers, "1y", stock_indexes, scheduler
+    )
+    checkpoint.remove("BBB")
+    data_provider.periods.clear()
+    resumed_df = AnalysisPipeline(
+        definition, {"macd_advice": "buy"}, checkpoint=checkpoint, resume=True
+    ).run(tickers, "1y", stock_indexes, scheduler)
+
+    assert len(data_provider.periods) == 1
+    assert checkpoint.has("BBB")
+    pd.testing.assert_frame_equal(
+        resumed_df,
+        full_df[full_df["macd_advice"] == "buy"].reset_index(drop=True),
+    )
+    # changed service config or data doesn't reuse the checkpoints
+    other_definition = ServiceRegistry(entry_point_group=None).get_definition("RSIBase")
+    assert CheckpointStore.for_run(tmp_path, other_definition, "1y").run_dir != (
+        checkpoint.run_dir
+    )
+    assert CheckpointStore.for_run(tmp_path, definition, "2y").run_dir != (
+        checkpoint.run_dir
+    )
+
+
+def test_tickers_without_data_arent_checkpointed(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACDBase")
+    checkpoint = CheckpointStore.for_run(tmp_path, definition, "1y")
+
+    AnalysisPipeline(definition, checkpoint=checkpoint).compute_ticker(
+        "AAA", "1y", "FTSE_100", pd.DataFrame()
+    )
+
+    assert not checkpoint.has("AAA")
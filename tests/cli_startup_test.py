@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+from click.testing import CliRunner
+
+from stock_market_analysis.cli.cli import cli
+
+
+HEAVY_MODULES = ["pandas", "yfinance", "joblib", "lightweight_charts"]
+
+
+def test_lazy_subcommands_are_invoked():
+    result = CliRunner().invoke(cli, ["general", "version"])
+    assert result.exit_code == 0
+    assert result.output.strip() == "0.0.1"
+
+
+def test_light_subcommands_dont_import_heavy_dependencies():
+    code = (
+        "import sys\n"
+        "from stock_market_analysis.cli.cli import cli\n"
+        "for args in (['--help'], ['general', 'version'], ['tech-analysis', '--help']):\n"
+        "    cli(args, standalone_mode=False)\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", code],  # noqa: S603
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.splitlines()[-1] == ""
@@ -0,0 +1,39 @@
+import os
+from typing import Optional
+
+import pytest
+from joblib import delayed
+
+from stock_market_analysis.src.executor.config import ExecutorConfig, get_executor_config
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+
+
+def _get_omp_num_threads(_: int) -> Optional[str]:
+    return os.environ.get("OMP_NUM_THREADS")
+
+
+def test_loky_workers_get_limited_threads():
+    config = ExecutorConfig(n_workers=2, backend="loky", inner_threads=3)
+
+    assert config.get_worker_env()["OMP_NUM_THREADS"] == "3"
+    with config.get_parallel() as parallel:
+        # both stages run in the same pool of workers
+        first = parallel(delayed(_get_omp_num_threads)(idx) for idx in range(2))
+        second = parallel(delayed(_get_omp_num_threads)(idx) for idx in range(2))
+
+    assert first == second == ["3", "3"]
+
+
+def test_activated_config_is_used_by_schedulers():
+    with ExecutorConfig(n_workers=1, backend="threading").activate():
+        scheduler = TickerScheduler()
+
+        assert get_executor_config().backend == "threading"
+        assert scheduler.backend == "threading"
+        assert scheduler.n_workers == 1
+    assert get_executor_config() == ExecutorConfig()
+
+
+def test_unsupported_backend_raises():
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        ExecutorConfig(backend="dask")
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import stock_market_analysis.src.executor.transport as transport_module
+from stock_market_analysis.src.executor.transport import (
+    ArrowFrame,
+    FrameTransport,
+    concat_frames,
+)
+
+
+def _get_frames() -> list[pd.DataFrame]:
+    return [
+        pd.DataFrame(
+            {"Ticker": "AAA.L", "Close": [1.0, 2.0], "main_advice": ["buy", None]},
+            index=pd.date_range("2024-01-01", periods=2, name="Date"),
+        ),
+        pd.DataFrame(
+            {"Ticker": "BBB.L", "Close": [3.0], "Volume": [10]},
+            index=pd.date_range("2024-01-01", periods=1, name="Date"),
+        ),
+    ]
+
+
+def test_frames_are_pickled_without_arrow(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(transport_module, "pa", None)
+
+    with FrameTransport.open("loky") as transport:
+        assert transport is None
+    pd.testing.assert_frame_equal(concat_frames(_get_frames()), pd.concat(_get_frames()))
+
+
+def test_arrow_frames_are_concatenated_like_pandas():
+    pytest.importorskip("pyarrow")
+
+    with FrameTransport.open("loky") as transport:
+        packed = [transport.run(lambda df: df, df) for df in _get_frames()]
+        assert all(isinstance(frame, ArrowFrame) for frame in packed)
+
+        result_df = concat_frames(packed)
+
+        assert not any(Path(frame.path).exists() for frame in packed)
+    expected_df = pd.concat(_get_frames())
+    # Arrow fills missing values of string columns by None, pandas by NaN
+    expected_df["main_advice"] = expected_df["main_advice"].replace({np.nan: None})
+    pd.testing.assert_frame_equal(result_df, expected_df)
+    with FrameTransport.open("threading") as transport:
+        assert transport is None
@@ -0,0 +1,68 @@
+"""Fake data and signals shared by tests."""
+from typing import TypeVar
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.backtest.backtest_service import BacktestService
+from stock_market_analysis.src.data_providers.base_provider import BaseDataProvider
+
+
+Self = TypeVar("Self", bound="FakeDataProvider")
+
+
+class FakeDataProvider(BaseDataProvider):
+    """Deterministic daily data ending today, remembering requested periods."""
+
+    def __init__(self: Self) -> None:
+        """Start without requested periods."""
+        self.periods: list[str] = []
+
+    def get_data(self: Self, ticker: str, period: str) -> pd.DataFrame:  # noqa: ARG002
+        """Return the same 400 bars of data for any ticker."""
+        self.periods.append(period)
+        dates = pd.bdate_range(
+            end=pd.Timestamp.today().normalize(), periods=400, name="Date"
+        )
+        close = 1000 + np.cumsum(np.sin(np.arange(len(dates)) / 3) * 10)
+        return pd.DataFrame({"Close": close, "Volume": 1000}, index=dates)
+
+
+PERIOD = "2023-01-01:2023-12-31"
+TICKERS = ["AAA.L", "BBB.L", "CCC.L", "DDD.L", "EEE.L", "FFF.L"]
+
+
+def fake_yf_download(ticker: str, period: str) -> pd.DataFrame:
+    """Return deterministic random-walk prices (in pence) of a ticker."""
+    start, end = period.split(":")
+    dates = pd.bdate_range(start, end, name="Date")
+    rng = np.random.default_rng(TICKERS.index(ticker))
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.03, len(dates))))
+    return pd.DataFrame({"Close": close}, index=dates)
+
+
+def make_signals(seed: int) -> pd.DataFrame:
+    """Return analyze-like output with random 'buy' / 'sell' advices."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for ticker in TICKERS:
+        df = fake_yf_download(ticker, PERIOD).reset_index()
+        df["Ticker"] = ticker
+        df["Stock_Index"] = "FTSE_100"
+        df["main_advice"] = rng.choice(["buy", "sell", "hold"], len(df), p=[0.1, 0.1, 0.8])
+        frames.append(df)
+    signals = pd.concat(frames)
+    signals = signals[signals["main_advice"] != "hold"]
+    return signals.sample(frac=1, random_state=seed).sort_values("Date", kind="stable")
+
+
+def run_backtest(service_cls: type, signals: pd.DataFrame) -> BacktestService:
+    """Return backtest of the signals run over fake prices of PERIOD."""
+    with patch(
+        "stock_market_analysis.src.backtest.price_matrix.yf_download",
+        fake_yf_download,
+    ):
+        service = service_cls(signals.copy(), [4000, 3000], 5000, 2000, PERIOD)
+        service.run()
+    return service
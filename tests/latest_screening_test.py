@@ -0,0 +1,25 @@
+from stock_market_analysis.src.services.four_ps_service import FourPSService
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+
+from .helpers import FakeDataProvider
+
+
+def test_warmup_bars_of_services():
+    # ma_200_slope needs one bar more than ma_200
+    assert FourPSService().get_warmup_bars() == 200 + 1
+    # MACD signal line (26 + 9) and diffs of 3 consecutive days
+    assert MACDBaseService().get_warmup_bars() == 26 + 9 + 3
+
+
+def test_run_latest_returns_latest_rows_equal_to_full_run():
+    service = MACDBaseService()
+    service.data_provider = FakeDataProvider()
+
+    latest = 5
+    latest_df = service.run("AAA", "2y", latest=latest)
+    full_df = service.run("AAA", "2y")
+
+    assert ":" in service.data_provider.periods[0]
+    assert len(latest_df) == latest
+    assert latest_df.index.equals(full_df.index[-latest:])
+    assert (latest_df["macd_advice"] == full_df["macd_advice"].iloc[-latest:]).all()
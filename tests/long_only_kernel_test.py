@@ -0,0 +1,35 @@
+import numpy as np
+
+from stock_market_analysis.src.backtest.long_only_kernel import long_only_backtest
+
+
+def test_long_only_backtest_of_panel():
+    prices = np.array(
+        [
+            [10.0, 11.0, 12.0, 9.0, 10.0, 20.0],
+            [10.0, np.nan, 5.0, 5.0, 8.0, 8.0],
+        ]
+    )
+    # repeated entries / exits are ignored, signals without price too
+    entries = np.array(
+        [
+            [True, True, False, False, True, False],
+            [False, True, True, False, False, False],
+        ]
+    )
+    exits = np.array(
+        [
+            [False, False, True, True, False, False],
+            [True, False, False, False, False, False],
+        ]
+    )
+
+    trades_df, final_equity = long_only_backtest(prices, entries, exits, 100)
+
+    assert trades_df["asset"].tolist() == [0, 0, 1]
+    assert trades_df["entry_idx"].tolist() == [0, 4, 2]
+    assert trades_df["exit_idx"].tolist() == [2, -1, -1]
+    assert trades_df["shares"].tolist() == [10, 12, 20]
+    np.testing.assert_allclose(trades_df["exit_price"], [12.0, np.nan, np.nan])
+    # asset 0: 100 -> 120 after 1st trade, 12 shares bought by 10 valued by 20
+    np.testing.assert_allclose(final_equity, [240, 160])
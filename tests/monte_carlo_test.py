@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from stock_market_analysis.src.backtest.array_backtest_service import (
+    ArrayBacktestService,
+)
+from stock_market_analysis.src.backtest.monte_carlo import (
+    MonteCarloService,
+    block_bootstrap_returns,
+)
+
+from .helpers import make_signals, run_backtest
+
+
+def test_unperturbed_simulations_reproduce_backtest_equity():
+    backtest_service = run_backtest(ArrayBacktestService, make_signals(1))
+    final_equity = backtest_service.get_equity_curve()["equity"].iloc[-1]
+
+    monte_carlo = MonteCarloService(
+        backtest_service, n_simulations=50, max_entry_shift=0, max_slippage=0, seed=1
+    )
+    paths = monte_carlo.simulate("perturb")
+
+    assert paths.shape == (50, len(monte_carlo.get_trades()) + 1)
+    np.testing.assert_allclose(paths[:, -1], final_equity)
+
+
+def test_monte_carlo_summary_percentiles_are_ordered():
+    backtest_service = run_backtest(ArrayBacktestService, make_signals(2))
+    monte_carlo = MonteCarloService(backtest_service, n_simulations=500, seed=1)
+
+    for mode in ["trades", "bootstrap", "perturb"]:
+        summary = monte_carlo.get_summary(mode)
+        assert list(summary.index) == ["p5", "p25", "p50", "p75", "p95"]
+        assert summary["total_return"].is_monotonic_increasing
+        assert (summary["max_drawdown"] <= 0).all()
+
+    with pytest.raises(ValueError, match="Unsupported Monte Carlo mode"):
+        monte_carlo.simulate("unknown")
+
+
+def test_block_bootstrap_with_single_block_keeps_returns_order():
+    returns = np.array([0.1, -0.05, 0.02])
+
+    paths = block_bootstrap_returns(returns, 100, 3, 3, np.random.default_rng(0))
+
+    np.testing.assert_allclose(paths, [[100, 110, 104.5, 106.59]] * 3)
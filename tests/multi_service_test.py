@@ -0,0 +1,148 @@
+import logging
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+import stock_market_analysis.src.executor.transport as transport_module
+from stock_market_analysis.cli.new_cli import tech_analysis
+from stock_market_analysis.src.backtest import backtest_service
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.executor.sharding import load_partials
+from stock_market_analysis.src.executor.transport import ArrowFrame, FrameTransport
+from stock_market_analysis.src.services.multi_pipeline import MultiServicePipeline
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_services_share_data_and_indicators_of_single_pass(
+    monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    data_provider = FakeDataProvider()
+    registry = ServiceRegistry(entry_point_group=None)
+    names = ["RSIBase", "MACDBase", "MACD3DaysRSI"]
+    for name in names:
+        monkeypatch.setattr(
+            registry.get_definition(name).service_cls, "data_provider", data_provider
+        )
+    stock_indexes = pd.Series({"AAA": "FTSE_100", "BBB": "FTSE_250"})
+    scheduler = TickerScheduler(backend="sequential")
+    single_dfs = {
+        name: AnalysisPipeline(registry.get_definition(name)).run_tickers(
+            ["AAA", "BBB"], "1y", stock_indexes, scheduler
+        )
+        for name in names
+    }
+    data_provider.periods.clear()
+    caplog.clear()
+
+    with caplog.at_level(logging.INFO, logger="stock_market_analysis"):
+        multi_dfs = MultiServicePipeline(
+            [AnalysisPipeline(registry.get_definition(name)) for name in names]
+        ).run_tickers(["AAA", "BBB"], "1y", stock_indexes, scheduler)
+
+    # every ticker is fetched once and its RSI is computed once for both RSI services
+    assert len(data_provider.periods) == 2  # noqa: PLR2004
+    rsi_logs = [r for r in caplog.records if r.getMessage().startswith("Calculating RSI")]
+    assert len(rsi_logs) == 2  # noqa: PLR2004
+    for name in names:
+        pd.testing.assert_frame_equal(
+            multi_dfs[name], single_dfs[name][multi_dfs[name].columns]
+        )
+
+
+def test_results_of_services_pass_through_frame_transport(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    pytest.importorskip("pyarrow")
+    # results of sequential runs are passed through Arrow files like loky ones
+    monkeypatch.setattr(transport_module, "ARROW_BACKENDS", ("sequential",))
+    packed_frames = []
+    pack = FrameTransport.pack
+
+    def counting_pack(transport: FrameTransport, data_df: pd.DataFrame) -> ArrowFrame:
+        packed_frames.append(pack(transport, data_df))
+        return packed_frames[-1]
+
+    monkeypatch.setattr(FrameTransport, "pack", counting_pack)
+    registry = ServiceRegistry(entry_point_group=None)
+    names = ["RSIBase", "MACDBase"]
+    for name in names:
+        monkeypatch.setattr(
+            registry.get_definition(name).service_cls, "data_provider", FakeDataProvider()
+        )
+    stock_indexes = pd.Series({"AAA": "FTSE_100", "BBB": "FTSE_250"})
+    scheduler = TickerScheduler(backend="sequential")
+    single_dfs = {
+        name: AnalysisPipeline(registry.get_definition(name)).run_tickers(
+            ["AAA", "BBB"], "1y", stock_indexes, scheduler
+        )
+        for name in names
+    }
+    packed_frames.clear()
+
+    multi_dfs = MultiServicePipeline(
+        [AnalysisPipeline(registry.get_definition(name)) for name in names]
+    ).run_tickers(["AAA", "BBB"], "1y", stock_indexes, scheduler)
+
+    # a frame of every ticker and service
+    assert len(packed_frames) == len(names) * 2
+    assert all(isinstance(frame, ArrowFrame) for frame in packed_frames)
+    for name in names:
+        pd.testing.assert_frame_equal(
+            multi_dfs[name], single_dfs[name][multi_dfs[name].columns]
+        )
+
+
+def test_every_service_gets_its_own_backtest_files(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    registry = ServiceRegistry(entry_point_group=None)
+    names = ["MACD3DaysRSI", "BBBase", "MACDBase"]
+    for name in names:
+        monkeypatch.setattr(
+            registry.get_definition(name).service_cls, "data_provider", FakeDataProvider()
+        )
+    close = FakeDataProvider().get_data("AAA", "1y")["Close"]
+    monkeypatch.setattr(
+        backtest_service,
+        "load_close_matrix",
+        lambda tickers, _: pd.DataFrame(dict.fromkeys(tickers, close)),
+    )
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({"Ticker": ["AAA", "BBB"], "Stock_Index": "FTSE_100"}).to_csv(
+        "tickers.csv", index=False
+    )
+    options = ["analyze", "--file", "tickers.csv", "--server", "", "--backend", "sequential"]
+
+    multi_result = CliRunner().invoke(
+        tech_analysis,
+        [
+            *options,
+            "--services",
+            "MACD3DaysRSI,BBBase",
+            "--backtest",
+            "True",
+            "--backtest-log-file",
+            "log.csv",
+            "--equity-curve-file",
+            "equity.csv",
+        ],
+    )
+    shard_result = CliRunner().invoke(
+        tech_analysis, [*options, "--services", "MACDBase", "--shard", "1/1"]
+    )
+
+    assert multi_result.exit_code == 0, multi_result.output
+    # BBBase has no signals in the data, so it has no transactions to log
+    assert (tmp_path / "log_MACD3DaysRSI.csv").exists()
+    assert (tmp_path / "equity_MACD3DaysRSI.csv").exists()
+    assert (tmp_path / "equity_BBBase.csv").exists()
+    assert not (tmp_path / "log.csv").exists()
+    assert not (tmp_path / "equity.csv").exists()
+    # single service of --services is analyzed instead of --service default
+    assert shard_result.exit_code == 0, shard_result.output
+    assert load_partials(["MACDBase_shard_1_of_1.pkl"]).service == "MACDBase"
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.services.macd_rsi_service import MACD3DaysRSIService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_workers_drop_intermediate_columns(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(MACD3DaysRSIService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACD3DaysRSI")
+    stock_indexes = pd.Series({"AAA": "FTSE_100"})
+    scheduler = TickerScheduler(backend="sequential")
+
+    result_df = AnalysisPipeline(definition, extra_columns=["macd_signal"]).run_tickers(
+        ["AAA"], "1y", stock_indexes, scheduler
+    )
+    all_columns_df = AnalysisPipeline(definition, extra_columns=None).run_tickers(
+        ["AAA"], "1y", stock_indexes, scheduler
+    )
+
+    # advice, plotted, filtered, sorted and requested columns are kept
+    assert {"macd_advice", "rsi_advice", "macd", "rsi", "macd_hist_diff", "rsi_meaning"} <= (
+        set(result_df.columns)
+    )
+    assert "macd_signal" in result_df.columns
+    assert "macd_hist" not in result_df.columns
+    assert "macd_hist" in all_columns_df.columns
@@ -0,0 +1,67 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.executor.pipelined import PipelinedScheduler
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_fetching_overlaps_computing_with_bounded_tasks_in_flight():
+    max_pending = 3
+    task_seconds = 0.01
+    n_values = 8
+    lock = threading.Lock()
+    in_flight = {"current": 0, "max": 0}
+    events = []
+
+    def fetch(value: int) -> int:
+        with lock:
+            in_flight["current"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        time.sleep(task_seconds)
+        with lock:
+            events.append(("fetched", value))
+        return value * 10
+
+    def compute(value: int, data: int) -> int:
+        with lock:
+            events.append(("computing", value))
+        time.sleep(task_seconds)
+        with lock:
+            in_flight["current"] -= 1
+        return value + data
+
+    scheduler = PipelinedScheduler(
+        n_workers=1, backend="threading", n_fetchers=4, max_pending=max_pending
+    )
+    results = scheduler.run_staged(fetch, compute, [(value,) for value in range(n_values)])
+
+    assert results == [value * 11 for value in range(n_values)]
+    assert in_flight["max"] <= max_pending
+    # computing started before the last fetch finished
+    first_compute = next(i for i, (stage, _) in enumerate(events) if stage == "computing")
+    last_fetch = max(i for i, (stage, _) in enumerate(events) if stage == "fetched")
+    assert first_compute < last_fetch
+
+
+def test_pipelined_run_equals_run_fetching_in_workers(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACDBase")
+    tickers = ["AAA", "BBB", "CCC"]
+    stock_indexes = pd.Series(dict.fromkeys(tickers, "FTSE_100"))
+
+    pipelined_df = AnalysisPipeline(definition).run(
+        tickers, "1y", stock_indexes, PipelinedScheduler(backend="threading", n_fetchers=2)
+    )
+    single_df = AnalysisPipeline(definition).run(
+        tickers, "1y", stock_indexes, TickerScheduler(backend="sequential")
+    )
+
+    pd.testing.assert_frame_equal(pipelined_df, single_df)
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.executor.result_cache import ResultCache
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.services.macd_rsi_service import MACD3DaysRSIService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_reruns_with_other_filters_reuse_cached_results(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    monkeypatch.setattr(MACD3DaysRSIService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACD3DaysRSI")
+    stock_indexes = pd.Series({"AAA": "FTSE_100"})
+    scheduler = TickerScheduler(backend="sequential")
+    result_cache = ResultCache(tmp_path)
+
+    first_df = AnalysisPipeline(definition, result_cache=result_cache).run_tickers(
+        ["AAA"], "1y", stock_indexes, scheduler
+    )
+    caplog.clear()
+    with caplog.at_level("INFO"):
+        filtered_df = AnalysisPipeline(
+            definition, filters={"rsi_advice": "neutral"}, result_cache=result_cache
+        ).run_tickers(["AAA"], "1y", stock_indexes, scheduler)
+
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    assert not [record for record in caplog.records if "Calculating" in record.message]
+    pd.testing.assert_frame_equal(
+        filtered_df, first_df[first_df["rsi_advice"] == "neutral"]
+    )
+
+
+def test_changed_data_changes_key(tmp_path: Path):
+    result_cache = ResultCache(tmp_path)
+    data_df = pd.DataFrame(
+        {"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-01", periods=2)
+    )
+    changed_df = data_df.assign(Close=[1.0, 3.0])
+
+    key = result_cache.get_key("fingerprint", "AAA", None, None, data_df)
+
+    assert key == result_cache.get_key("fingerprint", "AAA", None, None, data_df.copy())
+    assert key != result_cache.get_key("fingerprint", "AAA", None, None, changed_df)
+    assert key != result_cache.get_key("other", "AAA", None, None, data_df)
+    assert result_cache.load(key) is None
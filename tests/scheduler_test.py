@@ -0,0 +1,33 @@
+import pytest
+
+from stock_market_analysis.src.executor.scheduler import TickerScheduler, plan_batches
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def test_plan_batches_dispatches_expensive_tasks_first():
+    costs = [1.0, 50.0, 2.0, 1.0, 40.0, 1.0, 3.0, 2.0]
+
+    batches = plan_batches(costs, n_batches=4)
+
+    assert sorted(idx for batch in batches for idx in batch) == list(range(len(costs)))
+    # expensive tasks run alone and first, cheap ones are batched together
+    assert batches[0] == [1]
+    assert batches[1] == [4]
+    assert len(batches[-1]) > 1
+
+
+def test_scheduler_returns_results_in_order_of_tasks():
+    tasks = [(value,) for value in range(10)]
+    costs = [float(value % 3) + 1 for value in range(10)]
+
+    results = TickerScheduler(backend="sequential").run(_square, tasks, costs)
+
+    assert results == [value * value for value in range(10)]
+
+
+def test_scheduler_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        TickerScheduler(backend="dask")
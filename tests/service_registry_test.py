@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_registry_imports_services_lazily_and_registers_plugins():
+    registry = ServiceRegistry(entry_point_group=None)
+    registry.register("Custom", MACDBaseService)
+
+    definition = registry.get_definition("FourPS")
+    assert definition.service_cls.__name__ == "FourPSService"
+    assert "ma_200" in definition.technical_indicators
+    assert registry.get_definition("Custom").service_cls is MACDBaseService
+    assert "Custom" in registry.get_names()
+    with pytest.raises(ValidationError):
+        definition.name = "changed"
+    with pytest.raises(ValueError, match="Unsupported service"):
+        registry.get_definition("Unknown")
+
+
+def test_services_are_created_from_definition():
+    registry = ServiceRegistry(entry_point_group=None)
+    definition = registry.get_definition("MACDBase")
+
+    service = definition.create_service()
+    service.technical_indicators.append("rsi")
+
+    assert service.technical_indicators == ["macd", "rsi"]
+    assert definition.technical_indicators == ("macd",)
+    assert MACDBaseService.technical_indicators == ["macd"]
+    assert registry.get_service("MACDBase").technical_indicators == ["macd"]
+
+
+def test_pipelines_dont_change_service_definition(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACDBase")
+    stock_indexes = pd.Series({"AAA": "FTSE_100"})
+    scheduler = TickerScheduler(backend="sequential")
+
+    buy_df = AnalysisPipeline(definition, {"macd_advice": "buy"}).run(
+        ["AAA"], "1y", stock_indexes, scheduler
+    )
+    all_df = AnalysisPipeline(definition).run(["AAA"], "1y", stock_indexes, scheduler)
+
+    assert set(buy_df["macd_advice"]) == {"buy"}
+    assert len(all_df) > len(buy_df)
+    assert definition.post_run_analyses == ()
+    assert MACDBaseService.post_run_analysis_list == []
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.executor.scheduler import TickerScheduler
+from stock_market_analysis.src.executor.sharding import (
+    PartialResult,
+    load_partials,
+    parse_shard,
+    save_partial,
+    select_shard,
+)
+from stock_market_analysis.src.services.macd_service import MACDBaseService
+from stock_market_analysis.src.services.pipeline import AnalysisPipeline
+from stock_market_analysis.src.services.registry import ServiceRegistry
+
+from .helpers import FakeDataProvider
+
+
+def test_shards_partition_tickers_deterministically():
+    tickers = [f"T{idx}.L" for idx in range(50)]
+
+    shards = [select_shard(tickers, shard, 4) for shard in range(1, 5)]
+
+    assert sorted(ticker for shard in shards for ticker in shard) == sorted(tickers)
+    assert shards[0] == select_shard(tickers, 1, 4)
+    assert parse_shard("2/4") == (2, 4)
+    with pytest.raises(ValueError, match="Invalid shard"):
+        parse_shard("5/4")
+
+
+def test_merged_shards_equal_single_run(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    monkeypatch.setattr(MACDBaseService, "data_provider", FakeDataProvider())
+    definition = ServiceRegistry(entry_point_group=None).get_definition("MACDBase")
+    tickers = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    stock_indexes = pd.Series(dict.fromkeys(tickers, "FTSE_100"))
+    scheduler = TickerScheduler(backend="sequential")
+    filters = {"macd_advice": "buy"}
+
+    files = []
+    for shard in (2, 1, 3):
+        pipeline = AnalysisPipeline(definition, filters)
+        shard_tickers = select_shard(tickers, shard, 3)
+        partial = PartialResult(
+            service="MACDBase",
+            period="1y",
+            shard=shard,
+            shard_count=3,
+            ticker_positions={ticker: tickers.index(ticker) for ticker in shard_tickers},
+            data_df=(
+                pipeline.run_tickers(shard_tickers, "1y", stock_indexes, scheduler)
+                if shard_tickers
+                else pd.DataFrame(columns=["Ticker"])
+            ),
+        )
+        files.append(str(tmp_path / f"shard_{shard}.pkl"))
+        save_partial(partial, files[-1])
+
+    merged_df = AnalysisPipeline(definition, filters).merge(load_partials(files).data_df)
+    single_df = AnalysisPipeline(definition, filters).run(
+        tickers, "1y", stock_indexes, scheduler
+    )
+
+    pd.testing.assert_frame_equal(merged_df, single_df)
+    with pytest.raises(ValueError, match="Expected partial results"):
+        load_partials(files[:2])
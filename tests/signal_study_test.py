@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from stock_market_analysis.src.analysis.signal_study import SignalStudy
+
+
+def test_signal_study_per_ticker_and_universe():
+    dates = pd.bdate_range("2024-01-01", periods=4, name="Date")
+    data_df = pd.concat(
+        [
+            pd.DataFrame(
+                {"Close": [100, 110, 90, 120], "signal": ["buy", "", "buy", ""]},
+                index=dates,
+            ).assign(Ticker="AAA"),
+            pd.DataFrame(
+                {"Close": [50, 45, 60, 40], "signal": ["buy", "", "", ""]},
+                index=dates,
+            ).assign(Ticker="BBB"),
+        ]
+    ).sample(frac=1, random_state=1)
+
+    study_df = SignalStudy(
+        "signal", horizons=[1, 2], thresholds=[10]
+    ).apply(data_df).set_index(["Ticker", "horizon"])
+
+    # AAA: +10% and +33.3% after 1 day, -10% after 2 days (2nd signal has no data)
+    assert study_df.loc[("AAA", 1), "signals"] == 2  # noqa: PLR2004
+    assert study_df.loc[("AAA", 1), "hit_rate_10"] == 100  # noqa: PLR2004
+    assert study_df.loc[("AAA", 1), "hits_10"] == 2  # noqa: PLR2004
+    assert study_df.loc[("AAA", 2), "signals"] == 1
+    np.testing.assert_allclose(study_df.loc[("AAA", 2), "avg_mfe"], 10)
+    np.testing.assert_allclose(study_df.loc[("AAA", 2), "avg_mae"], -10)
+    # BBB: -10% after 1 day, +20% after 2 days
+    np.testing.assert_allclose(study_df.loc[("ALL", 1), "avg_return"], (10 + 100 / 3 - 10) / 3)
+    np.testing.assert_allclose(study_df.loc[("ALL", 2), "avg_return"], (-10 + 20) / 2)
+    np.testing.assert_allclose(study_df.loc[("ALL", 2), "hit_rate_10"], 50)
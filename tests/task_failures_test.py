@@ -0,0 +1,165 @@
+import inspect
+import json
+import os
+import time
+from pathlib import Path
+from typing import ClassVar, TypeVar, Union
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from yfinance.data import YfData
+
+from stock_market_analysis.cli.new_cli import tech_analysis
+from stock_market_analysis.src.data_providers import yahoo_data
+from stock_market_analysis.src.data_providers.dead_tickers import (
+    DEAD_TICKERS_TTL_ENV_VARIABLE,
+    DeadTickersCache,
+)
+from stock_market_analysis.src.data_providers.yahoo_data import YahooDataProvider
+from stock_market_analysis.src.executor.scheduler import (
+    TaskFailure,
+    TaskTimeoutError,
+    TickerScheduler,
+)
+
+
+Self = TypeVar("Self", bound="_YahooResponse")
+
+
+def _analyze(value: int) -> int:
+    if value == 1:
+        msg = "bad ticker"
+        raise ValueError(msg)
+    if value == 2:  # noqa: PLR2004
+        time.sleep(5)
+    return value
+
+
+def test_failed_and_timed_out_tasks_dont_stop_the_others():
+    scheduler = TickerScheduler(backend="sequential", task_timeout=0.2)
+
+    results = scheduler.run(_analyze, [(value,) for value in range(4)])
+
+    assert results[0] == 0
+    assert results[3] == 3  # noqa: PLR2004
+    assert results[1] == TaskFailure(error_type="ValueError", message="bad ticker")
+    assert results[2].error_type == "TaskTimeoutError"
+
+
+def test_tickers_without_data_are_skipped_until_ttl_expires(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    downloads = []
+
+    def empty_download(ticker: str, period: str) -> pd.DataFrame:
+        downloads.append((ticker, period))
+        return yahoo_data.NO_DATA_DF.copy()
+
+    monkeypatch.setattr(yahoo_data, "yf_download", empty_download)
+    dead_tickers = DeadTickersCache(tmp_path, ttl=60)
+    data_provider = YahooDataProvider(dead_tickers)
+
+    assert data_provider.get_data("DEAD.L", "1y").empty
+    assert data_provider.get_data("DEAD.L", "1y").empty
+    assert data_provider.get_data("DEAD.L", "2y").empty
+    assert downloads == [("DEAD.L", "1y"), ("DEAD.L", "2y")]
+    assert dead_tickers.get_reason("DEAD.L", "1y") == "no data for period: 1y"
+
+    expired = time.time() - 120
+    os.utime(tmp_path / "DEAD.L_1y.json", (expired, expired))
+    data_provider.get_data("DEAD.L", "1y")
+    assert downloads[-1] == ("DEAD.L", "1y")
+
+
+def test_tickers_without_latest_data_are_skipped_on_next_days(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+):
+    downloads = []
+
+    def empty_download(ticker: str, period: str) -> pd.DataFrame:
+        downloads.append((ticker, period))
+        return yahoo_data.NO_DATA_DF.copy()
+
+    # period of the last bars ends by a different date every day
+    periods = iter(["2024-01-01:2024-06-01", "2024-01-02:2024-06-02"])
+    monkeypatch.setattr(yahoo_data, "get_period_of_last_bars", lambda _: next(periods))
+    monkeypatch.setattr(yahoo_data, "yf_download", empty_download)
+    data_provider = YahooDataProvider(DeadTickersCache(tmp_path, ttl=60))
+
+    assert data_provider.get_latest_data("DEAD.L", 100).empty
+    assert data_provider.get_latest_data("DEAD.L", 100).empty
+    assert downloads == [("DEAD.L", "2024-01-01:2024-06-01")]
+
+
+class _YahooResponse:
+    """Response of Yahoo Finance API without data of a ticker."""
+
+    status_code = 404
+    url = "https://query2.finance.yahoo.com"
+    payload: ClassVar[dict] = {
+        "chart": {
+            "result": None,
+            "error": {"code": "Not Found", "description": "No data found, symbol may be delisted"},
+        }
+    }
+    text = json.dumps(payload)
+
+    def json(self: Self) -> dict:
+        return self.payload
+
+    def raise_for_status(self: Self) -> None:
+        pass
+
+
+@pytest.mark.parametrize(
+    ("response", "is_cached"),
+    [(ConnectionError("Could not resolve host"), False), (_YahooResponse(), True)],
+)
+def test_only_tickers_without_data_of_yf_download_are_cached(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    response: Union[Exception, _YahooResponse],
+    is_cached: bool,
+):
+    def make_request(*args: object, **kwargs: object) -> _YahooResponse:  # noqa: ARG001
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    # yf.download logs errors of requests and returns empty data instead of raising them
+    monkeypatch.setattr(YfData, "_make_request", make_request)
+    # downloads aren't cached to the pickle cache of yf_download
+    monkeypatch.setattr(yahoo_data, "yf_download", inspect.unwrap(yahoo_data.yf_download))
+    dead_tickers = DeadTickersCache(tmp_path, ttl=60)
+    data_provider = YahooDataProvider(dead_tickers)
+
+    for ticker in [f"NODATA{is_cached:d}{index}.L" for index in range(3)]:
+        assert data_provider.get_data(ticker, "2023-01-01:2023-02-01").empty
+        reason = dead_tickers.get_reason(ticker, "2023-01-01:2023-02-01")
+        assert (reason is not None) == is_cached
+
+
+def test_download_timeouts_are_raised(monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+    def timed_out_download(ticker: str, period: str) -> pd.DataFrame:  # noqa: ARG001
+        msg = "timed out"
+        raise TaskTimeoutError(msg)
+
+    monkeypatch.setattr(yahoo_data, "yf_download", timed_out_download)
+    dead_tickers = DeadTickersCache(tmp_path, ttl=60)
+    data_provider = YahooDataProvider(dead_tickers)
+
+    with pytest.raises(TaskTimeoutError):
+        data_provider.get_data("AAA.L", "1y")
+    assert dead_tickers.get_reason("AAA.L", "1y") is None
+
+
+def test_dead_tickers_ttl_is_set_by_cli(monkeypatch: pytest.MonkeyPatch):
+    # the CLI changes the environment, it's restored after the test
+    monkeypatch.setenv(DEAD_TICKERS_TTL_ENV_VARIABLE, "1")
+    runner = CliRunner()
+
+    runner.invoke(tech_analysis, ["--dead-tickers-ttl", "60", "version"])
+    assert DeadTickersCache().get_ttl() == 60  # noqa: PLR2004
+    runner.invoke(tech_analysis, ["--no-dead-tickers-cache", "version"])
+    assert DeadTickersCache().get_ttl() == 0
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+
+from stock_market_analysis.src.backtest.transaction_log import TransactionLogBuffer
+
+
+def append_transactions(buffer: TransactionLogBuffer, count: int):
+    for i in range(count):
+        buffer.append(
+            date=pd.Timestamp("2024-01-01") + pd.Timedelta(days=i),
+            ticker=f"T{i}.L",
+            stock_index="FTSE_100",
+            transaction="buy",
+            close_price=1.5 * i,
+            hold_shares_number=i,
+            transaction_amount=-10.0 * i,
+            yield_amount=0.0,
+            yield_percent=0.0,
+            available_cash=1000.0 - i,
+            total_value=1000.0,
+            total_yield=0.0,
+            total_yield_percent=0.0,
+        )
+
+
+def test_buffer_grows_and_materializes_all_transactions():
+    transactions_count = 5
+    buffer = TransactionLogBuffer(initial_capacity=2)
+    append_transactions(buffer, transactions_count)
+
+    df = buffer.to_frame()
+
+    assert len(buffer) == transactions_count
+    assert df["ticker"].tolist() == ["T0.L", "T1.L", "T2.L", "T3.L", "T4.L"]
+    assert df["hold_shares_number"].tolist() == [0, 1, 2, 3, 4]
+    assert df["date"].iloc[-1] == pd.Timestamp("2024-01-05")
+
+
+def test_buffer_streams_chunks_to_log_file(tmp_path: Path):
+    log_file = tmp_path / "backtest_log.csv"
+    transactions_count, chunk_size = 5, 2
+    buffer = TransactionLogBuffer(log_file=str(log_file), chunk_size=chunk_size)
+    append_transactions(buffer, transactions_count)
+
+    # two full chunks are already on disk, the last transaction is buffered
+    assert len(pd.read_csv(log_file)) == 2 * chunk_size
+    df = buffer.to_frame()
+
+    assert len(df) == transactions_count
+    assert df["close_price"].tolist() == [0.0, 1.5, 3.0, 4.5, 6.0]
+    assert df["date"].iloc[0] == pd.Timestamp("2024-01-01")
@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+from stock_market_analysis.src.backtest.walk_forward import (
+    WalkForwardService,
+    build_strategies,
+    expand_param_grid,
+    split_walk_forward_windows,
+)
+from stock_market_analysis.src.strategies.main import MainAdviceScoreStrategy
+from stock_market_analysis.src.strategies.rsi import RSITrendBasedStrategy
+
+
+def test_split_walk_forward_windows_rolls_by_out_of_sample_length():
+    windows = split_walk_forward_windows("2023-01-01:2023-12-31", 180, 90)
+
+    expected_windows = 3
+    assert len(windows) == expected_windows
+    assert windows[0].in_sample_start == pd.Timestamp("2023-01-01")
+    assert windows[0].in_sample_end == pd.Timestamp("2023-06-29")
+    assert windows[0].out_of_sample_start == pd.Timestamp("2023-06-30")
+    assert windows[1].in_sample_start == pd.Timestamp("2023-04-01")
+    # last out-of-sample window is truncated to the end of the period
+    assert windows[-1].out_of_sample_end == pd.Timestamp("2023-12-31")
+
+
+def test_expand_param_grid():
+    grid = {"A.x": [1, 2], "B.y": ["a"]}
+    assert expand_param_grid(grid) == [{"A.x": 1, "B.y": "a"}, {"A.x": 2, "B.y": "a"}]
+    assert expand_param_grid({}) == [{}]
+
+
+def test_build_strategies_overrides_kwargs_of_copies():
+    buy_score_threshold = 0.4
+    original = MainAdviceScoreStrategy(
+        buy_score_threshold=buy_score_threshold, sell_score_threshold=-0.4
+    )
+    strategies = [RSITrendBasedStrategy(), original]
+
+    result = build_strategies(
+        strategies, {"MainAdviceScoreStrategy.buy_score_threshold": 0.2}
+    )
+
+    assert result[1] is not original
+    assert result[1].kwargs == {"buy_score_threshold": 0.2, "sell_score_threshold": -0.4}
+    assert original.kwargs["buy_score_threshold"] == buy_score_threshold
+
+
+def test_build_strategies_rejects_unknown_strategy():
+    with pytest.raises(ValueError, match="UnknownStrategy"):
+        build_strategies([RSITrendBasedStrategy()], {"UnknownStrategy.x": 1})
+
+
+def test_yield_of_open_positions_is_marked_to_market():
+    period = "2023-01-02:2023-01-06"
+    dates = pd.bdate_range("2023-01-02", "2023-01-06")
+    # price doubles while the single bought position is held until the end
+    price_matrix = pd.DataFrame({"AAA.L": [100.0, 120.0, 150.0, 180.0, 200.0]}, index=dates)
+    signals_df = pd.DataFrame(
+        {
+            "Date": dates[:1],
+            "Ticker": ["AAA.L"],
+            "Stock_Index": ["FTSE_100"],
+            "main_advice": ["buy"],
+            "Close": [100.0],
+        }
+    )
+    walk_forward = WalkForwardService(
+        None,  # type: ignore
+        signals_df[["Ticker", "Stock_Index"]],
+        {},
+        [1000],
+        1000,
+        100,
+        period,
+        in_sample_days=3,
+        out_of_sample_days=2,
+    )
+
+    yield_percent = walk_forward._backtest_yield_percent(  # noqa: SLF001
+        signals_df, price_matrix, dates[0], dates[-1]
+    )
+
+    # buy-and-hold gains ~100% less fees, buy price would value it at ~0%
+    min_yield_percent = 90
+    assert yield_percent > min_yield_percent